@@ -0,0 +1,270 @@
+"""
+Local on-disk catalog of LeetCode problems.
+
+The catalog keeps the problemset metadata (title, slug, difficulty, question
+IDs and topic tags) in a SQLite database so that fetch_problems can answer
+from disk instead of downloading the problem list on every call. It also
+serves the slug -> questionId mapping for submissions.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.storage import site_database_path, open_database
+
+# Nach dieser Zeit (in Sekunden) gilt der Katalog als veraltet und wird neu synchronisiert
+CATALOG_TTL_SECONDS = float(os.environ.get("LEETCODE_CATALOG_TTL", 24 * 60 * 60))
+# Nach einem Synchronisierungsversuch (z.B. einem fehlgeschlagenen) wird frühestens nach dieser Zeit
+# (in Sekunden) erneut synchronisiert
+CATALOG_SYNC_RETRY_SECONDS = float(os.environ.get("LEETCODE_CATALOG_SYNC_RETRY", 15 * 60))
+CATALOG_FILENAME = "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS problems (
+    title_slug TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_id TEXT,
+    frontend_id TEXT,
+    tags TEXT NOT NULL DEFAULT '[]',
+    paid_only INTEGER NOT NULL DEFAULT 0,
+    row_hash TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_problems_difficulty ON problems (difficulty);
+CREATE TABLE IF NOT EXISTS question_ids (
+    title_slug TEXT PRIMARY KEY,
+    question_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ProblemCatalog:
+    """SQLite-backed store for the LeetCode problem list."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or site_database_path(CATALOG_FILENAME)
+        self._lock = threading.Lock()
+        self._conn = open_database(self.path)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(problems)")}
+            if "row_hash" not in columns:
+                self._conn.execute("ALTER TABLE problems ADD COLUMN row_hash TEXT")
+
+    @staticmethod
+    def normalize_problem(problem: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a question dict from the GraphQL API into a catalog row.
+
+        Args:
+            problem: A question from problemsetQuestionListV2
+
+        Returns:
+            Dict with the catalog columns
+        """
+        tags = [t.get("slug") or t.get("name") for t in (problem.get("topicTags") or []) if t]
+        question_id = problem.get("questionId", problem.get("id"))
+        row = {
+            "title_slug": problem["titleSlug"],
+            "title": problem.get("title", problem["titleSlug"]),
+            "difficulty": (problem.get("difficulty") or "").lower(),
+            "question_id": str(question_id) if question_id is not None else None,
+            "frontend_id": str(problem["questionFrontendId"]) if problem.get("questionFrontendId") is not None else None,
+            "tags": json.dumps(sorted(t for t in tags if t)),
+            "paid_only": 1 if problem.get("paidOnly") else 0,
+        }
+        # Hash über alle Spalten, damit unveränderte Probleme beim Sync nicht neu geschrieben werden
+        row["row_hash"] = hashlib.sha1(json.dumps(row, sort_keys=True).encode("utf-8")).hexdigest()
+        return row
+
+    def upsert(self, problems: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert new problems and update changed ones.
+
+        Rows whose content hash matches the stored one are left untouched.
+
+        Args:
+            problems: Questions as returned by the GraphQL API
+
+        Returns:
+            Number of rows that were inserted or changed
+        """
+        now = time.time()
+        rows = [dict(self.normalize_problem(p), updated_at=now) for p in problems if p and p.get("titleSlug")]
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            changes_before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT INTO problems (title_slug, title, difficulty, question_id, frontend_id, tags, paid_only, row_hash, updated_at)
+                VALUES (:title_slug, :title, :difficulty, :question_id, :frontend_id, :tags, :paid_only, :row_hash, :updated_at)
+                ON CONFLICT(title_slug) DO UPDATE SET
+                    title = excluded.title,
+                    difficulty = excluded.difficulty,
+                    question_id = COALESCE(excluded.question_id, problems.question_id),
+                    frontend_id = COALESCE(excluded.frontend_id, problems.frontend_id),
+                    tags = excluded.tags,
+                    paid_only = excluded.paid_only,
+                    row_hash = excluded.row_hash,
+                    updated_at = excluded.updated_at
+                WHERE problems.row_hash IS NOT excluded.row_hash
+                """,
+                rows,
+            )
+            return self._conn.total_changes - changes_before
+
+    def query(self, difficulty: Optional[str] = None, search_term: Optional[str] = None,
+              tags: Optional[List[str]] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Return problems in problemset order, optionally filtered.
+
+        Args:
+            difficulty: 'easy', 'medium' or 'hard' (None for all)
+            search_term: Case-insensitive substring of the title or slug
+            tags: Topic slugs that every returned problem must have
+            limit: Maximum number of problems to return
+
+        Returns:
+            List of problem dicts in the format of fetch_problems
+        """
+        sql = "SELECT * FROM problems WHERE 1 = 1"
+        params: List[Any] = []
+        if difficulty:
+            sql += " AND difficulty = ?"
+            params.append(difficulty.lower())
+        if search_term and search_term.strip():
+            # % und _ im Suchbegriff sind Zeichen, keine Platzhalter
+            escaped = re.sub(r"([\\%_])", r"\\\1", search_term.strip().lower())
+            pattern = f"%{escaped}%"
+            sql += " AND (lower(title) LIKE ? ESCAPE '\\' OR title_slug LIKE ? ESCAPE '\\')"
+            params.extend([pattern, pattern])
+        for tag in tags or []:
+            sql += " AND EXISTS (SELECT 1 FROM json_each(problems.tags) WHERE json_each.value = ?)"
+            params.append(tag)
+        sql += " ORDER BY CAST(frontend_id AS INTEGER), title_slug"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_problem(row) for row in rows]
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Return a single problem by its slug, or None if it is unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM problems WHERE title_slug = ?", (slug,)).fetchone()
+        return self._row_to_problem(row) if row else None
+
+    def get_question_id(self, slug: str) -> Optional[str]:
+        """
+        Look up the internal question ID needed for submissions.
+
+        Checks the problem list first, then IDs remembered from earlier lookups.
+
+        Args:
+            slug: The problem slug
+
+        Returns:
+            The question ID as a string, or None if it is not known locally
+        """
+        with self._lock:
+            row = self._conn.execute(
+                """
+                SELECT COALESCE(
+                    (SELECT question_id FROM problems WHERE title_slug = :slug),
+                    (SELECT question_id FROM question_ids WHERE title_slug = :slug)
+                )
+                """,
+                {"slug": slug},
+            ).fetchone()
+        return row[0] if row else None
+
+    def remember_question_id(self, slug: str, question_id: str):
+        """Store a question ID obtained from a remote lookup."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO question_ids (title_slug, question_id) VALUES (?, ?)
+                ON CONFLICT(title_slug) DO UPDATE SET question_id = excluded.question_id
+                """,
+                (slug, str(question_id)),
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM problems").fetchone()[0]
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def last_synced(self) -> Optional[float]:
+        value = self.get_meta("last_synced")
+        return float(value) if value else None
+
+    def mark_synced(self):
+        self.set_meta("last_synced", str(time.time()))
+
+    def mark_sync_attempt(self):
+        self.set_meta("last_sync_attempt", str(time.time()))
+
+    def sync_attempted_recently(self, retry_after: float = CATALOG_SYNC_RETRY_SECONDS) -> bool:
+        """True if a sync was started less than retry_after seconds ago (successful or not)."""
+        value = self.get_meta("last_sync_attempt")
+        return value is not None and time.time() - float(value) < retry_after
+
+    def is_stale(self, ttl: float = CATALOG_TTL_SECONDS) -> bool:
+        """True if the catalog is empty or was last synced more than ttl seconds ago."""
+        last = self.last_synced()
+        return last is None or self.count() == 0 or time.time() - last > ttl
+
+    @classmethod
+    def to_problem(cls, question: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a question from the GraphQL API into the fetch_problems format."""
+        return cls._row_to_problem(cls.normalize_problem(question))
+
+    @staticmethod
+    def _row_to_problem(row) -> Dict[str, Any]:
+        return {
+            "title": row["title"],
+            "titleSlug": row["title_slug"],
+            "difficulty": row["difficulty"],
+            "questionId": row["question_id"],
+            "questionFrontendId": row["frontend_id"],
+            "topicTags": json.loads(row["tags"] or "[]"),
+            "paidOnly": bool(row["paid_only"]),
+        }
+
+
+_catalog: Optional[ProblemCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> ProblemCatalog:
+    """Return the process-wide catalog instance (opened lazily)."""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ProblemCatalog()
+        return _catalog
@@ -1,181 +1,487 @@
-import requests
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional
 
-# Zuvor wurde ein lokaler Server verwendet, jetzt nutzen wir direkt die LeetCode API
-# BASE_URL = "http://localhost:3000"
+from api.catalog import ProblemCatalog, get_catalog
+from api.problem_cache import get_problem_cache
+from api.rate_limiter import get_rate_limiter
+from utils import http_client
+from utils.retry import RetryPolicy, send_with_retry
+from utils.storage import LEETCODE_BASE_URL
 
-# Rate-Limiting für die LeetCode API
-# Mindestzeit zwischen Anfragen in Sekunden
-MIN_REQUEST_INTERVAL = 1.0
-last_request_time = 0
+# Basis-URL der LeetCode API (LEETCODE_BASE_URL, z.B. http://localhost:3000 für den Mock-Server;
+# die lokalen Daten jedes Servers liegen getrennt, siehe utils.storage.site_cache_dir)
+BASE_URL = LEETCODE_BASE_URL
+GRAPHQL_URL = f"{BASE_URL}/graphql"
 
-def _rate_limit():
-    """Implementiert ein einfaches Rate-Limiting für API-Anfragen"""
-    global last_request_time
-    current_time = time.time()
-    elapsed = current_time - last_request_time
-    
-    # Wenn die letzte Anfrage weniger als MIN_REQUEST_INTERVAL Sekunden her ist, warte
-    if elapsed < MIN_REQUEST_INTERVAL:
-        sleep_time = MIN_REQUEST_INTERVAL - elapsed
-        time.sleep(sleep_time)
-    
-    # Aktualisiere die Zeit der letzten Anfrage
-    last_request_time = time.time()
+# User-Agent hinzufügen, um die Anfrage legitimer erscheinen zu lassen
+LEETCODE_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
+    "Referer": f"{BASE_URL}/problemset/all/"
+}
+
+# Maximale Gesamtdauer einer Anfrage inklusive aller Wiederholungen (Sekunden)
+REQUEST_DEADLINE = 60.0
 
-def make_leetcode_request(url: str, data: Dict, max_retries: int = 3, retry_delay: float = 2.0) -> Optional[Dict]:
+def make_leetcode_request(url: str, data: Dict, max_retries: int = 3, retry_delay: float = 2.0,
+                          deadline: Optional[float] = REQUEST_DEADLINE) -> Optional[Dict]:
     """
-    Führt eine Anfrage an die LeetCode API mit Rate-Limiting und Wiederholungslogik aus
+    Führt eine Anfrage an die LeetCode API mit Rate-Limiting und Wiederholungslogik aus.
+    Wiederholungen verwenden exponentielles Backoff mit Jitter und beachten Retry-After.
     
     Args:
         url: Die URL für die Anfrage
         data: Die JSON-Daten für die Anfrage
-        max_retries: Maximale Anzahl von Wiederholungsversuchen
-        retry_delay: Verzögerung zwischen Wiederholungsversuchen in Sekunden
+        max_retries: Maximale Anzahl von Versuchen
+        retry_delay: Basisverzögerung für das Backoff in Sekunden
+        deadline: Maximale Gesamtdauer aller Versuche in Sekunden (None für unbegrenzt)
         
     Returns:
         Dict oder None: Die JSON-Antwort oder None bei Fehler
     """
-    # User-Agent hinzufügen, um die Anfrage legitimer erscheinen zu lassen
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-        "Referer": "https://leetcode.com/problemset/all/"
-    }
+    headers = LEETCODE_HEADERS
+    policy = RetryPolicy(max_attempts=max_retries, base_delay=retry_delay, deadline=deadline)
     
-    for attempt in range(max_retries):
-        try:
-            # Rate-Limiting anwenden
-            _rate_limit()
-            
-            # API-Anfrage senden
-            response = requests.post(url, json=data, headers=headers)
-            
-            # Erfolgreiche Antwort
-            if response.status_code == 200:
-                return response.json()
-            
-            # Bei bestimmten Fehlern (z.B. 429 Too Many Requests) oder Serverproblemen (5xx) erneut versuchen
-            if response.status_code in [429, 500, 502, 503, 504]:
-                wait_time = retry_delay * (attempt + 1)  # Exponentielle Verzögerung
-                print(f"API-Anfrage fehlgeschlagen (Statuscode {response.status_code}). Wiederhole in {wait_time:.1f} Sekunden...")
-                time.sleep(wait_time)
-                continue
-            
-            # Bei anderen Fehlern aufgeben
-            print(f"API-Anfrage fehlgeschlagen mit Statuscode {response.status_code}: {response.text[:200]}...")
-            return None
-            
-        except Exception as e:
-            print(f"Fehler bei der API-Anfrage (Versuch {attempt+1}/{max_retries}): {str(e)}")
-            if attempt < max_retries - 1:
-                time.sleep(retry_delay)
-            else:
-                return None
+    def send():
+        # Rate-Limiting anwenden (bei jedem Versuch; gemeinsamer Token-Bucket für alle GraphQL-Anfragen,
+        # auch über Threads und Prozesse hinweg, wird erst bei der ersten Anfrage angelegt)
+        get_rate_limiter("graphql").acquire()
+        return http_client.post(url, json=data, headers=headers)
     
-    return None
+    try:
+        response = send_with_retry(send, policy, "LeetCode-API-Anfrage")
+        
+        # Erfolgreiche Antwort
+        if response.status_code == 200:
+            return response.json()
+        
+        # Bei anderen Fehlern (oder wenn alle Wiederholungen fehlschlugen) aufgeben
+        print(f"API-Anfrage fehlgeschlagen mit Statuscode {response.status_code}: {response.text[:200]}...")
+        return None
+        
+    except Exception as e:
+        print(f"Fehler bei der API-Anfrage: {str(e)}")
+        return None
 
-def fetch_problems(difficulty: str, limit: int = 50, search_term: Optional[str] = None) -> List[Dict[str, Any]]:
+# Einstellungen für die Synchronisierung des lokalen Problemkatalogs
+CATALOG_PAGE_SIZE = 100
+CATALOG_SYNC_WORKERS = 4
+# Abstand zwischen vollständigen Durchläufen; dazwischen werden nur neue Probleme am Ende geladen
+CATALOG_FULL_SYNC_INTERVAL = 7 * 24 * 60 * 60
+
+PROBLEMSET_QUERY = """
+query problemsetQuestionListV2($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionFilterInput, $searchKeyword: String) {
+    problemsetQuestionListV2(
+        categorySlug: $categorySlug
+        limit: $limit
+        skip: $skip
+        filters: $filters
+        searchKeyword: $searchKeyword
+    ) {
+        questions {
+            id
+            questionFrontendId
+            title
+            titleSlug
+            difficulty
+            paidOnly
+            topicTags {
+                name
+                slug
+            }
+        }
+        totalLength
+        hasMore
+    }
+}
+"""
+
+def _build_problemset_filters(difficulty: Optional[str] = None, tags: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
     """
-    Ruft Probleme von LeetCode ab und filtert sie nach Schwierigkeitsgrad.
-    Optional kann ein Suchbegriff für das Filtern nach Titeln verwendet werden.
+    Erstellt das filters-Argument für problemsetQuestionListV2.
     
     Args:
-        difficulty (str): Der Schwierigkeitsgrad ('easy', 'medium', 'hard')
-        limit (int): Die maximale Anzahl der abzurufenden Probleme
-        search_term (str, optional): Suchbegriff, um nach Titeln zu filtern
+        difficulty: Schwierigkeitsgrad ('easy', 'medium', 'hard') oder None
+        tags: Liste von Topic-Slugs (z.B. ['array', 'hash-table']) oder None
         
     Returns:
-        list: Eine Liste von Problem-Dictionaries mit 'title' und 'titleSlug'
-    """
-    # GraphQL Query für die LeetCode API
-    query = """
-    query problemsetQuestionListV2($categorySlug: String, $limit: Int, $skip: Int) {
-        problemsetQuestionListV2(
-            categorySlug: $categorySlug
-            limit: $limit
-            skip: $skip
-        ) {
-            questions {
-                title
-                titleSlug
-                difficulty
-            }
-        }
-    }
+        dict oder None: Die Filter oder None, wenn nicht gefiltert werden soll
     """
+    if not difficulty and not tags:
+        return None
     
-    # Variablen für die Query
+    filters = {"filterCombineType": "ALL"}
+    if difficulty:
+        filters["difficultyFilter"] = {"difficulties": [difficulty.upper()], "operator": "IS"}
+    if tags:
+        filters["topicFilter"] = {"topicSlugs": list(tags), "operator": "IS"}
+    return filters
+
+def _build_problemset_request(skip: int, limit: int, filters: Optional[Dict[str, Any]] = None,
+                              search_keyword: Optional[str] = None) -> Dict[str, Any]:
+    """Erstellt die GraphQL-Anfrage für eine Seite der Problemliste."""
     variables = {
         "categorySlug": "",
-        "skip": 0,
-        "limit": limit * 3  # Request more problems since we'll filter locally
+        "skip": skip,
+        "limit": limit
     }
+    if filters:
+        variables["filters"] = filters
+    if search_keyword and search_keyword.strip():
+        variables["searchKeyword"] = search_keyword.strip()
     
-    data = {"query": query, "variables": variables}
-    result = make_leetcode_request("https://leetcode.com/graphql", data)
-    
+    return {"query": PROBLEMSET_QUERY, "variables": variables}
+
+def _parse_problemset_page(result: Optional[Dict[str, Any]], skip: int) -> Optional[Dict[str, Any]]:
+    """Liest die Seite ('questions', 'totalLength') aus der GraphQL-Antwort oder gibt None zurück."""
     if result is None:
-        print("Keine Antwort von der LeetCode API erhalten")
-        return []
+        print(f"Keine Antwort von der LeetCode API erhalten (skip={skip})")
+        return None
+    
+    try:
+        page = result["data"]["problemsetQuestionListV2"]
+        if page is None or "questions" not in page:
+            raise KeyError("questions")
+        return page
+    except (KeyError, TypeError):
+        print(f"Unerwartetes Antwortformat von der LeetCode API: {result}")
+        return None
+
+def _fetch_problemset_page(skip: int, limit: int, filters: Optional[Dict[str, Any]] = None,
+                           search_keyword: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Ruft eine Seite der Problemliste über problemsetQuestionListV2 ab.
     
-    if "data" in result and "problemsetQuestionListV2" in result["data"] and "questions" in result["data"]["problemsetQuestionListV2"]:
-        all_problems = result["data"]["problemsetQuestionListV2"]["questions"]
+    Args:
+        skip: Anzahl der zu überspringenden Probleme
+        limit: Anzahl der abzurufenden Probleme
+        filters: Serverseitige Filter (siehe _build_problemset_filters)
+        search_keyword: Serverseitiger Suchbegriff
         
-        # Filter by difficulty locally
-        problems = [p for p in all_problems if p.get("difficulty", "").lower() == difficulty.lower()]
+    Returns:
+        dict oder None: Die Seite mit 'questions' und 'totalLength' oder None bei Fehler
+    """
+    data = _build_problemset_request(skip, limit, filters, search_keyword)
+    result = make_leetcode_request(GRAPHQL_URL, data)
+    return _parse_problemset_page(result, skip)
+
+def sync_catalog(force: bool = False, full: bool = False) -> int:
+    """
+    Synchronisiert den lokalen Problemkatalog mit der LeetCode API.
+    
+    Die Problemliste wird seitenweise über skip/limit abgerufen, die Seiten werden
+    parallel (unter dem gemeinsamen GraphQL-Rate-Limiting) geladen. Nach dem ersten vollständigen
+    Durchlauf werden nur noch die erste Seite und das Ende der Liste geladen, an dem
+    neue Probleme erscheinen; ein vollständiger Durchlauf erfolgt alle
+    CATALOG_FULL_SYNC_INTERVAL Sekunden. Unveränderte Probleme werden nicht neu geschrieben.
+    Schlägt eine Synchronisierung fehl, wird sie ohne force/full frühestens nach
+    CATALOG_SYNC_RETRY_SECONDS erneut versucht, bis dahin wird mit den lokalen Daten gearbeitet.
+    
+    Args:
+        force (bool): Auch synchronisieren, wenn der Katalog noch nicht veraltet ist
+        full (bool): Alle Seiten laden statt nur der neuen
         
-        # Limit to requested number
-        problems = problems[:limit]
+    Returns:
+        int: Anzahl der neuen oder geänderten Probleme
+    """
+    catalog = get_catalog()
+    if not force and not full:
+        if not catalog.is_stale():
+            return 0
+        if catalog.sync_attempted_recently():
+            # Während LeetCode drosselt oder ausfällt, nicht bei jedem Aufruf erneut synchronisieren
+            return 0
+    catalog.mark_sync_attempt()
+    
+    first_page = _fetch_problemset_page(0, CATALOG_PAGE_SIZE)
+    if not first_page:
+        return 0
+    
+    changed = catalog.upsert(first_page["questions"])
+    total = first_page.get("totalLength") or 0
+    
+    known_total = catalog.get_meta("total_length")
+    last_full_sync = catalog.get_meta("last_full_sync")
+    full = (full or known_total is None or last_full_sync is None
+            or time.time() - float(last_full_sync) > CATALOG_FULL_SYNC_INTERVAL)
+    
+    if full:
+        start = CATALOG_PAGE_SIZE
+    else:
+        # Neue Probleme werden hinten angehängt; eine Seite Überlappung fängt Verschiebungen ab
+        start = max(CATALOG_PAGE_SIZE, int(known_total) - CATALOG_PAGE_SIZE)
+    
+    skips = list(range(start, total, CATALOG_PAGE_SIZE))
+    failed_pages = 0
+    
+    if skips:
+        with ThreadPoolExecutor(max_workers=CATALOG_SYNC_WORKERS) as executor:
+            futures = [executor.submit(_fetch_problemset_page, skip, CATALOG_PAGE_SIZE) for skip in skips]
+            for future in as_completed(futures):
+                page = future.result()
+                if page is None:
+                    failed_pages += 1
+                    continue
+                changed += catalog.upsert(page["questions"])
+    
+    if failed_pages:
+        # Katalog nicht als synchronisiert markieren, damit der nächste Aufruf es erneut versucht
+        print(f"Problemkatalog unvollständig synchronisiert: {failed_pages} von {len(skips) + 1} Seiten fehlgeschlagen")
+        return changed
+    
+    catalog.set_meta("total_length", str(total))
+    if full:
+        catalog.set_meta("last_full_sync", str(time.time()))
+    catalog.mark_synced()
+    print(f"Problemkatalog synchronisiert: {changed} neue/geänderte Probleme, "
+          f"{len(skips) + 1} Anfragen ({catalog.count()} insgesamt)")
+    return changed
+
+def fetch_problems_remote(difficulty: Optional[str], limit: int = 50, search_term: Optional[str] = None,
+                          tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Ruft Probleme direkt von der LeetCode API ab. Schwierigkeitsgrad, Suchbegriff und Tags
+    werden serverseitig gefiltert, sodass genau die benötigten Probleme übertragen werden.
+    
+    Args:
+        difficulty (str): Der Schwierigkeitsgrad ('easy', 'medium', 'hard') oder None für alle
+        limit (int): Die maximale Anzahl der abzurufenden Probleme
+        search_term (str, optional): Suchbegriff
+        tags (list, optional): Topic-Slugs, die alle Probleme haben müssen
         
-        # Optional: Filtern nach Suchbegriff, wenn angegeben
-        if search_term and search_term.strip():
-            search_term = search_term.lower()
-            filtered_problems = [
-                p for p in problems 
-                if search_term in p["title"].lower() or search_term in p["titleSlug"].lower()
-            ]
-            return filtered_problems
+    Returns:
+        list: Eine Liste von Problem-Dictionaries im Format von fetch_problems
+    """
+    filters = _build_problemset_filters(difficulty, tags)
+    page = _fetch_problemset_page(0, limit, filters=filters, search_keyword=search_term)
+    return _store_remote_problems(page)
+
+def _store_remote_problems(page: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Legt die Fragen einer Seite im Katalog ab und gibt sie im Format von fetch_problems zurück."""
+    if not page:
+        return []
+    
+    questions = page["questions"] or []
+    # Treffer gleich im Katalog ablegen, damit die nächste Suche lokal beantwortet wird
+    get_catalog().upsert(questions)
+    return [ProblemCatalog.to_problem(q) for q in questions]
+
+def fetch_problems(difficulty: str, limit: int = 50, search_term: Optional[str] = None,
+                   tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Ruft Probleme aus dem lokalen Katalog ab und filtert sie nach Schwierigkeitsgrad.
+    Optional kann ein Suchbegriff für das Filtern nach Titeln verwendet werden.
+    Ist der Katalog leer oder veraltet, wird er vorher mit der LeetCode API synchronisiert.
+    Liefert der Katalog keine Treffer (z.B. weil ein Problem noch nicht synchronisiert ist),
+    wird die LeetCode API mit serverseitigen Filtern abgefragt.
+    
+    Args:
+        difficulty (str): Der Schwierigkeitsgrad ('easy', 'medium', 'hard')
+        limit (int): Die maximale Anzahl der abzurufenden Probleme
+        search_term (str, optional): Suchbegriff, um nach Titeln zu filtern
+        tags (list, optional): Topic-Slugs, die alle Probleme haben müssen
         
+    Returns:
+        list: Eine Liste von Problem-Dictionaries mit 'title' und 'titleSlug'
+    """
+    catalog = get_catalog()
+    if catalog.is_stale():
+        try:
+            sync_catalog()
+        except Exception as e:
+            # Bei Fehlern mit den (ggf. veralteten) lokalen Daten weiterarbeiten
+            print(f"Fehler bei der Synchronisierung des Problemkatalogs: {str(e)}")
+    
+    problems = catalog.query(difficulty=difficulty, search_term=search_term, tags=tags, limit=limit)
+    if problems:
         return problems
-    else:
-        print(f"Unerwartetes Antwortformat von der LeetCode API: {result}")
-        return []
+    
+    return fetch_problems_remote(difficulty, limit=limit, search_term=search_term, tags=tags)
+
+# Felder, die für ein einzelnes Problem abgerufen (und im Problem-Cache abgelegt) werden
+QUESTION_DETAIL_FIELDS = """
+        questionId
+        title
+        difficulty
+        content
+        exampleTestcases
+        metaData
+        codeSnippets {
+          lang
+          langSlug
+          code
+        }
+        topicTags {
+          name
+          slug
+        }
+"""
+
+# Maximale Anzahl von Problemen pro gebündelter GraphQL-Anfrage
+DETAIL_BATCH_SIZE = 10
+
+def _empty_problem_details() -> Dict[str, Any]:
+    return {"content": "", "exampleTestcases": ""}
 
-def fetch_full_problem(slug: str) -> Dict[str, Any]:
+def _cache_problem_details(details_by_slug: Dict[str, Dict[str, Any]]):
+    """Legt erfolgreich abgerufene Details im Problem-Cache ab (leere Details nicht)."""
+    get_problem_cache().put_many({slug: details for slug, details in details_by_slug.items()
+                                  if details and details.get("content")})
+
+def fetch_full_problem(slug: str, use_cache: bool = True) -> Dict[str, Any]:
     """
     Ruft die vollständigen Details zu einem LeetCode-Problem anhand seines Slugs ab.
+    Bereits geladene Probleme werden aus dem lokalen Problem-Cache gelesen.
     
     Args:
         slug (str): Der titleSlug des Problems
+        use_cache (bool): Auf False setzen, um die Details immer neu zu laden
         
     Returns:
         dict: Ein Dictionary mit den Problem-Details oder leeres Dictionary bei Fehler
     """
-    query = """
-    query getQuestionDetail($titleSlug: String!) {
-      question(titleSlug: $titleSlug) {
-        content
-        exampleTestcases
-      }
-    }
+    if use_cache:
+        cached = get_problem_cache().get(slug)
+        if cached is not None:
+            return cached
+    
+    data = _build_problem_detail_request(slug)
+    result = make_leetcode_request(GRAPHQL_URL, data)
+    details = _parse_problem_detail(result, slug)
+    _cache_problem_details({slug: details})
+    return details
+
+def _build_problem_detail_request(slug: str) -> Dict[str, Any]:
+    """Erstellt die GraphQL-Anfrage für die Details eines Problems."""
+    query = f"""
+    query getQuestionDetail($titleSlug: String!) {{
+      question(titleSlug: $titleSlug) {{{QUESTION_DETAIL_FIELDS}      }}
+    }}
     """
     
-    data = {
+    return {
         "query": query,
         "variables": {"titleSlug": slug}
     }
-    
-    result = make_leetcode_request("https://leetcode.com/graphql", data)
-    
+
+def _parse_problem_detail(result: Optional[Dict[str, Any]], slug: str) -> Dict[str, Any]:
+    """Liest die Problem-Details aus der GraphQL-Antwort (leere Details bei Fehler)."""
     if result is None:
         print(f"Keine Antwort von der LeetCode API für Problem {slug}")
-        return {"content": "", "exampleTestcases": ""}
+        return _empty_problem_details()
     
     if "data" in result and "question" in result["data"]:
         return result["data"]["question"]
     else:
         print(f"Unerwartetes Antwortformat für Problem {slug}: {result}")
-        return {"content": "", "exampleTestcases": ""}
\ No newline at end of file
+        return _empty_problem_details()
+
+def _fetch_problem_batch(slugs: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Ruft die Details mehrerer Probleme mit einer einzigen GraphQL-Anfrage ab.
+    Jedes Problem wird über einen eigenen Alias (q0, q1, ...) abgefragt.
+    
+    Args:
+        slugs: Die titleSlugs der Probleme (höchstens DETAIL_BATCH_SIZE)
+        
+    Returns:
+        dict: Problem-Details nach Slug
+    """
+    data = _build_problem_batch_request(slugs)
+    result = make_leetcode_request(GRAPHQL_URL, data)
+    return _parse_problem_batch(result, slugs)
+
+def _build_problem_batch_request(slugs: List[str]) -> Dict[str, Any]:
+    """Erstellt eine GraphQL-Anfrage mit einem Alias (q0, q1, ...) pro Problem."""
+    variable_defs = ", ".join(f"$s{i}: String!" for i in range(len(slugs)))
+    selections = "".join(
+        f"""
+      q{i}: question(titleSlug: $s{i}) {{{QUESTION_DETAIL_FIELDS}      }}"""
+        for i in range(len(slugs))
+    )
+    query = f"""
+    query getQuestionDetails({variable_defs}) {{{selections}
+    }}
+    """
+    
+    return {
+        "query": query,
+        "variables": {f"s{i}": slug for i, slug in enumerate(slugs)}
+    }
+
+def _parse_problem_batch(result: Optional[Dict[str, Any]], slugs: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Ordnet die Aliase der gebündelten Antwort wieder den Slugs zu.
+    Slugs ohne Details fehlen im Ergebnis, damit Aufrufer auf fetch_full_problem zurückgreifen können.
+    """
+    if result is None or not isinstance(result.get("data"), dict):
+        print(f"Keine gültige Antwort von der LeetCode API für Probleme {', '.join(slugs)}: {result}")
+        return {}
+    
+    details = {}
+    for i, slug in enumerate(slugs):
+        question = result["data"].get(f"q{i}")
+        if not question or not question.get("content"):
+            # Bei unbekannten Slugs liefert LeetCode null (ggf. mit Eintrag in "errors")
+            print(f"Keine Details für Problem {slug} erhalten")
+            continue
+        details[slug] = question
+    return details
+
+def fetch_full_problems(slugs: List[str], use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Ruft die vollständigen Details zu mehreren LeetCode-Problemen ab.
+    Bereits geladene Probleme werden aus dem Problem-Cache gelesen; die übrigen Slugs
+    werden in Blöcke von DETAIL_BATCH_SIZE aufgeteilt und jeder Block wird mit einer
+    einzigen (gebündelten) GraphQL-Anfrage abgerufen.
+    
+    Args:
+        slugs (list): Die titleSlugs der Probleme
+        use_cache (bool): Auf False setzen, um die Details immer neu zu laden
+        
+    Returns:
+        dict: Problem-Details nach Slug; Probleme, deren Details nicht abgerufen werden konnten, fehlen
+    """
+    # Doppelte Slugs entfernen, Reihenfolge beibehalten
+    unique_slugs = list(dict.fromkeys(slugs))
+    
+    cached = get_problem_cache().get_many(unique_slugs) if use_cache else {}
+    missing = [slug for slug in unique_slugs if slug not in cached]
+    
+    fetched = {}
+    for start in range(0, len(missing), DETAIL_BATCH_SIZE):
+        fetched.update(_fetch_problem_batch(missing[start:start + DETAIL_BATCH_SIZE]))
+    _cache_problem_details(fetched)
+    
+    details = dict(cached, **fetched)
+    return {slug: details[slug] for slug in unique_slugs if slug in details}
+
+def warm_problem_cache(difficulty: Optional[str] = None) -> int:
+    """
+    Lädt die Details aller (kostenlosen) Probleme aus dem Katalog in den Problem-Cache.
+    Bereits zwischengespeicherte Probleme werden übersprungen.
+    
+    Args:
+        difficulty (str, optional): Nur Probleme dieses Schwierigkeitsgrads laden
+        
+    Returns:
+        int: Anzahl der neu geladenen Probleme
+    """
+    catalog = get_catalog()
+    if catalog.is_stale():
+        sync_catalog()
+    
+    slugs = [p["titleSlug"] for p in catalog.query(difficulty=difficulty) if not p["paidOnly"]]
+    cached = get_problem_cache().get_many(slugs)
+    missing = [slug for slug in slugs if slug not in cached]
+    print(f"Problem-Cache: {len(cached)} von {len(slugs)} Problemen bereits vorhanden, lade {len(missing)} nach...")
+    
+    loaded = 0
+    for start in range(0, len(missing), DETAIL_BATCH_SIZE):
+        batch = _fetch_problem_batch(missing[start:start + DETAIL_BATCH_SIZE])
+        _cache_problem_details(batch)
+        loaded += len(batch)
+        print(f"  {min(start + DETAIL_BATCH_SIZE, len(missing))}/{len(missing)} Probleme abgerufen")
+    return loaded
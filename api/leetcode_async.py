@@ -0,0 +1,383 @@
+"""
+Asyncio variant of the LeetCode API client.
+
+The functions mirror api/leetcode.py and api/leetcode_submit.py but run on an
+aiohttp session, so a single event loop can keep hundreds of detail fetches,
+submissions and result polls in flight. They share the request builders,
+response parsers and token-bucket rate limiters with the blocking client.
+
+Example:
+    async with create_session() as session:
+        details = await fetch_full_problems_async(slugs, session=session)
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+try:
+    import aiohttp
+except ImportError:  # Optional: nur für den asynchronen Client benötigt
+    aiohttp = None
+
+from api import leetcode as sync_api
+from api import leetcode_submit as submit_api
+from api.catalog import get_catalog
+from api.poll_schedule import PollSchedule
+from api.problem_cache import get_problem_cache
+from api.rate_limiter import get_rate_limiter
+from api.submission_journal import get_submission_journal
+from api.verdict_cache import get_verdict_cache
+from utils.cassette import get_cassette
+from utils.http_client import POOL_MAXSIZE
+from utils.retry import RetryPolicy, send_with_retry_async
+
+def create_session(limit: int = POOL_MAXSIZE) -> "aiohttp.ClientSession":
+    """
+    Create a pooled aiohttp session for the LeetCode API.
+
+    Args:
+        limit: Maximum number of simultaneous connections
+
+    Returns:
+        A new aiohttp.ClientSession (use it as an async context manager)
+    """
+    if aiohttp is None:
+        raise ImportError("The async LeetCode client requires aiohttp (pip install aiohttp)")
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=limit))
+
+
+class _SessionScope:
+    """Use the given session, or a temporary one that is closed afterwards."""
+
+    def __init__(self, session: Optional["aiohttp.ClientSession"]):
+        self._session = session
+        self._owned = None
+
+    async def __aenter__(self) -> "aiohttp.ClientSession":
+        if self._session is not None:
+            return self._session
+        self._owned = create_session()
+        return self._owned
+
+    async def __aexit__(self, *exc_info):
+        if self._owned is not None:
+            await self._owned.close()
+
+
+async def _acquire(endpoint: str):
+    """Wait for a token of an endpoint class without blocking the event loop."""
+    wait = get_rate_limiter(endpoint).reserve()
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+class _Response(NamedTuple):
+    """A fully read response, so that it can be inspected outside the aiohttp context."""
+    status_code: int
+    headers: Dict[str, str]
+    text: str
+
+
+async def _request(http: "aiohttp.ClientSession", method: str, url: str, endpoint: str,
+                   policy: RetryPolicy, description: str, **kwargs) -> _Response:
+    """Send a rate-limited request and retry it according to the policy."""
+    cassette = get_cassette()
+
+    async def send():
+        await _acquire(endpoint)
+        if cassette is not None and cassette.replaying:
+            entry = cassette.next_entry(method, url, kwargs)
+            await asyncio.sleep(cassette.replay_delay(entry))
+            replayed = cassette.to_response(entry)
+            return _Response(replayed.status_code, dict(replayed.headers), replayed.text)
+
+        started = time.monotonic()
+        async with http.request(method, url, **kwargs) as response:
+            body = await response.read()
+            result = _Response(response.status, dict(response.headers), body.decode(response.get_encoding()))
+        if cassette is not None and cassette.recording:
+            cassette.record(method, url, kwargs, result.status_code, result.headers, body, time.monotonic() - started)
+        return result
+
+    return await send_with_retry_async(send, policy, description)
+
+
+async def make_leetcode_request_async(url: str, data: Dict, session: Optional["aiohttp.ClientSession"] = None,
+                                      max_retries: int = 3, retry_delay: float = 2.0) -> Optional[Dict]:
+    """
+    Send a GraphQL request with rate limiting and backoff retries (see make_leetcode_request).
+
+    Args:
+        url: The request URL
+        data: The JSON payload
+        session: Shared aiohttp session (a temporary one is used if omitted)
+        max_retries: Maximum number of attempts
+        retry_delay: Base delay for the exponential backoff in seconds
+
+    Returns:
+        The JSON response, or None on failure
+    """
+    policy = RetryPolicy(max_attempts=max_retries, base_delay=retry_delay, deadline=sync_api.REQUEST_DEADLINE)
+
+    try:
+        async with _SessionScope(session) as http:
+            response = await _request(http, "POST", url, "graphql", policy, "LeetCode-API-Anfrage",
+                                      json=data, headers=sync_api.LEETCODE_HEADERS)
+
+        if response.status_code == 200:
+            return json.loads(response.text)
+
+        print(f"API-Anfrage fehlgeschlagen mit Statuscode {response.status_code}: {response.text[:200]}...")
+        return None
+
+    except Exception as e:
+        print(f"Fehler bei der API-Anfrage: {str(e)}")
+        return None
+
+
+async def fetch_problems_async(difficulty: str, limit: int = 50, search_term: Optional[str] = None,
+                               tags: Optional[List[str]] = None,
+                               session: Optional["aiohttp.ClientSession"] = None) -> List[Dict[str, Any]]:
+    """
+    Async variant of fetch_problems: answers from the local catalog and falls back
+    to a server-side filtered query if the catalog has no match.
+    """
+    catalog = get_catalog()
+    if catalog.is_stale():
+        try:
+            # Die Synchronisierung ist selten (TTL) und läuft im Thread-Pool
+            await asyncio.to_thread(sync_api.sync_catalog)
+        except Exception as e:
+            print(f"Fehler bei der Synchronisierung des Problemkatalogs: {str(e)}")
+
+    problems = catalog.query(difficulty=difficulty, search_term=search_term, tags=tags, limit=limit)
+    if problems:
+        return problems
+
+    filters = sync_api._build_problemset_filters(difficulty, tags)
+    data = sync_api._build_problemset_request(0, limit, filters, search_term)
+    result = await make_leetcode_request_async(sync_api.GRAPHQL_URL, data, session=session)
+    return sync_api._store_remote_problems(sync_api._parse_problemset_page(result, 0))
+
+
+async def fetch_full_problem_async(slug: str, session: Optional["aiohttp.ClientSession"] = None,
+                                   use_cache: bool = True) -> Dict[str, Any]:
+    """Async variant of fetch_full_problem."""
+    if use_cache:
+        cached = get_problem_cache().get(slug)
+        if cached is not None:
+            return cached
+
+    data = sync_api._build_problem_detail_request(slug)
+    result = await make_leetcode_request_async(sync_api.GRAPHQL_URL, data, session=session)
+    details = sync_api._parse_problem_detail(result, slug)
+    sync_api._cache_problem_details({slug: details})
+    return details
+
+
+async def fetch_full_problems_async(slugs: List[str], session: Optional["aiohttp.ClientSession"] = None,
+                                    use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+    """
+    Async variant of fetch_full_problems; all uncached chunks are requested concurrently.
+
+    Args:
+        slugs: The titleSlugs of the problems
+        session: Shared aiohttp session
+        use_cache: Set to False to always fetch the details again
+
+    Returns:
+        Problem details keyed by slug; problems whose details could not be fetched are left out
+    """
+    unique_slugs = list(dict.fromkeys(slugs))
+    cached = get_problem_cache().get_many(unique_slugs) if use_cache else {}
+    missing = [slug for slug in unique_slugs if slug not in cached]
+    chunks = [missing[i:i + sync_api.DETAIL_BATCH_SIZE]
+              for i in range(0, len(missing), sync_api.DETAIL_BATCH_SIZE)]
+
+    async with _SessionScope(session) as http:
+        async def fetch_chunk(chunk):
+            data = sync_api._build_problem_batch_request(chunk)
+            result = await make_leetcode_request_async(sync_api.GRAPHQL_URL, data, session=http)
+            return sync_api._parse_problem_batch(result, chunk)
+
+        results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+
+    fetched = {}
+    for chunk_details in results:
+        fetched.update(chunk_details)
+    sync_api._cache_problem_details(fetched)
+
+    details = dict(cached, **fetched)
+    return {slug: details[slug] for slug in unique_slugs if slug in details}
+
+
+async def get_question_id_by_slug_async(slug: str, session: Optional["aiohttp.ClientSession"] = None) -> Optional[str]:
+    """Async variant of get_question_id_by_slug."""
+    logging.info(f"Getting question ID for slug: {slug}")
+
+    question_id = get_catalog().get_question_id(slug)
+    if question_id:
+        logging.info(f"Question ID for {slug} found in catalog: {question_id}")
+        return question_id
+
+    data = {
+        "query": submit_api.QUESTION_ID_QUERY,
+        "variables": {"titleSlug": slug}
+    }
+
+    try:
+        async with _SessionScope(session) as http:
+            response = await _request(http, "POST", sync_api.GRAPHQL_URL, "graphql",
+                                      submit_api.GRAPHQL_RETRY_POLICY, f"Question ID lookup for {slug}",
+                                      json=data, headers=submit_api._question_id_headers(slug))
+        logging.info(f"Got response with status code: {response.status_code}")
+        if response.status_code != 200:
+            logging.error(f"Failed to get question ID, status code: {response.status_code}")
+            return None
+        question_id = submit_api._parse_question_id(json.loads(response.text))
+        if question_id:
+            get_catalog().remember_question_id(slug, question_id)
+        return question_id
+    except Exception as e:
+        logging.exception(f"Exception during question ID retrieval: {str(e)}")
+        return None
+
+
+async def submit_solution_async(problem_slug: str, code: str, language: str = "cpp",
+                                session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+    """Async variant of submit_solution."""
+    logging.info(f"Submitting solution for problem: {problem_slug}, language: {language}")
+
+    if not submit_api.LEETCODE_SESSION or not submit_api.LEETCODE_CSRF:
+        logging.error("Authentication credentials not found")
+        return {
+            "success": False,
+            "error": "Authentication credentials not found. Please set LEETCODE_SESSION and LEETCODE_CSRF in .env file."
+        }
+
+    async with _SessionScope(session) as http:
+        question_id = await get_question_id_by_slug_async(problem_slug, session=http)
+        if not question_id:
+            logging.error(f"Could not get question ID for slug: {problem_slug}")
+            return {
+                "success": False,
+                "error": f"Could not get question ID for slug: {problem_slug}"
+            }
+
+        data = {
+            "lang": language,
+            "question_id": question_id,
+            "typed_code": code
+        }
+        url = f"{sync_api.BASE_URL}/problems/{problem_slug}/submit/"
+
+        try:
+            response = await _request(http, "POST", url, "submit", submit_api.SUBMIT_RETRY_POLICY,
+                                      f"Submission for {problem_slug}",
+                                      json=data, headers=submit_api._submit_headers(problem_slug))
+            return submit_api._parse_submit_response(response.status_code, response.text, response.headers)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Exception during submission: {str(e)}"
+            }
+
+
+async def check_submission_result_async(submission_id: str,
+                                        session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Any]:
+    """Async variant of check_submission_result."""
+    logging.info(f"Checking submission result for ID: {submission_id}")
+
+    if not submit_api.LEETCODE_SESSION or not submit_api.LEETCODE_CSRF:
+        return {
+            "success": False,
+            "error": "Authentication credentials not found. Please set LEETCODE_SESSION and LEETCODE_CSRF in .env file."
+        }
+
+    url = f"{sync_api.BASE_URL}/submissions/detail/{submission_id}/check/"
+
+    try:
+        async with _SessionScope(session) as http:
+            response = await _request(http, "GET", url, "check", submit_api.CHECK_RETRY_POLICY,
+                                      f"Check for submission {submission_id}", headers=submit_api._check_headers())
+        logging.info(f"Got response with status code: {response.status_code}")
+        return submit_api._parse_check_response(response.status_code, response.text, response.headers)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Exception during check: {str(e)}",
+            "traceback": submit_api.import_traceback()
+        }
+
+
+async def submit_and_wait_for_result_async(problem_slug: str, code: str, language: str = "cpp", timeout: int = 30,
+                                           session: Optional["aiohttp.ClientSession"] = None,
+                                           force_resubmit: bool = False) -> Dict[str, Any]:
+    """
+    Async variant of submit_and_wait_for_result (with the same adaptive poll
+    schedule, verdict cache and submission journal). While a submission is
+    being judged the coroutine only awaits, so many submissions can be polled
+    at once.
+    """
+    journal = get_submission_journal()
+    outstanding = None
+    if not force_resubmit:
+        cached = get_verdict_cache().get(problem_slug, language, code)
+        if cached is not None:
+            logging.info(f"Using cached verdict for {problem_slug}: {cached.get('status_description')}")
+            return cached
+        outstanding = journal.find_outstanding(problem_slug, language, code)
+
+    try:
+        async with _SessionScope(session) as http:
+            if outstanding is not None:
+                # Dieselbe Lösung wurde schon eingereicht, das Urteil aber nie abgeholt
+                logging.info(f"Waiting for outstanding submission {outstanding['submission_id']} of {problem_slug}")
+                submission_id, submitted_at = outstanding["submission_id"], outstanding["ts"]
+            else:
+                logging.info(f"Starting submission process for {problem_slug}")
+                submit_result = await submit_solution_async(problem_slug, code, language, session=http)
+                if not submit_result["success"]:
+                    logging.error(f"Failed to submit solution: {submit_result.get('error')}")
+                    return submit_result
+
+                submission_id = submit_result.get("submission_id")
+                if not submission_id:
+                    logging.error("No submission ID returned")
+                    return {"success": False, "error": "No submission ID returned"}
+
+                submitted_at = time.time()
+                # record_submit wartet auf das fsync, deshalb nicht im Event-Loop
+                await asyncio.to_thread(journal.record_submit, problem_slug, language, code, submission_id)
+
+            schedule = PollSchedule.for_problem(problem_slug, language, submitted_at)
+            deadline = time.time() + timeout
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                await asyncio.sleep(min(schedule.next_delay(), remaining))
+
+                check_result = await check_submission_result_async(submission_id, session=http)
+                if not check_result["success"]:
+                    logging.error(f"Error checking submission: {check_result.get('error', 'Unknown error')}")
+                    return {"success": False, "error": check_result.get('error', 'Unknown error during check')}
+
+                result = submit_api.finished_submission_result(check_result)
+                if result is not None:
+                    schedule.record_verdict(check_result.get("details"))
+                    journal.record_verdict(submission_id, result)
+                    get_verdict_cache().put(problem_slug, language, code, result)
+                    return result
+                journal.record_poll(submission_id, check_result.get("details", {}).get("state"))
+
+        logging.error(f"Timed out waiting for submission result after {timeout} seconds")
+        return {"success": False, "pending": True, "submission_id": submission_id,
+                "error": f"Timeout after {timeout} seconds"}
+
+    except Exception as e:
+        logging.error(f"Error in submission process: {str(e)}")
+        return {"success": False, "error": f"Submission error: {str(e)}"}
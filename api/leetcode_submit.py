@@ -1,4 +1,3 @@
-import requests
 import time
 import os
 import json
@@ -8,6 +7,15 @@ from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 
+from api.catalog import get_catalog
+from api.leetcode import BASE_URL, GRAPHQL_URL
+from api.poll_schedule import PollSchedule
+from api.rate_limiter import get_rate_limiter
+from api.submission_journal import get_submission_journal
+from api.verdict_cache import get_verdict_cache
+from utils import http_client
+from utils.retry import RetryPolicy, send_with_retry
+
 # Load environment variables with authentication credentials
 load_dotenv()
 
@@ -30,22 +38,13 @@ logging.basicConfig(
 LEETCODE_SESSION = os.environ.get("LEETCODE_SESSION", "")
 LEETCODE_CSRF = os.environ.get("LEETCODE_CSRF", "")
 
-# Rate limiting settings
-MIN_REQUEST_INTERVAL = 2.0
-last_request_time = 0
-
-
-def _rate_limit():
-    """Simple rate limiting for API requests"""
-    global last_request_time
-    current_time = time.time()
-    elapsed = current_time - last_request_time
-    
-    if elapsed < MIN_REQUEST_INTERVAL:
-        sleep_time = MIN_REQUEST_INTERVAL - elapsed
-        time.sleep(sleep_time)
-    
-    last_request_time = time.time()
+# Retry policies: exponential backoff with jitter, honouring Retry-After (see utils/retry.py)
+GRAPHQL_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=2.0, deadline=60.0)
+# Submissions are only retried when LeetCode did not accept them, to avoid duplicate submissions.
+# A timeout or connection reset may come after LeetCode has accepted the submission, so it is not retried
+SUBMIT_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=2.0, deadline=60.0, retry_statuses=(429, 503),
+                                  retry_exceptions=False)
+CHECK_RETRY_POLICY = RetryPolicy(max_attempts=4, base_delay=1.0, deadline=30.0)
 
 
 def submit_solution(problem_slug: str, code: str, language: str = "cpp") -> Dict[str, Any]:
@@ -70,9 +69,6 @@ def submit_solution(problem_slug: str, code: str, language: str = "cpp") -> Dict
             "error": "Authentication credentials not found. Please set LEETCODE_SESSION and LEETCODE_CSRF in .env file."
         }
     
-    # Rate limiting
-    _rate_limit()
-    
     # First, we need to get the question ID for the problem
     question_id = get_question_id_by_slug(problem_slug)
     if not question_id:
@@ -85,14 +81,7 @@ def submit_solution(problem_slug: str, code: str, language: str = "cpp") -> Dict
     logging.info(f"Got question ID: {question_id} for {problem_slug}")
     
     # Set up headers with authentication cookies
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-        "Referer": f"https://leetcode.com/problems/{problem_slug}/",
-        "Cookie": f"csrftoken={LEETCODE_CSRF}; LEETCODE_SESSION={LEETCODE_SESSION}",
-        "X-CSRFToken": LEETCODE_CSRF,
-        "Origin": "https://leetcode.com"
-    }
+    headers = _submit_headers(problem_slug)
     
     # Submission data
     data = {
@@ -102,49 +91,80 @@ def submit_solution(problem_slug: str, code: str, language: str = "cpp") -> Dict
     }
     
     # Submit the solution
-    url = f"https://leetcode.com/problems/{problem_slug}/submit/"
+    url = f"{BASE_URL}/problems/{problem_slug}/submit/"
+    
+    def send():
+        # Rate limiting (shared token bucket per endpoint class, see api/rate_limiter.py)
+        get_rate_limiter("submit").acquire()
+        return http_client.post(url, json=data, headers=headers)
     
     try:
-        response = requests.post(url, json=data, headers=headers)
+        response = send_with_retry(send, SUBMIT_RETRY_POLICY, f"Submission for {problem_slug}")
+        return _parse_submit_response(response.status_code, response.text, response.headers)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Exception during submission: {str(e)}"
+        }
+
+
+def _submit_headers(problem_slug: str) -> Dict[str, str]:
+    """Headers with authentication cookies for the submit endpoint."""
+    return {
+        "Content-Type": "application/json",
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
+        "Referer": f"{BASE_URL}/problems/{problem_slug}/",
+        "Cookie": f"csrftoken={LEETCODE_CSRF}; LEETCODE_SESSION={LEETCODE_SESSION}",
+        "X-CSRFToken": LEETCODE_CSRF,
+        "Origin": BASE_URL
+    }
+
+
+def _parse_submit_response(status_code: int, text: str, response_headers) -> Dict[str, Any]:
+    """
+    Turn the raw response of the submit endpoint into a result dict.
+    
+    Args:
+        status_code: HTTP status code
+        text: Response body
+        response_headers: Response headers
         
-        if response.status_code == 200:
-            try:
-                result = response.json()
-                if "submission_id" in result:
-                    return {
-                        "success": True,
-                        "submission_id": result["submission_id"]
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "No submission ID in response",
-                        "response": result
-                    }
-            except json.JSONDecodeError:
+    Returns:
+        Dict with submission ID and status
+    """
+    if status_code == 200:
+        try:
+            result = json.loads(text)
+            if "submission_id" in result:
+                return {
+                    "success": True,
+                    "submission_id": result["submission_id"]
+                }
+            else:
                 return {
                     "success": False,
-                    "error": f"Invalid JSON response from LeetCode",
-                    "response": response.text[:500]  # First 500 chars for debugging
+                    "error": "No submission ID in response",
+                    "response": result
                 }
-        else:
-            # Try to parse response content for better error message
-            try:
-                error_content = response.json()
-                error_message = error_content.get('error', 'Unknown error')
-            except:
-                error_message = response.text[:500] if response.text else "No error message"
-                
+        except json.JSONDecodeError:
             return {
                 "success": False,
-                "error": f"Submission failed with status code {response.status_code}",
-                "message": error_message,
-                "headers": dict(response.headers)
+                "error": f"Invalid JSON response from LeetCode",
+                "response": text[:500]  # First 500 chars for debugging
             }
-    except Exception as e:
+    else:
+        # Try to parse response content for better error message
+        try:
+            error_content = json.loads(text)
+            error_message = error_content.get('error', 'Unknown error')
+        except:
+            error_message = text[:500] if text else "No error message"
+            
         return {
             "success": False,
-            "error": f"Exception during submission: {str(e)}"
+            "error": f"Submission failed with status code {status_code}",
+            "message": error_message,
+            "headers": dict(response_headers)
         }
 
 
@@ -160,46 +180,35 @@ def get_question_id_by_slug(slug: str) -> Optional[str]:
     """
     logging.info(f"Getting question ID for slug: {slug}")
     
-    # Rate limiting
-    _rate_limit()
-    
-    # GraphQL query to get question ID
-    query = """
-    query questionData($titleSlug: String!) {
-      question(titleSlug: $titleSlug) {
-        questionId
-        title
-      }
-    }
-    """
+    # The catalog already knows the ID of every synced problem, so the extra
+    # rate-limited GraphQL request is only needed for unknown slugs
+    question_id = get_catalog().get_question_id(slug)
+    if question_id:
+        logging.info(f"Question ID for {slug} found in catalog: {question_id}")
+        return question_id
     
     # Set up headers with authentication cookies
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-        "Referer": f"https://leetcode.com/problems/{slug}/",
-        "Cookie": f"csrftoken={LEETCODE_CSRF}; LEETCODE_SESSION={LEETCODE_SESSION}",
-    }
+    headers = _question_id_headers(slug)
     
     data = {
-        "query": query,
+        "query": QUESTION_ID_QUERY,
         "variables": {"titleSlug": slug}
     }
     
+    def send():
+        # Rate limiting
+        get_rate_limiter("graphql").acquire()
+        return http_client.post(GRAPHQL_URL, json=data, headers=headers)
+    
     try:
-        response = requests.post("https://leetcode.com/graphql", json=data, headers=headers)
+        response = send_with_retry(send, GRAPHQL_RETRY_POLICY, f"Question ID lookup for {slug}")
         logging.info(f"Got response with status code: {response.status_code}")
         
         if response.status_code == 200:
-            result = response.json()
-            logging.info(f"GraphQL response: {json.dumps(result)[:500]}")
-            
-            if result and "data" in result and "question" in result["data"] and "questionId" in result["data"]["question"]:
-                question_id = result["data"]["question"]["questionId"]
-                logging.info(f"Successfully extracted question ID: {question_id}")
-                return question_id
-            else:
-                logging.error(f"Failed to extract question ID, structure not as expected: {json.dumps(result)[:500]}")
+            question_id = _parse_question_id(response.json())
+            if question_id:
+                get_catalog().remember_question_id(slug, question_id)
+            return question_id
         else:
             logging.error(f"Failed to get question ID, status code: {response.status_code}")
         
@@ -209,6 +218,40 @@ def get_question_id_by_slug(slug: str) -> Optional[str]:
         return None
 
 
+# GraphQL query to get question ID
+QUESTION_ID_QUERY = """
+    query questionData($titleSlug: String!) {
+      question(titleSlug: $titleSlug) {
+        questionId
+        title
+      }
+    }
+    """
+
+
+def _question_id_headers(slug: str) -> Dict[str, str]:
+    """Headers with authentication cookies for the question ID lookup."""
+    return {
+        "Content-Type": "application/json",
+        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
+        "Referer": f"{BASE_URL}/problems/{slug}/",
+        "Cookie": f"csrftoken={LEETCODE_CSRF}; LEETCODE_SESSION={LEETCODE_SESSION}",
+    }
+
+
+def _parse_question_id(result: Dict[str, Any]) -> Optional[str]:
+    """Extract the question ID from the GraphQL response, or None."""
+    logging.info(f"GraphQL response: {json.dumps(result)[:500]}")
+    
+    if result and "data" in result and result["data"].get("question") and "questionId" in result["data"]["question"]:
+        question_id = result["data"]["question"]["questionId"]
+        logging.info(f"Successfully extracted question ID: {question_id}")
+        return question_id
+    
+    logging.error(f"Failed to extract question ID, structure not as expected: {json.dumps(result)[:500]}")
+    return None
+
+
 def check_submission_result(submission_id: str) -> Dict[str, Any]:
     """
     Check the result of a LeetCode submission.
@@ -228,119 +271,141 @@ def check_submission_result(submission_id: str) -> Dict[str, Any]:
             "error": "Authentication credentials not found. Please set LEETCODE_SESSION and LEETCODE_CSRF in .env file."
         }
     
-    # Rate limiting
-    _rate_limit()
-    
     # Set up headers with authentication cookies
-    headers = {
+    headers = _check_headers()
+    
+    # Check the submission result
+    url = f"{BASE_URL}/submissions/detail/{submission_id}/check/"
+    
+    def send():
+        # Rate limiting
+        get_rate_limiter("check").acquire()
+        return http_client.get(url, headers=headers)
+    
+    try:
+        response = send_with_retry(send, CHECK_RETRY_POLICY, f"Check for submission {submission_id}")
+        logging.info(f"Got response with status code: {response.status_code}")
+        return _parse_check_response(response.status_code, response.text, response.headers)
+    except Exception as e:
+        return {
+            "success": False,
+            "error": f"Exception during check: {str(e)}",
+            "traceback": import_traceback() 
+        }
+
+
+def _check_headers() -> Dict[str, str]:
+    """Headers with authentication cookies for the check endpoint."""
+    return {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-        "Referer": "https://leetcode.com/submissions/",
+        "Referer": f"{BASE_URL}/submissions/",
         "Cookie": f"csrftoken={LEETCODE_CSRF}; LEETCODE_SESSION={LEETCODE_SESSION}",
         "X-Requested-With": "XMLHttpRequest",
         "Accept": "application/json"
     }
+
+
+def _parse_check_response(status_code: int, text: str, response_headers) -> Dict[str, Any]:
+    """
+    Turn the raw response of the check endpoint into a result dict.
     
-    # Check the submission result
-    url = f"https://leetcode.com/submissions/detail/{submission_id}/check/"
-    
-    try:
-        response = requests.get(url, headers=headers)
-        logging.info(f"Got response with status code: {response.status_code}")
+    Args:
+        status_code: HTTP status code
+        text: Response body
+        response_headers: Response headers
         
-        if response.status_code == 200:
-            try:
-                result = response.json()
-                logging.info(f"Parsed JSON response: {json.dumps(result)[:500]}")
-                
-                if not result:
-                    logging.error("Empty response from LeetCode API")
-                    return {
-                        "success": False,
-                        "error": "Empty response from LeetCode API",
-                        "response": result
-                    }
-                
-                # Check if the result is ready
-                state = result.get("state", "")
-                logging.info(f"Submission state: {state}")
-                
-                if state == "SUCCESS":
-                    # Safely access nested values with default values to prevent NoneType errors
-                    runtime_percentile = result.get("runtime_percentile", None)
-                    memory_percentile = result.get("memory_percentile", None)
-                    
-                    # Get runtime and memory values safely
-                    runtime_ms = None
-                    memory_val = None
-                    
-                    if isinstance(runtime_percentile, dict):
-                        runtime_ms = runtime_percentile.get("value", None)
-                    elif isinstance(runtime_percentile, (int, float)):
-                        runtime_ms = runtime_percentile
-                        
-                    if isinstance(memory_percentile, dict):
-                        memory_val = memory_percentile.get("value", None)
-                    elif isinstance(memory_percentile, (int, float)):
-                        memory_val = memory_percentile
-                    
+    Returns:
+        Dict with submission results
+    """
+    if status_code == 200:
+        try:
+            result = json.loads(text)
+            logging.info(f"Parsed JSON response: {json.dumps(result)[:500]}")
+
+            if not result:
+                logging.error("Empty response from LeetCode API")
+                return {
+                    "success": False,
+                    "error": "Empty response from LeetCode API",
+                    "response": result
+                }
+
+            # Check if the result is ready
+            state = result.get("state", "")
+            logging.info(f"Submission state: {state}")
+
+            if state == "SUCCESS":
+                # Safely access nested values with default values to prevent NoneType errors
+                runtime_percentile = result.get("runtime_percentile", None)
+                memory_percentile = result.get("memory_percentile", None)
+
+                # Get runtime and memory values safely
+                runtime_ms = None
+                memory_val = None
+
+                if isinstance(runtime_percentile, dict):
+                    runtime_ms = runtime_percentile.get("value", None)
+                elif isinstance(runtime_percentile, (int, float)):
+                    runtime_ms = runtime_percentile
+
+                if isinstance(memory_percentile, dict):
+                    memory_val = memory_percentile.get("value", None)
+                elif isinstance(memory_percentile, (int, float)):
+                    memory_val = memory_percentile
+
+                return {
+                    "success": True,
+                    "result": result.get("status_msg", ""),
+                    "runtime_ms": runtime_ms,
+                    "memory_percentile": memory_val,
+                    "total_testcases": result.get("total_testcases", 0),
+                    "passed_testcases": result.get("total_correct", 0),
+                    "status_code": result.get("status_code", 0),
+                    "language": result.get("lang", "cpp"),
+                    "details": result
+                }
+            elif state == "PENDING" or state == "STARTED":
+                return {
+                    "success": True,
+                    "pending": True,
+                    "details": result
+                }
+            else:
+                # Wenn ein status_code vorhanden ist, ist die Submission abgeschlossen
+                if "status_code" in result:
                     return {
                         "success": True,
-                        "result": result.get("status_msg", ""),
-                        "runtime_ms": runtime_ms,
-                        "memory_percentile": memory_val,
-                        "total_testcases": result.get("total_testcases", 0),
-                        "passed_testcases": result.get("total_correct", 0),
-                        "status_code": result.get("status_code", 0),
+                        "status_code": result.get("status_code"),
                         "language": result.get("lang", "cpp"),
                         "details": result
                     }
-                elif state == "PENDING" or state == "STARTED":
-                    return {
-                        "success": True,
-                        "pending": True,
-                        "details": result
-                    }
-                else:
-                    # Wenn ein status_code vorhanden ist, ist die Submission abgeschlossen
-                    if "status_code" in result:
-                        return {
-                            "success": True,
-                            "status_code": result.get("status_code"),
-                            "language": result.get("lang", "cpp"),
-                            "details": result
-                        }
-                    
-                    # Andernfalls unbekannter Status
-                    return {
-                        "success": True,
-                        "unknown_state": True,
-                        "details": result
-                    }
-            except json.JSONDecodeError:
+
+                # Andernfalls unbekannter Status
                 return {
-                    "success": False,
-                    "error": f"Invalid JSON response from LeetCode",
-                    "response": response.text[:500]  # First 500 chars for debugging
+                    "success": True,
+                    "unknown_state": True,
+                    "details": result
                 }
-        else:
-            # Try to parse response content for better error message
-            try:
-                error_content = response.json()
-                error_message = error_content.get('error', 'Unknown error') if error_content else 'Unknown error'
-            except:
-                error_message = response.text[:500] if response.text else "No error message"
-                
+        except json.JSONDecodeError:
             return {
                 "success": False,
-                "error": f"Check submission failed with status code {response.status_code}",
-                "message": error_message,
-                "headers": dict(response.headers)
+                "error": f"Invalid JSON response from LeetCode",
+                "response": text[:500]  # First 500 chars for debugging
             }
-    except Exception as e:
+    else:
+        # Try to parse response content for better error message
+        try:
+            error_content = json.loads(text)
+            error_message = error_content.get('error', 'Unknown error') if error_content else 'Unknown error'
+        except:
+            error_message = text[:500] if text else "No error message"
+
         return {
             "success": False,
-            "error": f"Exception during check: {str(e)}",
-            "traceback": import_traceback() 
+            "error": f"Check submission failed with status code {status_code}",
+            "http_status": status_code,
+            "message": error_message,
+            "headers": dict(response_headers)
         }
 
 
@@ -376,19 +441,40 @@ def get_status_description(status_code: int) -> Tuple[str, str]:
     return status_map.get(status_code, ("Unknown Status", "gray"))
 
 
-def submit_and_wait_for_result(problem_slug: str, code: str, language: str = "cpp", timeout: int = 30) -> Dict[str, Any]:
+def submit_and_wait_for_result(problem_slug: str, code: str, language: str = "cpp", timeout: int = 30,
+                               force_resubmit: bool = False) -> Dict[str, Any]:
     """
     Submit a solution to LeetCode and wait for the result.
     
+    If the same code (ignoring comments and whitespace) was already judged for
+    this problem, the stored verdict is returned without submitting again
+    (see api/verdict_cache.py).
+    
     Args:
         problem_slug: The LeetCode problem slug (e.g., "two-sum")
         code: The solution code to submit
         language: The programming language (default: "cpp")
         timeout: Maximum time to wait for submission result in seconds
+        force_resubmit: Submit even if a verdict for this code is cached
         
     Returns:
         Dict with submission results
     """
+    if not force_resubmit:
+        cached = get_verdict_cache().get(problem_slug, language, code)
+        if cached is not None:
+            logging.info(f"Using cached verdict for {problem_slug}: {cached.get('status_description')}")
+            return cached
+        
+        # Dieselbe Lösung wurde schon eingereicht, das Urteil aber nie abgeholt (z.B. nach einem Absturz)
+        outstanding = get_submission_journal().find_outstanding(problem_slug, language, code)
+        if outstanding is not None:
+            logging.info(f"Waiting for outstanding submission {outstanding['submission_id']} of {problem_slug}")
+            result = wait_for_submission_result(outstanding["submission_id"], problem_slug, language, timeout,
+                                                submitted_at=outstanding["ts"])
+            get_verdict_cache().put(problem_slug, language, code, result)
+            return result
+    
     logging.info(f"Starting submission process for {problem_slug}")
     
     try:
@@ -404,48 +490,11 @@ def submit_and_wait_for_result(problem_slug: str, code: str, language: str = "cp
             logging.error("No submission ID returned")
             return {"success": False, "error": "No submission ID returned"}
             
-        # Step 2: Wait for and check the submission result
-        start_time = time.time()
-        result = None
+        get_submission_journal().record_submit(problem_slug, language, code, submission_id)
         
-        while time.time() - start_time < timeout:
-            check_result = check_submission_result(submission_id)
-            
-            # If we got a valid result with success flag
-            if check_result["success"]:
-                # LeetCode gibt zwei verschiedene Antwortformate:
-                # 1. Anfangs: {"state": "PENDING"} 
-                # 2. Bei Abschluss: {"status_code": 10, ...} ohne state-Feld
-                response_data = check_result.get("details", {})
-                
-                # Wenn status_code vorhanden ist, ist die Submission abgeschlossen
-                if "status_code" in response_data:
-                    logging.info(f"Submission abgeschlossen mit Status Code: {response_data['status_code']}")
-                    result = process_submission_result(response_data)
-                    break
-                
-                # Andernfalls prüfen wir den state
-                state = response_data.get("state", "")
-                if state in ["SUCCESS", "FAILURE"]:
-                    logging.info(f"Submission abgeschlossen mit State: {state}")
-                    result = process_submission_result(response_data)
-                    break
-                elif state == "PENDING" or state == "STARTED":
-                    logging.info(f"Submission läuft noch: {state}")
-                else:
-                    logging.info(f"Unbekannter Submission-Status: {state}")
-            else:
-                # Bei einem Fehler in der Antwort auch abbrechen
-                logging.error(f"Error checking submission: {check_result.get('error', 'Unknown error')}")
-                return {"success": False, "error": check_result.get('error', 'Unknown error during check')}
-            
-            # Wait before checking again
-            time.sleep(2)
-            
-        if result is None:
-            logging.error(f"Timed out waiting for submission result after {timeout} seconds")
-            return {"success": False, "error": f"Timeout after {timeout} seconds"}
-            
+        # Step 2: Wait for and check the submission result
+        result = wait_for_submission_result(submission_id, problem_slug, language, timeout, submitted_at=time.time())
+        get_verdict_cache().put(problem_slug, language, code, result)
         return result
     
     except Exception as e:
@@ -453,6 +502,89 @@ def submit_and_wait_for_result(problem_slug: str, code: str, language: str = "cp
         return {"success": False, "error": f"Submission error: {str(e)}"}
 
 
+def wait_for_submission_result(submission_id: str, problem_slug: str, language: str = "cpp", timeout: int = 30,
+                               submitted_at: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Poll the result of a submission on an adaptive schedule (see api/poll_schedule.py).
+    
+    The last check is sent right at the deadline. If the verdict is still not in,
+    the returned dict contains the submission_id and "pending": True, so the
+    result can be picked up later by calling this function again instead of
+    resubmitting. Polls and the verdict are written to the submission journal.
+    
+    Args:
+        submission_id: The submission ID returned by submit_solution
+        problem_slug: The LeetCode problem slug
+        language: The programming language of the submission
+        timeout: Maximum time to wait for the result in seconds
+        submitted_at: time.time() of the submission (defaults to now)
+        
+    Returns:
+        Dict with submission results
+    """
+    schedule = PollSchedule.for_problem(problem_slug, language, submitted_at)
+    deadline = time.time() + timeout
+    
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(schedule.next_delay(), remaining))
+        
+        check_result = check_submission_result(submission_id)
+        if not check_result["success"]:
+            # Bei einem Fehler in der Antwort abbrechen
+            logging.error(f"Error checking submission: {check_result.get('error', 'Unknown error')}")
+            return {"success": False, "error": check_result.get('error', 'Unknown error during check')}
+        
+        result = finished_submission_result(check_result)
+        if result is not None:
+            schedule.record_verdict(check_result.get("details"))
+            get_submission_journal().record_verdict(submission_id, result)
+            return result
+        get_submission_journal().record_poll(submission_id, check_result.get("details", {}).get("state"))
+    
+    logging.error(f"Timed out waiting for submission result after {timeout} seconds")
+    return {
+        "success": False,
+        "pending": True,
+        "submission_id": submission_id,
+        "error": f"Timeout after {timeout} seconds"
+    }
+
+
+def finished_submission_result(check_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Return the processed result if a successful check response shows a finished submission.
+    
+    Args:
+        check_result: A successful result of check_submission_result
+        
+    Returns:
+        The processed submission result, or None if the submission is still running
+    """
+    # LeetCode gibt zwei verschiedene Antwortformate:
+    # 1. Anfangs: {"state": "PENDING"} 
+    # 2. Bei Abschluss: {"status_code": 10, ...} ohne state-Feld
+    response_data = check_result.get("details", {})
+    
+    # Wenn status_code vorhanden ist, ist die Submission abgeschlossen
+    if "status_code" in response_data:
+        logging.info(f"Submission abgeschlossen mit Status Code: {response_data['status_code']}")
+        return process_submission_result(response_data)
+    
+    # Andernfalls prüfen wir den state
+    state = response_data.get("state", "")
+    if state in ["SUCCESS", "FAILURE"]:
+        logging.info(f"Submission abgeschlossen mit State: {state}")
+        return process_submission_result(response_data)
+    elif state == "PENDING" or state == "STARTED":
+        logging.info(f"Submission läuft noch: {state}")
+    else:
+        logging.info(f"Unbekannter Submission-Status: {state}")
+    return None
+
+
 def process_submission_result(response_data):
     """
     Process the raw submission result data into a more usable format.
@@ -0,0 +1,186 @@
+"""
+Adaptive polling schedule for LeetCode submission results.
+
+Instead of checking every two seconds, the poll loops ask a PollSchedule when
+to check next. The schedule uses the judge latency observed for earlier
+submissions with the same language and difficulty: the first check is sent
+shortly before the verdict is expected, later checks back off geometrically.
+Without observations it starts fast (after half a second) and backs off.
+
+The latency estimate is an exponentially weighted moving average with a
+deviation term (as used for TCP round-trip times) and is kept in a small
+SQLite database, so it carries over between runs.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from api.catalog import get_catalog
+from utils.storage import site_database_path, open_database
+
+JUDGE_LATENCY_FILENAME = "judge_latency.sqlite3"
+
+# Gewichte des gleitenden Mittelwerts und der Abweichung (wie bei der TCP-RTT-Schätzung)
+EWMA_ALPHA = 0.125
+EWMA_BETA = 0.25
+
+# Grenzen für den Abstand zwischen zwei Statusabfragen (Sekunden)
+MIN_POLL_DELAY = 0.5
+MAX_POLL_DELAY = 5.0
+BACKOFF_FACTOR = 1.5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS judge_latency (
+    language TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    mean REAL NOT NULL,
+    deviation REAL NOT NULL,
+    samples INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (language, difficulty)
+);
+"""
+
+
+class JudgeLatencyModel:
+    """Persistent EWMA estimate of the time from submission to verdict."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or site_database_path(JUDGE_LATENCY_FILENAME)
+        self._lock = threading.Lock()
+        self._conn = open_database(self.path)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def estimate(self, language: str, difficulty: str) -> Optional[Tuple[float, float]]:
+        """
+        Return the estimated judge latency.
+
+        Falls back to the estimate for the language over all difficulties.
+
+        Args:
+            language: Submission language (e.g. "cpp")
+            difficulty: 'easy', 'medium', 'hard' or 'unknown'
+
+        Returns:
+            (mean, deviation) in seconds, or None without observations
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mean, deviation FROM judge_latency WHERE language = ? AND difficulty = ?",
+                (language, difficulty),
+            ).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    """
+                    SELECT SUM(mean * samples) / SUM(samples), SUM(deviation * samples) / SUM(samples)
+                    FROM judge_latency WHERE language = ?
+                    """,
+                    (language,),
+                ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return row[0], row[1]
+
+    def observe(self, language: str, difficulty: str, latency: float):
+        """Fold an observed time-to-verdict (seconds) into the estimate."""
+        if latency <= 0:
+            return
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT mean, deviation, samples FROM judge_latency WHERE language = ? AND difficulty = ?",
+                (language, difficulty),
+            ).fetchone()
+            if row is None:
+                mean, deviation, samples = latency, latency / 2, 1
+            else:
+                mean, deviation, samples = row["mean"], row["deviation"], row["samples"] + 1
+                deviation = (1 - EWMA_BETA) * deviation + EWMA_BETA * abs(latency - mean)
+                mean = (1 - EWMA_ALPHA) * mean + EWMA_ALPHA * latency
+            self._conn.execute(
+                """
+                INSERT INTO judge_latency (language, difficulty, mean, deviation, samples, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(language, difficulty) DO UPDATE SET
+                    mean = excluded.mean,
+                    deviation = excluded.deviation,
+                    samples = excluded.samples,
+                    updated_at = excluded.updated_at
+                """,
+                (language, difficulty, mean, deviation, samples, time.time()),
+            )
+
+
+_model: Optional[JudgeLatencyModel] = None
+_model_lock = threading.Lock()
+
+
+def get_judge_latency_model() -> JudgeLatencyModel:
+    """Return the process-wide judge latency model (opened lazily)."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = JudgeLatencyModel()
+        return _model
+
+
+def problem_difficulty(problem_slug: str) -> str:
+    """Difficulty of a problem from the local catalog ('unknown' if it is not there)."""
+    problem = get_catalog().get(problem_slug)
+    return problem["difficulty"] if problem and problem.get("difficulty") else "unknown"
+
+
+class PollSchedule:
+    """
+    Decides when to check a single submission next.
+
+    Args:
+        language: Submission language
+        difficulty: Problem difficulty
+        submitted_at: time.time() of the submission
+        model: Latency model (the shared one by default)
+    """
+
+    def __init__(self, language: str, difficulty: str, submitted_at: Optional[float] = None,
+                 model: Optional[JudgeLatencyModel] = None):
+        self.language = language
+        self.difficulty = difficulty
+        self.submitted_at = submitted_at if submitted_at is not None else time.time()
+        self.model = model or get_judge_latency_model()
+        self.polls = 0
+        self.late_polls = 0
+        estimate = self.model.estimate(language, difficulty)
+        # Erste Abfrage kurz vor dem erwarteten Urteil (Mittelwert minus Abweichung)
+        self.expected = max(0.0, estimate[0] - estimate[1]) if estimate else None
+
+    @classmethod
+    def for_problem(cls, problem_slug: str, language: str, submitted_at: Optional[float] = None) -> "PollSchedule":
+        return cls(language, problem_difficulty(problem_slug), submitted_at)
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next check (counts the check as sent)."""
+        elapsed = time.time() - self.submitted_at
+        self.polls += 1
+
+        if self.expected is not None and elapsed + MIN_POLL_DELAY < self.expected:
+            return min(MAX_POLL_DELAY, self.expected - elapsed)
+
+        # Nach dem erwarteten Zeitpunkt (oder ohne Messwerte): schnell beginnen, dann geometrisch zurückfallen
+        delay = min(MAX_POLL_DELAY, MIN_POLL_DELAY * BACKOFF_FACTOR ** self.late_polls)
+        self.late_polls += 1
+        return delay
+
+    def record_verdict(self, check_details: Optional[Dict[str, Any]] = None):
+        """
+        Feed the observed judge latency back into the model.
+
+        Args:
+            check_details: Raw check response; its task_finish_time (ms) is used if present
+        """
+        latency = time.time() - self.submitted_at
+        task_finish_time = (check_details or {}).get("task_finish_time")
+        if isinstance(task_finish_time, (int, float)) and 0 < task_finish_time / 1000 - self.submitted_at < latency:
+            # Der Zeitpunkt des Urteils laut LeetCode ist genauer als der Zeitpunkt unserer Abfrage
+            latency = task_finish_time / 1000 - self.submitted_at
+        self.model.observe(self.language, self.difficulty, latency)
@@ -0,0 +1,227 @@
+"""
+Content-addressed on-disk cache for problem details.
+
+fetch_full_problem stores the details of every problem it downloads (statement,
+example test cases, code snippets, metadata) here. The details are serialized
+as canonical JSON, compressed with zlib and stored once per SHA-256 hash;
+a slug only points to the hash of its current version. The hash is verified
+on every read, so a damaged entry is dropped and fetched again instead of
+being handed to the prompt builder.
+
+The total compressed size is capped; the least recently used entries are
+evicted first.
+
+Settings (environment variables):
+    LEETCODE_PROBLEM_CACHE_MAX_BYTES: Size cap for the compressed data (default 64 MiB)
+    LEETCODE_PROBLEM_CACHE_TTL: Seconds after which an entry is fetched again (default 30 days, 0 = never)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, Optional
+
+from utils.storage import site_database_path, open_database
+
+PROBLEM_CACHE_FILENAME = "problems.sqlite3"
+PROBLEM_CACHE_MAX_BYTES = int(os.environ.get("LEETCODE_PROBLEM_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# Problemstellungen ändern sich kaum; nach Ablauf der TTL wird trotzdem neu geladen
+PROBLEM_CACHE_TTL_SECONDS = float(os.environ.get("LEETCODE_PROBLEM_CACHE_TTL", 30 * 24 * 60 * 60))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    title_slug TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL REFERENCES blobs (content_hash),
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+"""
+
+
+class ProblemCache:
+    """SQLite-backed, content-addressed store for problem details."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = PROBLEM_CACHE_MAX_BYTES,
+                 ttl: float = PROBLEM_CACHE_TTL_SECONDS):
+        self.path = path or site_database_path(PROBLEM_CACHE_FILENAME)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = open_database(self.path)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _encode(details: Dict[str, Any]) -> tuple:
+        payload = json.dumps(details, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest(), zlib.compress(payload, 6)
+
+    @staticmethod
+    def _decode(content_hash: str, data: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            payload = zlib.decompress(data)
+        except zlib.error:
+            return None
+        if hashlib.sha256(payload).hexdigest() != content_hash:
+            return None
+        return json.loads(payload)
+
+    def get(self, slug: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached details of a problem.
+
+        Args:
+            slug: The titleSlug of the problem
+
+        Returns:
+            The details, or None if the problem is not cached, expired or damaged
+        """
+        return self.get_many([slug]).get(slug)
+
+    def get_many(self, slugs: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Return the cached details of several problems.
+
+        Args:
+            slugs: The titleSlugs of the problems
+
+        Returns:
+            Details keyed by slug; missing slugs are left out
+        """
+        slugs = list(dict.fromkeys(slugs))
+        if not slugs:
+            return {}
+
+        now = time.time()
+        placeholders = ",".join("?" for _ in slugs)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""
+                SELECT e.title_slug, e.content_hash, e.fetched_at, b.data
+                FROM entries e JOIN blobs b ON b.content_hash = e.content_hash
+                WHERE e.title_slug IN ({placeholders})
+                """,
+                slugs,
+            ).fetchall()
+
+        found, damaged = {}, []
+        for row in rows:
+            if self.ttl and now - row["fetched_at"] > self.ttl:
+                continue
+            details = self._decode(row["content_hash"], row["data"])
+            if details is None:
+                damaged.append(row["title_slug"])
+                continue
+            found[row["title_slug"]] = details
+
+        with self._lock, self._conn:
+            if found:
+                self._conn.executemany("UPDATE entries SET accessed_at = ? WHERE title_slug = ?",
+                                       [(now, slug) for slug in found])
+            if damaged:
+                # Beschädigte Einträge verwerfen, sie werden beim nächsten Abruf neu geladen
+                self._conn.executemany("DELETE FROM entries WHERE title_slug = ?", [(slug,) for slug in damaged])
+                self._delete_orphans()
+            self.hits += len(found)
+            self.misses += len(slugs) - len(found)
+        return found
+
+    def put(self, slug: str, details: Dict[str, Any]):
+        """Store the details of a single problem."""
+        self.put_many({slug: details})
+
+    def put_many(self, details_by_slug: Dict[str, Dict[str, Any]]):
+        """
+        Store the details of several problems and evict old entries if the cache is too large.
+
+        Args:
+            details_by_slug: Details keyed by slug
+        """
+        if not details_by_slug:
+            return
+
+        now = time.time()
+        blobs, entries = {}, []
+        for slug, details in details_by_slug.items():
+            content_hash, data = self._encode(details)
+            blobs[content_hash] = data
+            entries.append((slug, content_hash, now, now))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO blobs (content_hash, data, size) VALUES (?, ?, ?)",
+                [(content_hash, sqlite3.Binary(data), len(data)) for content_hash, data in blobs.items()],
+            )
+            self._conn.executemany(
+                """
+                INSERT INTO entries (title_slug, content_hash, fetched_at, accessed_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(title_slug) DO UPDATE SET
+                    content_hash = excluded.content_hash,
+                    fetched_at = excluded.fetched_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                entries,
+            )
+            self._delete_orphans()
+            self._evict()
+
+    def _delete_orphans(self):
+        self._conn.execute(
+            "DELETE FROM blobs WHERE content_hash NOT IN (SELECT content_hash FROM entries)"
+        )
+
+    def _evict(self):
+        """Remove the least recently used entries until the size cap is met (lock must be held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            """
+            SELECT e.title_slug, e.content_hash, b.size
+            FROM entries e JOIN blobs b ON b.content_hash = e.content_hash
+            ORDER BY e.accessed_at
+            """
+        ).fetchall()
+        evicted = []
+        for row in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((row["title_slug"],))
+            total -= row["size"]
+        self._conn.executemany("DELETE FROM entries WHERE title_slug = ?", evicted)
+        self._delete_orphans()
+
+    def size(self) -> int:
+        """Total size of the compressed data in bytes."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+_cache: Optional[ProblemCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_problem_cache() -> ProblemCache:
+    """Return the process-wide problem cache (opened lazily)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ProblemCache()
+        return _cache
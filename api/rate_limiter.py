@@ -0,0 +1,153 @@
+"""
+Token-bucket rate limiting shared by all LeetCode clients.
+
+There is one bucket per endpoint class ("graphql", "submit", "check"). Each
+bucket is safe to use from several threads, and its state is kept in a small
+file guarded by an exclusive file lock so that several processes (e.g. a CLI
+run next to the Streamlit app) share the same budget instead of each sending
+at the full rate. Buckets are created on first use (get_rate_limiter), so
+importing a client does not touch the file system.
+
+Settings (environment variables, per endpoint class NAME):
+    LEETCODE_<NAME>_INTERVAL: Average seconds between requests
+    LEETCODE_<NAME>_BURST: Number of requests that may be sent without waiting
+    LEETCODE_RATE_LIMIT_SHARED: Set to "0" to keep the state in-process only
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: nur prozessinternes Rate-Limiting
+    fcntl = None
+
+from utils.cassette import replaying_at_full_speed
+from utils.storage import site_cache_dir
+
+# Standardwerte pro Endpunktklasse: mittlerer Abstand in Sekunden und Burst-Größe
+ENDPOINT_LIMITS = {
+    "graphql": {"interval": 1.0, "burst": 1},
+    "submit": {"interval": 2.0, "burst": 1},
+    # Burst 3: die ersten (kurzen) Abfragen des adaptiven Poll-Plans müssen nicht warten
+    "check": {"interval": 2.0, "burst": 3},
+}
+
+SHARED_STATE = os.environ.get("LEETCODE_RATE_LIMIT_SHARED", "1") != "0" and fcntl is not None
+
+
+class TokenBucket:
+    """
+    A token bucket that hands out reservations.
+
+    reserve() takes a token immediately (the balance may become negative) and
+    returns how long the caller has to wait before using it. Callers queue up
+    in the order of their reservations, so concurrent callers never exceed the
+    configured rate and never have to retry.
+    """
+
+    def __init__(self, name: str, interval: float, burst: int = 1, state_path: Optional[str] = None):
+        self.name = name
+        self.rate = 1.0 / interval if interval > 0 else float("inf")
+        self.capacity = float(max(1, burst))
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+
+    def _take(self, tokens: float, now: float, state) -> tuple:
+        current, updated = state
+        current = min(self.capacity, current + (now - updated) * self.rate)
+        current -= tokens
+        wait = -current / self.rate if current < 0 else 0.0
+        return wait, (current, now)
+
+    def _read_state(self, fd: int):
+        raw = os.read(fd, 128).decode("ascii", errors="ignore").split()
+        try:
+            return float(raw[0]), float(raw[1])
+        except (IndexError, ValueError):
+            return self.capacity, time.time()
+
+    def _write_state(self, fd: int, state):
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, f"{state[0]:.6f} {state[1]:.6f}".encode("ascii"))
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket.
+
+        Args:
+            tokens: Number of tokens to take (one per request)
+
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        if self.rate == float("inf"):
+            return 0.0
+
+        with self._lock:
+            now = time.time()
+            if not self.state_path:
+                wait, (self._tokens, self._updated) = self._take(tokens, now, (self._tokens, self._updated))
+                return wait
+
+            fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                wait, state = self._take(tokens, now, self._read_state(fd))
+                self._write_state(fd, state)
+                return wait
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until the request may be sent.
+
+        Returns:
+            The time spent waiting in seconds
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str) -> TokenBucket:
+    """
+    Return the shared token bucket for an endpoint class.
+
+    Args:
+        name: "graphql", "submit" or "check"
+
+    Returns:
+        The TokenBucket for this endpoint class
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            defaults = ENDPOINT_LIMITS.get(name, ENDPOINT_LIMITS["graphql"])
+            interval = float(os.environ.get(f"LEETCODE_{name.upper()}_INTERVAL", defaults["interval"]))
+            if replaying_at_full_speed():
+                # Bei der Wiedergabe einer Kassette gibt es keinen Server, der geschont werden muss
+                interval = 0.0
+            burst = int(os.environ.get(f"LEETCODE_{name.upper()}_BURST", defaults["burst"]))
+
+            state_path = None
+            if SHARED_STATE:
+                state_dir = os.path.join(site_cache_dir(), "ratelimit")
+                os.makedirs(state_dir, exist_ok=True)
+                state_path = os.path.join(state_dir, f"{name}.state")
+
+            limiter = TokenBucket(name, interval, burst, state_path)
+            _limiters[name] = limiter
+        return limiter
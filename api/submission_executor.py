@@ -0,0 +1,318 @@
+"""
+Concurrent submission pipeline for LeetCode.
+
+submit_and_wait_for_result handles one submission at a time, so a batch spends
+most of its wall time waiting for the judge. The SubmissionExecutor keeps up
+to max_in_flight submissions running: submissions are sent from a small worker
+pool, and a single poller thread checks all outstanding submission IDs in a
+multiplexed loop under the shared "check" rate limit. Results are delivered as
+futures (and optionally to a callback), so a batch takes about as long as the
+slowest verdicts instead of the sum of all of them.
+
+Example:
+    with SubmissionExecutor(max_in_flight=4) as executor:
+        futures = {executor.submit(slug, code): slug for slug, code in solutions.items()}
+        for future in executor.as_completed(futures):
+            print(futures[future], future.result().get("status_description"))
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from api.leetcode_submit import check_submission_result, finished_submission_result, submit_solution
+from api.poll_schedule import PollSchedule
+from api.submission_journal import get_submission_journal
+from api.verdict_cache import get_verdict_cache
+
+# Standardanzahl gleichzeitig laufender Submissions
+MAX_IN_FLIGHT = int(os.environ.get("LEETCODE_MAX_IN_FLIGHT", 4))
+
+# HTTP-Status der Check-Abfrage, bei denen LeetCode die Submission nicht (mehr) kennt. Andere Fehler
+# (5xx, Netzwerk, fehlende Anmeldedaten) sind vorübergehend, die Submission bleibt im Journal offen
+ABANDON_CHECK_STATUSES = {404, 410}
+
+
+class _Job:
+    """A submission that is being judged."""
+
+    def __init__(self, slug: str, code: str, language: str, future: Future,
+                 callback: Optional[Callable[[str, Dict[str, Any]], None]]):
+        self.slug = slug
+        self.code = code
+        self.language = language
+        self.future = future
+        self.callback = callback
+        self.submission_id: Optional[str] = None
+        self.submitted_at: Optional[float] = None
+        self.schedule: Optional[PollSchedule] = None
+        self.deadline = 0.0
+
+
+class SubmissionExecutor:
+    """
+    Runs LeetCode submissions concurrently and polls their results in one loop.
+
+    Args:
+        max_in_flight: Maximum number of submissions that are submitted or being judged at the same time
+        timeout: Maximum time to wait for the verdict of a submission in seconds
+    """
+
+    def __init__(self, max_in_flight: int = MAX_IN_FLIGHT, timeout: float = 30):
+        self.max_in_flight = max(1, max_in_flight)
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._submit_pool = ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="leetcode-submit")
+        self._condition = threading.Condition()
+        # Heap mit (nächste Abfrage, laufende Nummer, Job)
+        self._schedule: List[tuple] = []
+        self._sequence = itertools.count()
+        # Anzahl der Submissions ohne Ergebnis (der Poller endet erst, wenn alle fertig sind)
+        self._unfinished = 0
+        self._closed = False
+        self._poller = threading.Thread(target=self._poll_loop, name="leetcode-poller", daemon=True)
+        self._poller.start()
+
+    def submit(self, problem_slug: str, code: str, language: str = "cpp",
+               callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+               force_resubmit: bool = False) -> Future:
+        """
+        Queue a solution for submission.
+
+        Code that was already judged for the problem is not submitted again;
+        the future is resolved right away with the cached verdict.
+
+        Args:
+            problem_slug: The LeetCode problem slug
+            code: The solution code
+            language: The programming language (default: "cpp")
+            callback: Called as callback(problem_slug, result) from a worker thread when the verdict is in
+            force_resubmit: Submit even if a verdict for this code is cached
+
+        Returns:
+            A Future whose result is the dict returned by submit_and_wait_for_result
+        """
+        if self._closed:
+            raise RuntimeError("SubmissionExecutor has been shut down")
+
+        future: Future = Future()
+        if not force_resubmit:
+            cached = get_verdict_cache().get(problem_slug, language, code)
+            if cached is not None:
+                logging.info(f"Using cached verdict for {problem_slug}: {cached.get('status_description')}")
+                future.set_result(cached)
+                if callback is not None:
+                    callback(problem_slug, cached)
+                return future
+
+            outstanding = get_submission_journal().find_outstanding(problem_slug, language, code)
+            if outstanding is not None:
+                logging.info(f"Waiting for outstanding submission {outstanding['submission_id']} of {problem_slug}")
+                return self.resume(problem_slug, code, language, outstanding["submission_id"],
+                                   submitted_at=outstanding["ts"], callback=callback)
+
+        job = _Job(problem_slug, code, language, future, callback)
+        with self._condition:
+            self._unfinished += 1
+        self._submit_pool.submit(self._start, job)
+        return future
+
+    def resume(self, problem_slug: str, code: str, language: str, submission_id: str,
+               submitted_at: Optional[float] = None,
+               callback: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Future:
+        """
+        Poll the result of a submission that was sent earlier (e.g. by a crashed run).
+
+        Args:
+            problem_slug: The LeetCode problem slug
+            code: The submitted code
+            language: The programming language
+            submission_id: The submission ID from the journal
+            submitted_at: time.time() of the original submission
+            callback: Called as callback(problem_slug, result) when the verdict is in
+
+        Returns:
+            A Future whose result is the dict returned by submit_and_wait_for_result
+        """
+        if self._closed:
+            raise RuntimeError("SubmissionExecutor has been shut down")
+
+        future: Future = Future()
+        job = _Job(problem_slug, code, language, future, callback)
+        job.submission_id = submission_id
+        job.submitted_at = submitted_at
+        with self._condition:
+            self._unfinished += 1
+        self._submit_pool.submit(self._start, job)
+        return future
+
+    def as_completed(self, futures: Iterable[Future], timeout: Optional[float] = None) -> Iterator[Future]:
+        """Yield the futures as their submissions finish (see concurrent.futures.as_completed)."""
+        return as_completed(futures, timeout=timeout)
+
+    def _start(self, job: _Job):
+        self._slots.acquire()
+        # Jeder Fehler muss über _finish laufen, sonst bleiben der Slot belegt und der Future offen
+        try:
+            # Fortgesetzte Submissions haben schon eine ID und holen nur noch das Urteil ab
+            if job.submission_id is None:
+                logging.info(f"Starting submission process for {job.slug}")
+                submit_result = submit_solution(job.slug, job.code, job.language)
+                if not submit_result["success"]:
+                    logging.error(f"Failed to submit solution: {submit_result.get('error')}")
+                    self._finish(job, submit_result)
+                    return
+
+                job.submission_id = submit_result.get("submission_id")
+                if not job.submission_id:
+                    logging.error("No submission ID returned")
+                    self._finish(job, {"success": False, "error": "No submission ID returned"})
+                    return
+                job.submitted_at = time.time()
+                get_submission_journal().record_submit(job.slug, job.language, job.code, job.submission_id)
+
+            self._schedule_first_poll(job)
+        except Exception as e:
+            logging.error(f"Error in submission process: {str(e)}")
+            self._finish(job, {"success": False, "error": f"Submission error: {str(e)}"})
+
+    def _schedule_first_poll(self, job: _Job):
+        now = time.time()
+        job.deadline = now + self.timeout
+        # Abfragezeitpunkte nach der bisher beobachteten Judge-Latenz (siehe api/poll_schedule.py)
+        job.schedule = PollSchedule.for_problem(job.slug, job.language, submitted_at=job.submitted_at or now)
+        self._schedule_poll(job, min(now + job.schedule.next_delay(), job.deadline))
+
+    def _schedule_poll(self, job: _Job, when: float):
+        with self._condition:
+            heapq.heappush(self._schedule, (when, next(self._sequence), job))
+            self._condition.notify()
+
+    def _finish(self, job: _Job, result: Dict[str, Any]):
+        self._slots.release()
+        with self._condition:
+            self._unfinished -= 1
+            self._condition.notify_all()
+        job.future.set_result(result)
+        if job.callback is not None:
+            try:
+                job.callback(job.slug, result)
+            except Exception as e:
+                logging.error(f"Submission callback for {job.slug} failed: {str(e)}")
+
+    def _next_due_job(self) -> Optional[_Job]:
+        """Wait until a poll is due and return its job (None once shut down and idle)."""
+        with self._condition:
+            while True:
+                if self._schedule:
+                    when, _, job = self._schedule[0]
+                    wait = when - time.time()
+                    if wait <= 0:
+                        heapq.heappop(self._schedule)
+                        return job
+                    self._condition.wait(wait)
+                elif self._closed and self._unfinished == 0:
+                    return None
+                else:
+                    self._condition.wait()
+
+    def _poll_loop(self):
+        while True:
+            job = self._next_due_job()
+            if job is None:
+                return
+            try:
+                self._poll(job)
+            except Exception as e:
+                logging.error(f"Error in submission process: {str(e)}")
+                self._finish(job, {"success": False, "error": f"Submission error: {str(e)}"})
+
+    def _poll(self, job: _Job):
+        # check_submission_result wartet selbst auf den gemeinsamen "check"-Token-Bucket
+        check_result = check_submission_result(job.submission_id)
+        if not check_result["success"]:
+            logging.error(f"Error checking submission: {check_result.get('error', 'Unknown error')}")
+            self._finish(job, {"success": False, "error": check_result.get('error', 'Unknown error during check'),
+                               "http_status": check_result.get("http_status")})
+            return
+
+        result = finished_submission_result(check_result)
+        if result is not None:
+            job.schedule.record_verdict(check_result.get("details"))
+            get_submission_journal().record_verdict(job.submission_id, result)
+            get_verdict_cache().put(job.slug, job.language, job.code, result)
+            self._finish(job, result)
+            return
+        get_submission_journal().record_poll(job.submission_id, check_result.get("details", {}).get("state"))
+
+        now = time.time()
+        if now >= job.deadline:
+            logging.error(f"Timed out waiting for submission result after {self.timeout} seconds")
+            self._finish(job, {"success": False, "pending": True, "submission_id": job.submission_id,
+                               "error": f"Timeout after {self.timeout} seconds"})
+            return
+
+        self._schedule_poll(job, min(now + job.schedule.next_delay(), job.deadline))
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting submissions.
+
+        Args:
+            wait: Block until all queued submissions have a result
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._submit_pool.shutdown(wait=wait)
+        if wait:
+            self._poller.join()
+
+    def __enter__(self) -> "SubmissionExecutor":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown(wait=True)
+
+
+def resume_submissions(timeout: float = 60, max_in_flight: int = MAX_IN_FLIGHT) -> List[Dict[str, Any]]:
+    """
+    Collect the verdicts of all submissions in the journal that never got one.
+
+    Submissions LeetCode no longer knows (see ABANDON_CHECK_STATUSES) are marked
+    as abandoned; submissions that are still being judged at the timeout or
+    whose check failed transiently stay in the journal.
+
+    Args:
+        timeout: Maximum time to wait for each verdict in seconds
+        max_in_flight: Number of submissions polled at the same time
+
+    Returns:
+        One dict per resumed submission with the journal entry ("submission", without the code) and "result"
+    """
+    journal = get_submission_journal()
+    outstanding = journal.outstanding()
+    if not outstanding:
+        return []
+
+    logging.info(f"Resuming {len(outstanding)} outstanding submissions")
+    resumed = []
+    with SubmissionExecutor(max_in_flight=max_in_flight, timeout=timeout) as executor:
+        futures = {
+            executor.resume(entry["slug"], entry["code"], entry["language"], entry["submission_id"],
+                            submitted_at=entry["ts"]): entry
+            for entry in outstanding
+        }
+        for future in executor.as_completed(futures):
+            entry, result = futures[future], future.result()
+            if not result.get("success") and result.get("http_status") in ABANDON_CHECK_STATUSES:
+                journal.record_abandoned(entry["submission_id"], result.get("error", "Unknown error"))
+            resumed.append({"submission": {k: v for k, v in entry.items() if k != "code"}, "result": result})
+
+    journal.compact()
+    return resumed
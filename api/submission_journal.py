@@ -0,0 +1,262 @@
+"""
+Crash-safe journal of LeetCode submissions.
+
+Every submission ID is appended to a JSON lines journal as soon as LeetCode
+returns it, followed by poll and verdict events. If the Streamlit process or
+a CLI run dies while submissions are being judged, the IDs without a verdict
+are still in the journal: resume_submissions (api/submission_executor.py,
+"python main.py --resume-submissions") polls them again, and the submit
+functions wait for an outstanding submission of the same code instead of
+submitting it a second time.
+
+Writes go to the file immediately; fsync runs in a background thread, so
+several events share one fsync (group commit). Submit events wait for their
+fsync, because losing one means a wasted submission. Poll and verdict events
+do not wait; losing them only means polling the submission once more.
+
+A torn last line from a crash is skipped when the journal is read. Once the
+journal grows beyond LEETCODE_JOURNAL_COMPACT_BYTES it is compacted to the
+outstanding submissions when it is opened. Several processes (e.g. the
+Streamlit app and a resume run) can share the journal; writes and compaction
+are serialized with a lock file.
+
+Settings (environment variables):
+    LEETCODE_JOURNAL_FSYNC_INTERVAL: Seconds during which events are collected for one fsync (default 0.2)
+    LEETCODE_JOURNAL_COMPACT_BYTES: Journal size that triggers compaction on open (default 4 MiB)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: das Journal wird nur von einem Prozess gleichzeitig benutzt
+    fcntl = None
+
+from api.verdict_cache import code_hash
+from utils.storage import site_database_path
+
+JOURNAL_FILENAME = "submission_journal.jsonl"
+FSYNC_INTERVAL = float(os.environ.get("LEETCODE_JOURNAL_FSYNC_INTERVAL", 0.2))
+COMPACT_BYTES = int(os.environ.get("LEETCODE_JOURNAL_COMPACT_BYTES", 4 * 1024 * 1024))
+
+
+class SubmissionJournal:
+    """
+    Append-only journal of submit, poll and verdict events.
+
+    Args:
+        path: Path of the journal file
+        fsync_interval: Seconds during which events are collected for one fsync
+    """
+
+    def __init__(self, path: Optional[str] = None, fsync_interval: float = FSYNC_INTERVAL):
+        self.path = path or site_database_path(JOURNAL_FILENAME)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._synced = threading.Condition(self._lock)
+        # Eingereichte Submissions ohne Urteil, nach Submission-ID
+        self._outstanding: Dict[str, Dict[str, Any]] = {}
+        # Laufende Nummern des zuletzt geschriebenen und des zuletzt per fsync gesicherten Eintrags
+        self._written = 0
+        self._durable = 0
+        self._closed = False
+
+        self._lock_fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644) if fcntl else None
+        with self._file_lock():
+            size = self._load()
+            self._file = open(self.path, "a", encoding="utf-8")
+        if size > COMPACT_BYTES:
+            self.compact()
+
+        self._flusher = threading.Thread(target=self._flush_loop, name="journal-fsync", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _load(self) -> int:
+        """Rebuild the outstanding submissions from the journal and return its size."""
+        self._outstanding = {}
+        if not os.path.exists(self.path):
+            return 0
+
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for line in data.splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError):
+                # Unvollständige letzte Zeile nach einem Absturz
+                continue
+
+        if data and not data.endswith(b"\n"):
+            # Die abgerissene Zeile abschließen, damit der nächste Eintrag in einer eigenen Zeile beginnt
+            with open(self.path, "ab") as f:
+                f.write(b"\n")
+        return len(data)
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize access to the journal file between processes."""
+        if self._lock_fd is None:
+            yield
+            return
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def _reopen_if_replaced(self):
+        """Reopen the journal if another process has compacted it (lock file must be held)."""
+        try:
+            replaced = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            replaced = True
+        if replaced:
+            self._file.close()
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _apply(self, event: Dict[str, Any]):
+        if event["event"] == "submit":
+            self._outstanding[event["submission_id"]] = event
+        elif event["event"] in ("verdict", "abandoned"):
+            self._outstanding.pop(event["submission_id"], None)
+
+    def append(self, event: Dict[str, Any], wait: bool = False):
+        """
+        Append an event to the journal.
+
+        Args:
+            event: The event; "event" and "submission_id" are required
+            wait: Block until the event has been fsynced
+        """
+        event = {"ts": round(time.time(), 3), **event}
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._closed:
+                return
+            with self._file_lock():
+                self._reopen_if_replaced()
+                self._file.write(line)
+                # Sofort an das Betriebssystem übergeben, damit andere Prozesse die Zeile sehen
+                self._file.flush()
+            self._written += 1
+            sequence = self._written
+            self._apply(event)
+            self._synced.notify_all()
+            if wait:
+                while self._durable < sequence and not self._closed:
+                    self._synced.wait()
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while self._written == self._durable and not self._closed:
+                    self._synced.wait()
+                if self._written == self._durable:
+                    return
+                target = self._written
+                self._file.flush()
+                fileno = self._file.fileno()
+            # fsync außerhalb der Sperre, damit weitere Einträge währenddessen geschrieben werden können
+            try:
+                os.fsync(fileno)
+            except OSError:
+                # Die Datei wurde inzwischen durch compact() ersetzt, die Einträge sind dort gesichert
+                # (compact() liest die Datei vor dem Ersetzen vollständig ein und synchronisiert die neue)
+                pass
+            with self._lock:
+                self._durable = max(self._durable, target)
+                self._synced.notify_all()
+            # Einträge der nächsten Zeitspanne teilen sich ein fsync
+            time.sleep(self.fsync_interval)
+
+    def record_submit(self, problem_slug: str, language: str, code: str, submission_id: str):
+        """Journal a new submission (returns once it is on disk)."""
+        self.append({
+            "event": "submit",
+            "submission_id": str(submission_id),
+            "slug": problem_slug,
+            "language": language,
+            "code_hash": code_hash(code, language),
+            "code": code,
+        }, wait=True)
+
+    def record_poll(self, submission_id: str, state: Optional[str]):
+        """Journal a status check that did not return a verdict yet."""
+        self.append({"event": "poll", "submission_id": str(submission_id), "state": state})
+
+    def record_verdict(self, submission_id: str, result: Dict[str, Any]):
+        """Journal the final result of a submission."""
+        result = {k: v for k, v in result.items() if k != "details"}
+        self.append({"event": "verdict", "submission_id": str(submission_id), "result": result})
+
+    def record_abandoned(self, submission_id: str, error: str):
+        """Give up on a submission whose result cannot be fetched any more."""
+        self.append({"event": "abandoned", "submission_id": str(submission_id), "error": error})
+
+    def outstanding(self) -> List[Dict[str, Any]]:
+        """Return the submit events of all submissions without a verdict, oldest first."""
+        with self._lock:
+            return sorted(self._outstanding.values(), key=lambda event: event["ts"])
+
+    def find_outstanding(self, problem_slug: str, language: str, code: str) -> Optional[Dict[str, Any]]:
+        """Return the submit event of an outstanding submission of the same code, if there is one."""
+        key = code_hash(code, language)
+        with self._lock:
+            for event in self._outstanding.values():
+                if event["slug"] == problem_slug and event["language"] == language and event["code_hash"] == key:
+                    return event
+        return None
+
+    def compact(self):
+        """Rewrite the journal so that it only contains the outstanding submissions."""
+        with self._lock, self._file_lock():
+            if self._closed:
+                return
+            # Neu einlesen, damit auch Einträge anderer Prozesse erhalten bleiben
+            self._file.flush()
+            self._load()
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                for event in sorted(self._outstanding.values(), key=lambda event: event["ts"]):
+                    f.write(json.dumps(event, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._durable = self._written
+
+    def close(self):
+        """Write all pending events to disk and close the journal."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._synced.notify_all()
+        self._flusher.join()
+        with self._lock:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            if self._lock_fd is not None:
+                os.close(self._lock_fd)
+
+
+_journal: Optional[SubmissionJournal] = None
+_journal_lock = threading.Lock()
+
+
+def get_submission_journal() -> SubmissionJournal:
+    """Return the process-wide submission journal (opened lazily)."""
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = SubmissionJournal()
+        return _journal
@@ -0,0 +1,136 @@
+"""
+Persistent cache of LeetCode verdicts for already submitted code.
+
+At temperature 0 and in repeated experiments the models produce the same
+solution over and over. Every resubmission costs a rate-limited submit and
+several status checks, and returns the verdict LeetCode gave the first time.
+The verdict cache stores the final result of every judged submission under
+(problem slug, language, hash of the normalized code), see
+utils.clean.normalize_code, so identical code (up to comments and whitespace)
+gets its verdict back instantly.
+
+Only deterministic verdicts are cached; submit errors, timeouts, LeetCode's
+own internal errors and Time Limit Exceeded (which depends on the load of the
+judge servers and may pass on a resubmission) are not. A resubmission can be forced with force_resubmit=True.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from utils.clean import normalize_code
+from utils.storage import site_database_path, open_database
+
+VERDICT_CACHE_FILENAME = "verdicts.sqlite3"
+
+# Urteile, die sich bei erneuter Einreichung desselben Codes nicht ändern (16/21 = interne Fehler).
+# 14 (Time Limit Exceeded) hängt von der Last der Judge-Server ab und wird nicht gespeichert.
+CACHEABLE_STATUS_CODES = {10, 11, 12, 13, 15, 20}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    title_slug TEXT NOT NULL,
+    language TEXT NOT NULL,
+    code_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    judged_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (title_slug, language, code_hash)
+);
+"""
+
+
+def code_hash(code: str, language: str) -> str:
+    """SHA-256 of the normalized code."""
+    return hashlib.sha256(normalize_code(code, language).encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """SQLite-backed store for the verdicts of submitted solutions."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or site_database_path(VERDICT_CACHE_FILENAME)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = open_database(self.path)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, problem_slug: str, language: str, code: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored verdict for a solution.
+
+        Args:
+            problem_slug: The LeetCode problem slug
+            language: The programming language
+            code: The solution code
+
+        Returns:
+            The submission result (marked with "cached": True), or None if the code was never judged
+        """
+        key = (problem_slug, language, code_hash(code, language))
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT result FROM verdicts WHERE title_slug = ? AND language = ? AND code_hash = ?", key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE verdicts SET hits = hits + 1 WHERE title_slug = ? AND language = ? AND code_hash = ?", key
+            )
+            self.hits += 1
+
+        result = json.loads(row["result"])
+        result["cached"] = True
+        return result
+
+    def put(self, problem_slug: str, language: str, code: str, result: Dict[str, Any]) -> bool:
+        """
+        Store the result of a judged submission.
+
+        Args:
+            problem_slug: The LeetCode problem slug
+            language: The programming language
+            code: The submitted code
+            result: The result of submit_and_wait_for_result
+
+        Returns:
+            True if the result was a final verdict and has been stored
+        """
+        if not result.get("success") or result.get("status_code") not in CACHEABLE_STATUS_CODES:
+            return False
+
+        # Rohdaten der Statusabfrage werden nicht gebraucht, um das Urteil erneut anzuzeigen
+        stored = {k: v for k, v in result.items() if k not in ("details", "cached")}
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO verdicts (title_slug, language, code_hash, result, judged_at) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(title_slug, language, code_hash) DO UPDATE SET
+                    result = excluded.result,
+                    judged_at = excluded.judged_at
+                """,
+                (problem_slug, language, code_hash(code, language), json.dumps(stored), time.time()),
+            )
+        return True
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+
+_cache: Optional[VerdictCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Return the process-wide verdict cache (opened lazily)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = VerdictCache()
+        return _cache
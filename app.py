@@ -9,13 +9,18 @@ import re
 
 # Import der vorhandenen Funktionen aus main.py
 from main import process_difficulty, save_results
-from api.leetcode import fetch_problems, fetch_full_problem
+from api.leetcode import fetch_problems, fetch_full_problem, fetch_full_problems
 from gpt.gpt import get_solution
 from utils.clean import clean_html, extract_code_block
 # Import der neuen Heatmap-Visualisierung
 from heatmap_viz import add_heatmap_tab
 # Import der neuen LeetCode-Submission-Komponenten
-from utils.submission_ui import show_submission_section, reset_submission_state
+from utils.submission_ui import show_submission_section, reset_submission_state, record_submission_result
+from api.submission_executor import SubmissionExecutor
+from judge.complexity import format_complexity_estimate, is_limit_warning
+from judge.cpp_judge import blocks_submission, with_local_measurements
+from judge.farm import JudgeFarm
+from judge.sql_judge import is_sql_problem
 
 st.set_page_config(page_title="LeetCode LLM Evaluator", layout="wide")
 st.title("LeetCode LLM Evaluator")
@@ -139,6 +144,14 @@ def show_result_details(result, submission_num=None, is_nested=False):
     with metrics_col1:
         if 'runtime_ms' in result and result['runtime_ms'] is not None:
             st.markdown(f"**Laufzeit:** {result.get('runtime_ms', 'N/A')} ms")
+        if result.get('local_cpu_ms') is not None:
+            st.markdown(f"**Lokal gemessen:** {result['local_cpu_ms']} ms CPU, {result.get('local_wall_ms')} ms Wall, {result.get('local_memory_mb')} MB Peak-RSS")
+        if result.get('local_verdict') and result['local_verdict'] != result.get('status_description'):
+            st.markdown(f"**Lokale Vorprüfung:** {result['local_verdict']} (nur Hinweis, trotzdem eingereicht)")
+        if result.get('complexity_estimate'):
+            st.markdown(f"**Lokale Komplexitätsschätzung:** {format_complexity_estimate(result['complexity_estimate'])}")
+            if is_limit_warning(result['complexity_estimate']):
+                st.warning("Die lokale Schätzung deutet auf eine Überschreitung des Zeit- oder Speicherlimits bei großen Eingaben hin.")
     
     with metrics_col2:
         if 'memory_mb' in result and result['memory_mb'] is not None:
@@ -229,6 +242,25 @@ with st.sidebar:
     
     temperature = st.slider("Temperature", 0.0, 1.0, 0.7, 0.1)
     
+    # Bereits bewerteter Code wird standardmäßig nicht erneut eingereicht (siehe api/verdict_cache.py)
+    st.checkbox("Erneut einreichen (gespeicherte Urteile ignorieren)", value=False, key="force_resubmit",
+                help="Auch Code einreichen, für den bereits ein LeetCode-Urteil gespeichert ist.")
+    
+    # Bei Temperatur 0 werden unveränderte Prompts aus dem Antwort-Cache beantwortet (siehe gpt/response_cache.py)
+    st.checkbox("LLM-Antworten auch bei Temperatur > 0 wiederverwenden", value=False, key="reuse_llm_responses",
+                help="Für bereits gestellte Prompts die gespeicherte Antwort verwenden, statt eine neue Stichprobe "
+                     "zu ziehen (z.B. für A/B-Tests von Prompt-Vorlagen).")
+    
+    # Lösungen vor dem Einreichen lokal mit den Beispieltests prüfen (C++: judge/cpp_judge.py, SQL: judge/sql_judge.py)
+    st.checkbox("Lokal vorprüfen (C++/SQL)", value=True, key="local_prejudge",
+                help="Lösungen, die lokal nicht kompilieren oder an den Beispielen abstürzen bzw. Limits überschreiten, "
+                     "werden nicht eingereicht. Eine abweichende Ausgabe ist nur ein Hinweis.")
+    
+    # Nur lokal bewerten: Laufzeit und Speicher der Beispieltests messen, ohne bei LeetCode einzureichen
+    st.checkbox("Nur lokal messen (ohne LeetCode-Submit)", value=False, key="local_only",
+                help="Im Batch werden alle C++-Lösungen nur lokal bewertet; Wall-/CPU-Zeit und Peak-RSS der "
+                     "Beispieltests landen in der Statistik.")
+    
     st.header("API-Schlüssel")
     
     # API-Schlüssel basierend auf Modell anzeigen
@@ -645,72 +677,157 @@ with tab1:
                         success_count = 0
                         failure_count = 0
                         
-                        # Verarbeite jedes Problem
-                        for idx, problem in enumerate(selected_problems):
-                            log_to_terminal(f"[BATCH] Verarbeite Problem {idx+1}/{num_to_process}: {problem['title']}")
-                            batch_status_container.info(f"Verarbeite Problem {idx+1}/{num_to_process}: {problem['title']}")
-                            
+                        # Problem-Details aller ausgewählten Probleme gebündelt abrufen
+                        log_to_terminal(f"[DEBUG] Rufe fetch_full_problems für {num_to_process} Probleme auf")
+                        batch_details = fetch_full_problems([p['titleSlug'] for p in selected_problems])
+                        
+                        # Submissions laufen parallel (mehrere gleichzeitig beim Judge)
+                        submission_executor = SubmissionExecutor()
+                        submission_futures = {}
+                        
+                        # Lokale Vorprüfung läuft parallel in Worker-Prozessen, während weitere Lösungen generiert werden
+                        judge_farm = JudgeFarm() if st.session_state.local_prejudge or st.session_state.local_only else None
+                        prejudge_futures = {}
+                        # Lokale Urteile der eingereichten Lösungen, für Messwerte und Komplexitätsschätzung im LeetCode-Ergebnis
+                        local_results = {}
+                        
+                        def submit_prejudged(wait=False):
+                            """Fertig vorgeprüfte Lösungen einreichen oder mit dem lokalen Urteil erfassen."""
+                            done = list(judge_farm.as_completed(prejudge_futures)) if wait else [f for f in prejudge_futures if f.done()]
+                            for prejudge_future in done:
+                                problem, code, language = prejudge_futures.pop(prejudge_future)
+                                try:
+                                    local_result = prejudge_future.result()
+                                except Exception as e:
+                                    log_to_terminal(f"[BATCH] Lokale Vorprüfung für '{problem['title']}' fehlgeschlagen: {str(e)}", "warning")
+                                    local_result = None
+                                if st.session_state.local_only:
+                                    if local_result is None:
+                                        log_to_terminal(f"[BATCH] '{problem['title']}' lässt sich lokal nicht bewerten.", "warning")
+                                    else:
+                                        log_to_terminal(f"[BATCH] Lokale Bewertung für '{problem['title']}': {local_result.get('status_description', local_result.get('error'))} ({local_result.get('local_cpu_ms')} ms CPU)")
+                                        record_submission_result(problem['titleSlug'], code, local_result)
+                                elif blocks_submission(local_result):
+                                    log_to_terminal(f"[BATCH] Lokale Vorprüfung für '{problem['title']}' ergab: {local_result['status_description']}", "warning")
+                                    batch_status_container.warning(f"Lokale Vorprüfung für '{problem['title']}' ergab: {local_result['status_description']}")
+                                    record_submission_result(problem['titleSlug'], code, local_result)
+                                else:
+                                    if local_result is not None and local_result.get("status_code") == 11:
+                                        log_to_terminal(f"[BATCH] Lokale Vorprüfung für '{problem['title']}' ergab Wrong Answer; die Ausgabe kann trotzdem gültig sein, reiche ein.", "warning")
+                                    local_results[problem['titleSlug']] = local_result
+                                    submit_to_executor(problem, code, language)
+                        
+                        def submit_to_executor(problem, code, language):
+                            """Bei LeetCode einreichen; die Submission läuft im Hintergrund weiter."""
                             try:
-                                # Lade Problem-Details
-                                log_to_terminal(f"[DEBUG] Rufe fetch_full_problem für Slug: {problem['titleSlug']} auf")
-                                details = fetch_full_problem(problem['titleSlug'])
+                                log_to_terminal(f"[BATCH] Reiche Lösung für '{problem['title']}' bei LeetCode ein...")
+                                batch_status_container.info(f"Reiche Lösung für '{problem['title']}' bei LeetCode ein...")
+                                submission_futures[submission_executor.submit(problem['titleSlug'], code, language, force_resubmit=st.session_state.force_resubmit)] = (problem, code)
+                            except Exception as e:
+                                log_to_terminal(f"[BATCH] Fehler beim LeetCode-Submit für '{problem['title']}': {str(e)}", "error")
+                                batch_status_container.warning(f"Fehler beim LeetCode-Submit: {str(e)}")
+                        
+                        try:
+                            # Verarbeite jedes Problem
+                            for idx, problem in enumerate(selected_problems):
+                                log_to_terminal(f"[BATCH] Verarbeite Problem {idx+1}/{num_to_process}: {problem['title']}")
+                                batch_status_container.info(f"Verarbeite Problem {idx+1}/{num_to_process}: {problem['title']}")
+                            
+                                try:
+                                    # Problem-Details aus dem gebündelten Abruf verwenden
+                                    details = batch_details.get(problem['titleSlug'])
+                                    if details is None:
+                                        log_to_terminal(f"[DEBUG] Rufe fetch_full_problem für Slug: {problem['titleSlug']} auf")
+                                        details = fetch_full_problem(problem['titleSlug'])
                                 
-                                if not details:
-                                    log_to_terminal(f"[DEBUG] Fehler: Keine Details zurückgegeben für {problem['titleSlug']}", "error")
-                                    failure_count += 1
-                                    continue
+                                    if not details:
+                                        log_to_terminal(f"[DEBUG] Fehler: Keine Details zurückgegeben für {problem['titleSlug']}", "error")
+                                        failure_count += 1
+                                        continue
                                 
-                                # Problem-Daten vorbereiten
-                                question = clean_html(details.get("content", ""))
-                                examples = details.get("exampleTestcases", "")
+                                    # Problem-Daten vorbereiten
+                                    question = clean_html(details.get("content", ""))
+                                    examples = details.get("exampleTestcases", "")
                                 
-                                # Erstelle Prompt
-                                cleaned_template = clean_template(st.session_state.prompt_template)
-                                prompt = cleaned_template.format(
-                                    title=problem['title'],
-                                    question=question,
-                                    examples=examples
-                                )
+                                    # Erstelle Prompt
+                                    cleaned_template = clean_template(st.session_state.prompt_template)
+                                    prompt = cleaned_template.format(
+                                        title=problem['title'],
+                                        question=question,
+                                        examples=examples
+                                    )
                                 
-                                # Lösung generieren
-                                log_to_terminal(f"[BATCH] Generiere Lösung für '{problem['title']}' mit {full_model_name}...")
-                                llm_response = get_solution(prompt, temperature=temperature, model=full_model_name)
-                                code = extract_code_block(llm_response)
+                                    # Datenbankprobleme werden als MySQL-Abfrage gelöst und lokal in SQLite geprüft
+                                    language = "mysql" if is_sql_problem(details) else "cpp"
+                                    if language == "mysql":
+                                        prompt += "\n\nThis is a database problem: answer with a single MySQL query in a ```sql code block instead of C++ code."
                                 
-                                # Lösungen im Batch-Prozess werden nicht automatisch zur Statistik hinzugefügt
-                                # Die Ergebnisse werden erst erfasst, wenn eine LeetCode-Submission erfolgt
-                                log_to_terminal(f"[BATCH] Lösung für '{problem['title']}' generiert.", "success")
+                                    # Lösung generieren
+                                    log_to_terminal(f"[BATCH] Generiere Lösung für '{problem['title']}' mit {full_model_name}...")
+                                    llm_response = get_solution(prompt, temperature=temperature, model=full_model_name, use_cache=st.session_state.reuse_llm_responses or None)
+                                    code = extract_code_block(llm_response)
+                                
+                                    # Lösungen im Batch-Prozess werden nicht automatisch zur Statistik hinzugefügt
+                                    # Die Ergebnisse werden erst erfasst, wenn eine LeetCode-Submission erfolgt
+                                    log_to_terminal(f"[BATCH] Lösung für '{problem['title']}' generiert.", "success")
 
-                                # Problem und Lösung speichern
-                                problem_slug = problem['titleSlug']
-                                st.session_state.active_problems[problem_slug] = {
-                                    "title": problem['title'],
-                                    "slug": problem_slug,
-                                    "difficulty": difficulty,
-                                    "question": question,
-                                    "examples": examples
-                                }
+                                    # Problem und Lösung speichern
+                                    problem_slug = problem['titleSlug']
+                                    st.session_state.active_problems[problem_slug] = {
+                                        "title": problem['title'],
+                                        "slug": problem_slug,
+                                        "difficulty": difficulty,
+                                        "question": question,
+                                        "examples": examples
+                                    }
 
-                                # Lösung speichern
-                                st.session_state.solutions[problem_slug] = {
-                                    "code": code,
-                                    "full_response": llm_response
-                                }
+                                    # Lösung speichern
+                                    st.session_state.solutions[problem_slug] = {
+                                        "code": code,
+                                        "full_response": llm_response
+                                    }
+
+                                    # Lokal vorprüfen; scheitert die Lösung schon an den Beispielen, wird sie nicht eingereicht.
+                                    # Sonst wird sie automatisch bei LeetCode eingereicht, während bereits die Lösung
+                                    # für das nächste Problem generiert wird
+                                    if judge_farm is not None:
+                                        prejudge_futures[judge_farm.submit(problem_slug, code, details, language)] = (problem, code, language)
+                                    else:
+                                        submit_to_executor(problem, code, language)
 
-                                # Automatisch bei LeetCode einreichen
+                                    success_count += 1
+                            
+                                except Exception as e:
+                                    log_to_terminal(f"[BATCH] Fehler bei der Verarbeitung von {problem['title']}: {str(e)}", "error")
+                                    failure_count += 1
+                            
+                                # Fertig vorgeprüfte Lösungen schon während der Generierung einreichen
+                                if judge_farm is not None:
+                                    submit_prejudged()
+                            
+                                # Fortschritt aktualisieren
+                                batch_progress.progress((idx + 1) / num_to_process)
+                        
+                            if judge_farm is not None:
+                                if prejudge_futures:
+                                    batch_status_container.info(f"Warte auf {len(prejudge_futures)} lokale Vorprüfungen...")
+                                submit_prejudged(wait=True)
+                                judge_farm.shutdown()
+                        
+                            # Auf die Urteile der noch laufenden Submissions warten; die Ergebnisse werden
+                            # hier im Streamlit-Thread in die Statistik übernommen
+                            if submission_futures:
+                                batch_status_container.info(f"Warte auf {len(submission_futures)} LeetCode-Ergebnisse...")
+                            for future in submission_executor.as_completed(submission_futures):
+                                problem, code = submission_futures[future]
                                 try:
-                                    log_to_terminal(f"[BATCH] Reiche Lösung für '{problem['title']}' bei LeetCode ein...")
-                                    batch_status_container.info(f"Reiche Lösung für '{problem['title']}' bei LeetCode ein...")
-                                    
-                                    from utils.submission_ui import submit_to_leetcode  # Importiere die Funktion für LeetCode-Submits
-                                    
-                                    # Submission starten
-                                    submit_result = submit_to_leetcode(problem_slug, code, "cpp")
-                                    
+                                    submit_result = with_local_measurements(future.result(), local_results.get(problem['titleSlug']))
+                                    record_submission_result(problem['titleSlug'], code, submit_result)
+                                
                                     if submit_result.get("success", False):
-                                        leetcode_status = submit_result.get("result", "Unknown")
+                                        leetcode_status = submit_result.get("status_description", submit_result.get("result", "Unknown"))
                                         is_accepted = (submit_result.get("status_code", 0) == 10)
-                                        
+                                    
                                         if is_accepted:
                                             log_to_terminal(f"[BATCH] Lösung für '{problem['title']}' wurde von LeetCode akzeptiert!", "success")
                                             batch_status_container.success(f"Lösung für '{problem['title']}' wurde von LeetCode akzeptiert!")
@@ -724,15 +841,12 @@ with tab1:
                                 except Exception as e:
                                     log_to_terminal(f"[BATCH] Fehler beim LeetCode-Submit für '{problem['title']}': {str(e)}", "error")
                                     batch_status_container.warning(f"Fehler beim LeetCode-Submit: {str(e)}")
-
-                                success_count += 1
-                            
-                            except Exception as e:
-                                log_to_terminal(f"[BATCH] Fehler bei der Verarbeitung von {problem['title']}: {str(e)}", "error")
-                                failure_count += 1
-                            
-                            # Fortschritt aktualisieren
-                            batch_progress.progress((idx + 1) / num_to_process)
+                            submission_executor.shutdown()
+                        finally:
+                            # Bei Fehlern oder einem Streamlit-Rerun weder Worker-Prozesse noch den Poller-Thread zurücklassen
+                            if judge_farm is not None:
+                                judge_farm.shutdown(wait=False)
+                            submission_executor.shutdown(wait=False)
                         
                         # Zusammenfassung anzeigen
                         batch_progress_container.empty()
@@ -822,7 +936,7 @@ with tab1:
                     
                     try:
                         log_to_terminal(f"Prompt an {full_model_name} gesendet...")
-                        llm_response = get_solution(prompt, temperature=temperature, model=full_model_name)
+                        llm_response = get_solution(prompt, temperature=temperature, model=full_model_name, use_cache=st.session_state.reuse_llm_responses or None)
                         code = extract_code_block(llm_response)
                         
                         # Lösung speichern
@@ -967,7 +1081,8 @@ Gib nur das verbesserte Prompt-Template zurück, ohne Erklärungen.
                     
                     try:
                         # Verwende das gleiche Modell wie für die Lösungen
-                        improved_prompt = get_solution(meta_prompt, temperature=0.5, model=full_model_name)
+                        # Nicht cachen: ein erneuter Versuch soll einen anderen Verbesserungsvorschlag liefern
+                        improved_prompt = get_solution(meta_prompt, temperature=0.5, model=full_model_name, use_cache=False)
                         
                         # Entferne Code-Block-Markierungen, falls vorhanden
                         improved_prompt = extract_code_block(improved_prompt) if "```" in improved_prompt else improved_prompt
@@ -1753,6 +1868,38 @@ Um die Sprache zu ändern, müsstest du im Code des Tools:
                     # Top-Modell identifizieren
                     top_model = model_compare_df.loc[model_compare_df["Success Rate (raw)"].idxmax()]
                     st.success(f"**Top-Modell:** {top_model['Model']} mit einer Erfolgsrate von {top_model['Success Rate']}")
+                
+                # Laufzeit-Effizienz aus den lokalen Messungen (judge/cpp_judge.py), ohne LeetCode-Submit
+                st.subheader("Laufzeit-Effizienz (lokal gemessen)")
+                measured = []
+                for difficulty, results in st.session_state.results.items():
+                    for result in results:
+                        if result.get("success", False) and result.get("local_cpu_ms") is not None:
+                            measured.append({
+                                "Model": result.get("model", "unknown"),
+                                "Slug": result.get("slug"),
+                                "Wall (ms)": result.get("local_wall_ms"),
+                                "CPU (ms)": result.get("local_cpu_ms"),
+                                "Peak-RSS (MB)": result.get("local_memory_mb")
+                            })
+                
+                if not measured:
+                    st.info("Keine lokalen Messungen vorhanden. Aktiviere 'Lokal vorprüfen' oder 'Nur lokal messen' in der Seitenleiste.")
+                else:
+                    measured_df = pd.DataFrame(measured)
+                    # Pro Problem relativ zur schnellsten akzeptierten Lösung, damit leichte und schwere Probleme vergleichbar sind
+                    best_cpu = measured_df.groupby("Slug")["CPU (ms)"].transform("min").clip(lower=0.01)
+                    measured_df["Faktor zur schnellsten Lösung"] = measured_df["CPU (ms)"].clip(lower=0.01) / best_cpu
+                    efficiency_df = measured_df.groupby("Model").agg(**{
+                        "Gemessene Lösungen": ("Slug", "count"),
+                        "Median Wall (ms)": ("Wall (ms)", "median"),
+                        "Median CPU (ms)": ("CPU (ms)", "median"),
+                        "Median Peak-RSS (MB)": ("Peak-RSS (MB)", "median"),
+                        "Ø Faktor zur schnellsten Lösung": ("Faktor zur schnellsten Lösung", "mean")
+                    }).sort_values("Ø Faktor zur schnellsten Lösung").round(2)
+                    st.dataframe(efficiency_df, use_container_width=True)
+                    st.caption("Summe über die Beispieltests je Lösung; nur akzeptierte Lösungen. Ein Faktor von 1.0 bedeutet, "
+                               "dass das Modell bei jedem Problem die schnellste Lösung geliefert hat.")
         
         # Tab 3: Fehleranalyse nach Modell
         with stat_tab3:
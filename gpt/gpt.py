@@ -1,9 +1,59 @@
-import requests
 import re
 import os
 import json
 
-def get_solution(prompt, temperature=0.7, max_tokens=1024, model="codellama"):
+from gpt.response_cache import RESPONSE_CACHE_ENABLED, get_response_cache
+from utils import http_client
+from utils.clean import IncrementalCodeExtractor
+from utils.retry import RetryPolicy, send_with_retry
+
+# Basis-URLs der LLM-APIs; für Benchmarks ohne Netzwerk auf den lokalen Mock-Server umstellen
+# (z.B. OLLAMA_BASE_URL=http://localhost:11435, siehe mock_servers/llm.py)
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
+DEEPSEEK_BASE_URL = os.environ.get("DEEPSEEK_BASE_URL", "https://api.deepseek.com").rstrip("/")
+CLAUDE_BASE_URL = os.environ.get("CLAUDE_BASE_URL", "https://api.anthropic.com").rstrip("/")
+
+# Wiederholungsstrategie für LLM-Anfragen: exponentielles Backoff mit Jitter, Retry-After wird beachtet
+# (529 = "overloaded" bei der Claude API)
+LLM_RETRY_POLICY = RetryPolicy(max_attempts=4, base_delay=2.0, max_delay=60.0, deadline=600.0,
+                               retry_statuses=(429, 500, 502, 503, 504, 529))
+
+# Ollama-Antworten streamen und die Verbindung schließen, sobald der erste Code-Block vollständig ist;
+# Erklärungen nach dem Code werden dann nicht mehr generiert (OLLAMA_STREAM=0 wartet auf die ganze Antwort)
+OLLAMA_STREAM = os.environ.get("OLLAMA_STREAM", "1") != "0"
+
+# Aktuelle Claude-Modellnamen (Stand April 2024)
+CLAUDE_MODEL_MAPPING = {
+    "claude": "claude-3-opus-20240229",  # Default
+    "claude:opus": "claude-3-opus-20240229", 
+    "claude:sonnet": "claude-3-7-sonnet-20250219",
+    "claude:haiku": "claude-3-haiku-20240307",
+    "claude-3-opus": "claude-3-opus-20240229",
+    "claude-3-sonnet": "claude-3-7-sonnet-20250219",
+    "claude-3-haiku": "claude-3-haiku-20240307"
+}
+DEFAULT_CLAUDE_MODEL = "claude-3-opus-20240229"
+DEEPSEEK_MODEL = "deepseek-coder"  # oder ein anderes verfügbares Modell
+
+def resolve_model_name(model):
+    """
+    Bestimmt die API und den Modellnamen, mit dem die API tatsächlich aufgerufen wird.
+    
+    Args:
+        model (str): Der Modellname aus der Oberfläche bzw. der Kommandozeile (z.B. claude:sonnet, deepseek, llama3)
+    
+    Returns:
+        tuple: (API, Modellname), z.B. ("claude", "claude-3-7-sonnet-20250219") oder ("ollama", "llama3")
+    """
+    if "claude" in model:
+        # Falls ein unbekannter Modellname, verwende den Standard
+        return "claude", CLAUDE_MODEL_MAPPING.get(model, DEFAULT_CLAUDE_MODEL)
+    elif "deepseek" in model:
+        return "deepseek", DEEPSEEK_MODEL
+    else:
+        return "ollama", model
+
+def get_solution(prompt, temperature=0.7, max_tokens=1024, model="codellama", use_cache=None):
     """
     Ruft entweder die Ollama API, die DeepSeek API oder die Claude API auf, um eine Lösung für das gegebene LeetCode-Problem zu erhalten.
     
@@ -12,6 +62,9 @@ def get_solution(prompt, temperature=0.7, max_tokens=1024, model="codellama"):
         temperature (float): Die Kreativität des Modells (0.0 bis 1.0)
         max_tokens (int): Maximale Anzahl von Tokens für die Antwort
         model (str): Das zu verwendende Modell (z.B. codellama, llama3, mistral, deepseek, claude)
+        use_cache (bool): Antwort für denselben Prompt speichern und wiederverwenden (siehe gpt/response_cache.py).
+            Standard (None) nur bei Temperatur 0, wo die Antwort praktisch feststeht; True auch bei höherer
+            Temperatur, False (oder LLM_RESPONSE_CACHE=0) fragt immer neu an und speichert nichts
     
     Returns:
         str: Die generierte Lösung
@@ -64,32 +117,55 @@ Important rules to follow:
     
     enhanced_prompt = system_context + "\n\n" + example_solution + "\n\n" + prompt + "\n\nMake sure your C++ code compiles without any syntax errors."
     
+    # Prüfe welches Modell verwendet werden soll
+    backend, model_name = resolve_model_name(model)
+    if use_cache is None:
+        # Bei Temperatur > 0 sind verschiedene Antworten gewollt (mehrere Stichproben, "Lösung generieren")
+        use_cache = temperature == 0
+    use_cache = use_cache and RESPONSE_CACHE_ENABLED
+    cache = get_response_cache() if use_cache else None
+    if use_cache:
+        cached = cache.get(backend, model_name, temperature, max_tokens, enhanced_prompt)
+        if cached is not None:
+            return cached
+    
     try:
-        # Prüfe welches Modell verwendet werden soll
-        if "claude" in model:
-            return get_solution_from_claude(enhanced_prompt, temperature, max_tokens, model)
-        elif "deepseek" in model:
-            return get_solution_from_deepseek(enhanced_prompt, temperature, max_tokens)
+        if backend == "claude":
+            response = get_solution_from_claude(enhanced_prompt, temperature, max_tokens, model)
+        elif backend == "deepseek":
+            response = get_solution_from_deepseek(enhanced_prompt, temperature, max_tokens)
         else:
-            return get_solution_from_ollama(enhanced_prompt, temperature, model)
+            response = get_solution_from_ollama(enhanced_prompt, temperature, model_name)
     except Exception as e:
         raise Exception(f"Error calling API: {str(e)}")
+    
+    if use_cache:
+        cache.put(backend, model_name, temperature, max_tokens, enhanced_prompt, response)
+    return response
 
-def get_solution_from_ollama(prompt, temperature, model):
-    """Verwendet die Ollama API, um eine Lösung zu generieren"""
+def get_solution_from_ollama(prompt, temperature, model, stream=OLLAMA_STREAM):
+    """
+    Verwendet die Ollama API, um eine Lösung zu generieren
+    
+    Mit stream=True wird die Antwort als NDJSON gestreamt und die Verbindung geschlossen, sobald der
+    erste Code-Block vollständig ist; Ollama bricht die Generierung dann ab. Die zurückgegebene
+    Antwort endet in diesem Fall mit dem schließenden Zaun des Blocks.
+    """
     try:
         # Verwende die Ollama API
-        res = requests.post("http://localhost:11434/api/generate", json={
+        res = send_with_retry(lambda: http_client.post(f"{OLLAMA_BASE_URL}/api/generate", json={
             "model": model,
             "prompt": prompt,
-            "stream": False,
+            "stream": stream,
             "options": {
                 "temperature": temperature,
             }
-        })
+        }, stream=stream), LLM_RETRY_POLICY, "Ollama API request")
         
         # Überprüfe, ob die Anfrage erfolgreich war
-        if res.status_code == 200:
+        if res.status_code == 200 and stream:
+            return read_ollama_stream(res)
+        elif res.status_code == 200:
             response = res.json()["response"]
             
             # Post-Prozessierung für häufige Fehler
@@ -102,6 +178,23 @@ def get_solution_from_ollama(prompt, temperature, model):
     except Exception as e:
         raise Exception(f"Error calling Ollama API: {str(e)}")
 
+def read_ollama_stream(res):
+    """Liest eine gestreamte Ollama-Antwort bis zum Ende oder bis zum ersten vollständigen Code-Block"""
+    extractor = IncrementalCodeExtractor()
+    try:
+        for line in res.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise Exception(f"Ollama API stream failed: {chunk['error']}")
+            # Schließen der Verbindung beendet die Generierung bei Ollama
+            if extractor.feed(chunk.get("response", "")) or chunk.get("done"):
+                break
+    finally:
+        res.close()
+    return extractor.text
+
 def get_solution_from_deepseek(prompt, temperature, max_tokens=1024):
     """Verwendet die DeepSeek API, um eine Lösung zu generieren"""
     api_key = os.getenv("DEEPSEEK_API_KEY")
@@ -114,11 +207,11 @@ def get_solution_from_deepseek(prompt, temperature, max_tokens=1024):
     }
     
     # DeepSeek API-Endpunkt
-    url = "https://api.deepseek.com/v1/chat/completions"
+    url = f"{DEEPSEEK_BASE_URL}/v1/chat/completions"
     
     # Nachrichtenformat für die DeepSeek API
     data = {
-        "model": "deepseek-coder",  # oder ein anderes verfügbares Modell
+        "model": DEEPSEEK_MODEL,
         "messages": [
             {"role": "system", "content": "You are an expert C++ developer solving LeetCode problems."},
             {"role": "user", "content": prompt}
@@ -128,7 +221,8 @@ def get_solution_from_deepseek(prompt, temperature, max_tokens=1024):
     }
     
     try:
-        response = requests.post(url, json=data, headers=headers)
+        response = send_with_retry(lambda: http_client.post(url, json=data, headers=headers),
+                                   LLM_RETRY_POLICY, "DeepSeek API request")
         
         if response.status_code == 200:
             result = response.json()
@@ -150,29 +244,14 @@ def get_solution_from_claude(prompt, temperature, max_tokens=1024, model_name="c
         "anthropic-version": "2023-06-01"
     }
     
-    # Aktuelle Claude-Modellnamen (Stand April 2024)
-    CLAUDE_MODEL_MAPPING = {
-        "claude": "claude-3-opus-20240229",  # Default
-        "claude:opus": "claude-3-opus-20240229", 
-        "claude:sonnet": "claude-3-7-sonnet-20250219",
-        "claude:haiku": "claude-3-haiku-20240307",
-        "claude-3-opus": "claude-3-opus-20240229",
-        "claude-3-sonnet": "claude-3-7-sonnet-20250219",
-        "claude-3-haiku": "claude-3-haiku-20240307"
-    }
-    
     # Überprüfe, ob ein spezifisches Claude-Modell angefordert wurde
-    if model_name in CLAUDE_MODEL_MAPPING:
-        claude_model = CLAUDE_MODEL_MAPPING[model_name]
-    else:
-        # Falls ein unbekannter Modellname, verwende den Standard
-        claude_model = "claude-3-opus-20240229"
+    _, claude_model = resolve_model_name(model_name)
     
     log_message = f"Verwende Claude-Modell: {claude_model}"
     print(log_message)
     
     # Claude API-Endpunkt
-    url = "https://api.anthropic.com/v1/messages"
+    url = f"{CLAUDE_BASE_URL}/v1/messages"
     
     # Nachrichtenformat für die Claude API
     data = {
@@ -185,7 +264,8 @@ def get_solution_from_claude(prompt, temperature, max_tokens=1024, model_name="c
     }
     
     try:
-        response = requests.post(url, json=data, headers=headers)
+        response = send_with_retry(lambda: http_client.post(url, json=data, headers=headers),
+                                   LLM_RETRY_POLICY, "Claude API request")
         
         if response.status_code == 200:
             result = response.json()
@@ -0,0 +1,163 @@
+"""
+Persistent cache of LLM responses.
+
+Re-running an experiment sends the same prompts to the same models again. The
+response cache stores every generated response under (backend, resolved model
+name, temperature, max_tokens, SHA-256 of the complete prompt), so a repeated
+run or a prompt-template A/B test only queries the model for prompts that
+actually changed. By default get_solution only uses the cache at temperature
+0, where the answer is effectively deterministic; at higher temperatures
+repeated calls are meant to sample different solutions, so caching there is
+opt-in (use_cache=True). use_cache=False (or LLM_RESPONSE_CACHE=0) neither
+reads nor writes the cache.
+
+The total size of the stored responses is capped; the least recently used
+entries are evicted first.
+
+Settings (environment variables):
+    LLM_RESPONSE_CACHE: Set to "0" to bypass the cache
+    LLM_RESPONSE_CACHE_MAX_BYTES: Size cap for the stored responses (default 64 MiB)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+from utils.storage import database_path, open_database
+
+RESPONSE_CACHE_FILENAME = "llm_responses.sqlite3"
+RESPONSE_CACHE_ENABLED = os.environ.get("LLM_RESPONSE_CACHE", "1") != "0"
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("LLM_RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    backend TEXT NOT NULL,
+    model TEXT NOT NULL,
+    temperature REAL NOT NULL,
+    max_tokens INTEGER NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at);
+"""
+
+
+def response_key(backend: str, model: str, temperature: float, max_tokens: int, prompt: str) -> str:
+    """SHA-256 over the request parameters and the hash of the prompt."""
+    prompt_hash = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    payload = json.dumps([backend, model, float(temperature), int(max_tokens), prompt_hash])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """SQLite-backed LRU store for LLM responses."""
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+        self.path = path or database_path(RESPONSE_CACHE_FILENAME)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = open_database(self.path)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, backend: str, model: str, temperature: float, max_tokens: int, prompt: str) -> Optional[str]:
+        """
+        Return the stored response for a request.
+
+        Args:
+            backend: The API that generated the response ("ollama", "deepseek", "claude")
+            model: The resolved model name
+            temperature: The sampling temperature
+            max_tokens: The token limit of the response
+            prompt: The complete prompt sent to the model
+
+        Returns:
+            The response text, or None if the request was never answered
+        """
+        key = response_key(backend, model, temperature, max_tokens, prompt)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT response FROM responses WHERE cache_key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ?, hits = hits + 1 WHERE cache_key = ?",
+                               (time.time(), key))
+            self.hits += 1
+        return row["response"]
+
+    def put(self, backend: str, model: str, temperature: float, max_tokens: int, prompt: str, response: str):
+        """
+        Store a response and evict old entries if the cache is too large.
+
+        Args:
+            backend: The API that generated the response
+            model: The resolved model name
+            temperature: The sampling temperature
+            max_tokens: The token limit of the response
+            prompt: The complete prompt sent to the model
+            response: The generated response
+        """
+        key = response_key(backend, model, temperature, max_tokens, prompt)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO responses (cache_key, backend, model, temperature, max_tokens, response, size,
+                                       created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    response = excluded.response,
+                    size = excluded.size,
+                    created_at = excluded.created_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (key, backend, model, float(temperature), int(max_tokens), response,
+                 len(response.encode("utf-8")), now, now),
+            )
+            self._evict()
+
+    def _evict(self):
+        """Remove the least recently used responses until the size cap is met (lock must be held)."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT cache_key, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for row in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((row["cache_key"],))
+            total -= row["size"]
+        self._conn.executemany("DELETE FROM responses WHERE cache_key = ?", evicted)
+
+    def size(self) -> int:
+        """Total size of the stored responses in bytes."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide response cache (opened lazily)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
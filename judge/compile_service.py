@@ -0,0 +1,248 @@
+"""
+Compile service for the local C++ judge.
+
+Compiling a harness from scratch spends almost all of its time parsing
+<bits/stdc++.h> and the rest of leetcode_prelude.hpp. The compile service
+keeps a precompiled header of the prelude and caches the compiled binaries:
+
+- The precompiled header (leetcode_prelude.hpp.gch) is built once per
+  compiler, flag set and prelude version and lies in a directory that is
+  searched before judge/, so g++ picks it up for '#include "leetcode_prelude.hpp"'.
+- Binaries are stored under the hash of the normalized source (see
+  utils.clean.normalize_code), the compiler version, the flags and the
+  prelude. Compiling an identical solution, or one that only differs in
+  comments and whitespace, returns the cached binary without running g++.
+- Compiler errors are cached too, under the hash of the exact source, because
+  their line numbers refer to it.
+
+All files are written to a temporary name and renamed into place, so several
+processes (e.g. the judge farm) can share the cache. When the binaries exceed
+LOCAL_JUDGE_BINARY_CACHE_MB, the least recently used ones are removed.
+
+Settings (environment variables):
+    LOCAL_JUDGE_CXX: C++ compiler (default g++)
+    LOCAL_JUDGE_BINARY_CACHE_MB: Size limit of the binary cache in MiB (default 256)
+"""
+
+import hashlib
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+from typing import Optional, Tuple
+
+from utils.clean import normalize_code
+from utils.storage import database_path
+
+CXX = os.environ.get("LOCAL_JUDGE_CXX", "g++")
+CXX_FLAGS = ["-std=c++20", "-O2"]
+COMPILE_TIMEOUT = 60
+BINARY_CACHE_MB = int(os.environ.get("LOCAL_JUDGE_BINARY_CACHE_MB", 256))
+
+JUDGE_DIR = os.path.dirname(os.path.abspath(__file__))
+PRELUDE_FILENAME = "leetcode_prelude.hpp"
+COMPILE_CACHE_DIRNAME = "cpp_compile"
+
+
+def _sha256(*parts: str) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        # Trennzeichen, damit ("ab", "c") und ("a", "bc") verschiedene Hashes ergeben
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, data: bytes, mode: int = 0o644):
+    """Write a file under a temporary name and rename it into place."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class CompileService:
+    """
+    Compiles judge harnesses with a precompiled prelude and a persistent binary cache.
+
+    Args:
+        cache_dir: Directory for the precompiled header and the binaries
+        max_cache_mb: Size limit of the cached binaries in MiB
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_cache_mb: int = BINARY_CACHE_MB):
+        self.cache_dir = cache_dir or database_path(COMPILE_CACHE_DIRNAME)
+        self.binary_dir = os.path.join(self.cache_dir, "bin")
+        self.max_cache_bytes = max_cache_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._toolchain: Optional[str] = None
+        self._pch_dir: Optional[str] = None
+        os.makedirs(self.binary_dir, exist_ok=True)
+
+    @property
+    def toolchain(self) -> str:
+        """Hash of everything besides the source that the compiled binary depends on."""
+        with self._lock:
+            if self._toolchain is None:
+                try:
+                    version = subprocess.run([CXX, "--version"], capture_output=True, text=True,
+                                             timeout=COMPILE_TIMEOUT).stdout
+                except (OSError, subprocess.TimeoutExpired):
+                    version = CXX
+                with open(os.path.join(JUDGE_DIR, PRELUDE_FILENAME), encoding="utf-8") as f:
+                    prelude = f.read()
+                self._toolchain = _sha256(version, " ".join(CXX_FLAGS), prelude)
+            return self._toolchain
+
+    def precompiled_header_dir(self) -> Optional[str]:
+        """
+        Return the directory with the precompiled prelude, building it if necessary.
+
+        Returns None if the header cannot be precompiled; the harness is then
+        compiled with the plain prelude.
+        """
+        toolchain = self.toolchain
+        with self._lock:
+            if self._pch_dir is not None:
+                return self._pch_dir or None
+
+            pch_dir = os.path.join(self.cache_dir, "pch", toolchain[:16])
+            pch_path = os.path.join(pch_dir, f"{PRELUDE_FILENAME}.gch")
+            if not os.path.exists(pch_path):
+                os.makedirs(pch_dir, exist_ok=True)
+                # Gleiche Flags wie beim Kompilieren der Lösungen, sonst verwirft g++ den Header
+                temp_path = os.path.join(pch_dir, f".tmp-{os.getpid()}-{threading.get_ident()}.gch")
+                command = [CXX, *CXX_FLAGS, "-x", "c++-header", os.path.join(JUDGE_DIR, PRELUDE_FILENAME),
+                           "-o", temp_path]
+                try:
+                    completed = subprocess.run(command, capture_output=True, text=True, timeout=COMPILE_TIMEOUT)
+                except (OSError, subprocess.TimeoutExpired) as e:
+                    completed = None
+                    logging.warning(f"Could not precompile {PRELUDE_FILENAME}: {str(e)}")
+                if completed is None or completed.returncode != 0:
+                    if completed is not None:
+                        logging.warning(f"Could not precompile {PRELUDE_FILENAME}:\n{completed.stderr[:2000]}")
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+                    self._pch_dir = ""
+                    return None
+                os.replace(temp_path, pch_path)
+                logging.info(f"Precompiled {PRELUDE_FILENAME} into {pch_dir}")
+
+            self._pch_dir = pch_dir
+            return pch_dir
+
+    def compile(self, source: str) -> Tuple[Optional[str], str]:
+        """
+        Compile a harness source, or return the cached result of an earlier compilation.
+
+        Args:
+            source: The C++ source (must include leetcode_prelude.hpp first to use the precompiled header)
+
+        Returns:
+            (path of the binary or None if compilation failed, compiler output)
+        """
+        binary_path = os.path.join(self.binary_dir, _sha256(self.toolchain, normalize_code(source, "cpp")))
+        error_path = os.path.join(self.binary_dir, _sha256(self.toolchain, source) + ".err")
+        for path in (binary_path, error_path):
+            if os.path.exists(path):
+                try:
+                    # Zugriffszeit für die LRU-Verdrängung aktualisieren
+                    os.utime(path)
+                except FileNotFoundError:
+                    # Gerade von einem anderen Prozess verdrängt
+                    continue
+                with self._lock:
+                    self.hits += 1
+                if path == binary_path:
+                    return binary_path, ""
+                with open(error_path, encoding="utf-8") as f:
+                    return None, f.read()
+
+        with self._lock:
+            self.misses += 1
+        binary, output = self._run_compiler(source)
+        if binary is None:
+            # Timeouts nicht speichern, sie können an einer ausgelasteten Maschine liegen
+            if not output.startswith("Compilation timed out"):
+                _write_atomic(error_path, output.encode("utf-8"))
+            return None, output
+
+        _write_atomic(binary_path, binary, mode=0o755)
+        self._evict()
+        return binary_path, output
+
+    def _run_compiler(self, source: str) -> Tuple[Optional[bytes], str]:
+        """Run g++ on a source and return (the binary's content or None, compiler output)."""
+        include_dirs = [JUDGE_DIR]
+        pch_dir = self.precompiled_header_dir()
+        if pch_dir is not None:
+            # Vor judge/ durchsucht, damit g++ die .gch-Datei statt des Headers findet
+            include_dirs.insert(0, pch_dir)
+
+        with tempfile.TemporaryDirectory(prefix="leetcode-compile-") as workdir:
+            source_path = os.path.join(workdir, "main.cpp")
+            output_path = os.path.join(workdir, "solution")
+            with open(source_path, "w", encoding="utf-8") as f:
+                f.write(source)
+
+            command = [CXX, *CXX_FLAGS]
+            for include_dir in include_dirs:
+                command += ["-I", include_dir]
+            command += ["-o", output_path, source_path]
+            try:
+                completed = subprocess.run(command, capture_output=True, text=True, timeout=COMPILE_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                return None, f"Compilation timed out after {COMPILE_TIMEOUT} seconds"
+            if completed.returncode != 0:
+                return None, completed.stderr
+            with open(output_path, "rb") as f:
+                return f.read(), completed.stderr
+
+    def _evict(self):
+        """Remove the least recently used binaries while the cache exceeds its size limit."""
+        entries = []
+        total = 0
+        with os.scandir(self.binary_dir) as it:
+            for entry in it:
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+        if total <= self.max_cache_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_cache_bytes:
+                break
+
+
+_service: Optional[CompileService] = None
+_service_lock = threading.Lock()
+
+
+def get_compile_service() -> CompileService:
+    """Return the process-wide compile service (created lazily)."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CompileService()
+        return _service
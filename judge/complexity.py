@@ -0,0 +1,456 @@
+"""
+Empirical complexity probe for locally judged C++ solutions.
+
+Time, memory and output limit verdicts (status codes 12-14) only show up
+after LeetCode has run all hidden tests, because the example test cases are
+tiny. The probe runs a compiled harness on generated inputs of growing size
+instead: the inputs follow the problem's signature and the bounds in its
+"Constraints" section (e.g. "1 <= nums.length <= 10^4",
+"-10^9 <= nums[i] <= 10^9", "m == grid.length"), scaled from a tiny fraction
+of the maximum up to the maximum itself.
+
+From the CPU time and peak memory of the runs it fits a power law
+t ~ scale^k and extrapolates to the largest allowed input. The estimate
+(exponent, a label like "O(n log n)", predicted time and memory) is stored
+as "complexity_estimate" in the local verdict and later next to the
+runtime_ms of the LeetCode result. If a generated input within the
+constraints actually exceeds the time, memory or output limit, the probe
+reports it in "exceeded" and the UI warns about a likely limit verdict.
+
+The inputs are random and know nothing about guarantees that are only stated
+in prose ("nums is sorted", "the answer exists"). Runs that crash on them are
+therefore not counted against the solution; the probe just gives up. For the
+same reason a limit exceeded on a generated input is only a warning: a
+solution that loops until the guaranteed answer turns up may never finish
+on random data. The local verdict stays Accepted.
+
+Settings (environment variables):
+    LOCAL_JUDGE_COMPLEXITY_PROBE: Set to 0 to disable the probe (default 1)
+"""
+
+import html
+import logging
+import math
+import os
+import random
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+PROBE_ENABLED = os.environ.get("LOCAL_JUDGE_COMPLEXITY_PROBE", "1") != "0"
+
+# Anteile der maximalen Eingabegröße, auf denen die Lösung ausgeführt wird
+PROBE_SCALES = [1 / 1024, 1 / 256, 1 / 64, 1 / 16, 1 / 4, 1]
+# Größere Eingaben werden nicht erzeugt, sondern extrapoliert
+MAX_ELEMENTS = 2_000_000
+# Unterschiede zur kleinsten Eingabe, die nicht mehr als Messrauschen gelten
+NOISE_SECONDS = 0.005
+NOISE_MB = 1.0
+# Maximale Länge der erzeugten Eingabe im Ergebnis
+TESTCASE_PREVIEW_CHARS = 500
+
+# Wertebereich für Elemente ohne Angabe in den Constraints
+_DEFAULT_VALUE_BOUNDS = (0, 100)
+# Länge innerer Listen ohne Angabe (meist Paare wie Kanten oder Intervalle)
+_DEFAULT_INNER_LENGTH = 2
+
+_CHARSETS = [
+    ("lowercase", "abcdefghijklmnopqrstuvwxyz"),
+    ("uppercase", "ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+    ("english letters", "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+    ("digits", "0123456789"),
+]
+_DEFAULT_CHARSET = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _number(expression: str) -> Optional[float]:
+    """Evaluate a bound like "10^4", "5 * 10^4" or "2^31 - 1"."""
+    expression = expression.strip().replace("×", "*").replace("−", "-")
+    if not expression or not re.fullmatch(r"[\d\s+\-*^.()]+", expression):
+        return None
+    # Verkettete Potenzen wie 9^9^9 würden die Auswertung blockieren
+    if re.search(r"\^\s*\(?\s*\d+\s*\)?\s*\^", expression):
+        return None
+    try:
+        value = eval(expression.replace("^", "**"), {"__builtins__": {}}, {})
+    except (SyntaxError, TypeError, ZeroDivisionError, OverflowError):
+        return None
+    return float(value) if isinstance(value, (int, float)) else None
+
+
+def _normalize_name(name: str) -> str:
+    """Map "nums[i]", "nums[j].length", "grid[i][j]" to "nums[]", "nums[].length", "grid[][]"."""
+    name = re.sub(r"\s+", "", name)
+    return re.sub(r"\[[^\]]*\]", "[]", name)
+
+
+def _constraint_lines(content: str) -> List[str]:
+    """Return the text of the list items in the problem description (constraints are list items)."""
+    # Hochgestellte Exponenten als "^" schreiben, damit "10<sup>4</sup>" zu "10^4" wird
+    content = re.sub(r"<sup>\s*(.*?)\s*</sup>", r"^\1", content or "", flags=re.S)
+    soup = BeautifulSoup(content, "html.parser")
+    items = [item.get_text("") for item in soup.find_all("li")]
+    return [html.unescape(item).replace("\xa0", " ").strip() for item in items]
+
+
+class Constraints:
+    """Bounds on lengths, values and node counts parsed from a problem's constraints."""
+
+    def __init__(self, content: str):
+        # Normalisierter Name -> (Untergrenze, Obergrenze); Grenzen sind Zahlen oder Namen
+        self.bounds: Dict[str, Tuple[Any, Any]] = {}
+        # Gleichheiten wie "m == grid.length"
+        self.aliases: Dict[str, set] = {}
+        self.node_count: Optional[Tuple[float, float]] = None
+        self.lines = _constraint_lines(content)
+        for line in self.lines:
+            self._parse(line)
+
+    def _parse(self, line: str):
+        text = line.replace("≤", "<=").replace("≥", ">=")
+
+        match = re.search(r"number of nodes.*?range\s*\[\s*([^,\]]+),\s*([^\]]+)\]", text, re.I)
+        if match:
+            low, high = _number(match.group(1)), _number(match.group(2))
+            if low is not None and high is not None:
+                self.node_count = (low, high)
+            return
+
+        equality = re.fullmatch(r"\s*([\w.\[\]]+)\s*==\s*([\w.\[\]\s^*+-]+?)\s*\.?", text)
+        if equality:
+            left, right = _normalize_name(equality.group(1)), equality.group(2)
+            value = _number(right)
+            if value is not None:
+                self.bounds[left] = (value, value)
+            else:
+                right = _normalize_name(right)
+                group = self.aliases.get(left, {left}) | self.aliases.get(right, {right})
+                for name in group:
+                    self.aliases[name] = group
+            return
+
+        # Ketten wie "1 <= nums.length <= 10^4", "0 <= ai, bi < n" oder "-10^9 <= nums[i] <= 10^9"
+        parts = re.split(r"\s*(<=|<)\s*", text)
+        if len(parts) not in (3, 5):
+            return
+        sides = parts[0::2]
+        if len(sides) == 2:
+            low, names, high = None, sides[0], sides[1]
+        else:
+            low, names, high = sides
+        high = re.sub(r"[.,;]\s*$", "", high).strip()
+        strict_high = parts[-2] == "<"
+        low_value = _number(low) if low is not None else None
+        high_value = _number(high)
+        if high_value is None:
+            if not re.fullmatch(r"[\w.\[\]]+", high):
+                return
+            high_value = _normalize_name(high)
+        elif strict_high:
+            high_value -= 1
+        if low is not None and low_value is None:
+            return
+        if isinstance(high_value, str) and strict_high:
+            # "< n": Obergrenze n - 1 (als Name mit Abzug gespeichert)
+            high_value = (high_value, -1)
+        for name in names.split(","):
+            name = name.strip()
+            if re.fullmatch(r"[A-Za-z_][\w.\[\]]*", name):
+                self.bounds[_normalize_name(name)] = (low_value, high_value)
+
+    def lookup(self, name: str) -> Optional[Tuple[Any, Any]]:
+        """Return the bounds of a name or of a name that is declared equal to it."""
+        for candidate in sorted(self.aliases.get(name, {name}), key=lambda n: n != name):
+            if candidate in self.bounds:
+                return self.bounds[candidate]
+        return None
+
+    def charset(self, name: str) -> str:
+        """Return the characters a string parameter consists of."""
+        for line in self.lines:
+            if not re.search(rf"\b{re.escape(name)}\b", line):
+                continue
+            quoted = re.findall(r"'(.)'", line)
+            if quoted and ("consist" in line or " is " in line or "either" in line):
+                return "".join(dict.fromkeys(quoted))
+            if "consist" in line:
+                lowered = line.lower()
+                charset = "".join(chars for keyword, chars in _CHARSETS if keyword in lowered)
+                if "only lowercase" in lowered or ("lowercase" in lowered and "uppercase" not in lowered
+                                                   and "digits" not in lowered):
+                    charset = _CHARSETS[0][1]
+                if charset:
+                    return "".join(dict.fromkeys(charset))
+        return _DEFAULT_CHARSET
+
+
+class InputGenerator:
+    """
+    Generates harness inputs for a signature at a given fraction of the maximum size.
+
+    Args:
+        params: (C++ type, name) of each parameter, as in cpp_judge.Signature
+        constraints: The parsed constraints of the problem
+        seed: Seed of the random values (inputs are reproducible)
+    """
+
+    def __init__(self, params: List[Tuple[str, str]], constraints: Constraints, seed: int = 0):
+        self.params = params
+        self.constraints = constraints
+        self.seed = seed
+        self._sizes: Dict[str, int] = {}
+        self._scale = 1.0
+
+    def _resolve(self, bound: Any) -> Optional[float]:
+        """Turn a bound (number, name or (name, offset)) into a number at the current scale."""
+        if bound is None or isinstance(bound, (int, float)):
+            return bound
+        offset = 0
+        if isinstance(bound, tuple):
+            bound, offset = bound
+        value = self._size(bound)
+        return None if value is None else value + offset
+
+    def _size(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        """Return the value of a length or size parameter at the current scale."""
+        if name in self._sizes:
+            return self._sizes[name]
+        bounds = self.constraints.lookup(name)
+        if bounds is None:
+            value = default
+        else:
+            low = self._resolve(bounds[0])
+            high = self._resolve(bounds[1])
+            if high is None:
+                value = default
+            elif isinstance(bounds[1], (int, float)):
+                low = 0 if low is None else low
+                value = int(max(low, min(high, round(high * self._scale))))
+            else:
+                # Obergrenze durch eine andere Größe gegeben (z.B. "k <= nums.length"): mittlerer Wert
+                low = 0 if low is None else low
+                value = int(max(low, (low + high) // 2))
+        for alias in self.constraints.aliases.get(name, {name}):
+            self._sizes[alias] = value
+        return value
+
+    def _value_bounds(self, key: str) -> Tuple[int, int]:
+        bounds = self.constraints.lookup(key)
+        if bounds is None:
+            return _DEFAULT_VALUE_BOUNDS
+        low, high = self._resolve(bounds[0]), self._resolve(bounds[1])
+        if low is None:
+            low = min(0, high) if high is not None else _DEFAULT_VALUE_BOUNDS[0]
+        if high is None:
+            high = max(low, _DEFAULT_VALUE_BOUNDS[1])
+        return int(low), int(max(low, high))
+
+    def _shape(self, cpp_type: str, name: str) -> List[int]:
+        """Return the lengths of the nested dimensions of a parameter."""
+        depth = cpp_type.count("vector")
+        if re.search(r"\b(?:ListNode|TreeNode)\b", cpp_type):
+            node_count = self.constraints.node_count
+            if node_count is not None:
+                return [int(max(node_count[0], min(node_count[1], round(node_count[1] * self._scale))))]
+            return [self._size(f"{name}.length", 1) or 0]
+        if re.search(r"\bstring\b", cpp_type):
+            depth += 1
+        shape = []
+        key = name
+        for level in range(depth):
+            shape.append(self._size(f"{key}.length", _DEFAULT_INNER_LENGTH if level else 1) or 0)
+            key += "[]"
+        return shape
+
+    def element_count(self, scale: float) -> int:
+        """Number of values in the input at a scale (checked before generating it)."""
+        self._sizes, self._scale = {}, scale
+        total = 0
+        for cpp_type, name in self.params:
+            total += max(1, math.prod(self._shape(cpp_type, name)))
+        return total
+
+    def generate(self, scale: float) -> str:
+        """Return the harness input (one line per parameter) at a fraction of the maximum size."""
+        self._sizes, self._scale = {}, scale
+        rng = random.Random(self.seed)
+        lines = []
+        for cpp_type, name in self.params:
+            lines.append(self._render(cpp_type, name, rng))
+        return "\n".join(lines) + "\n"
+
+    def _render(self, cpp_type: str, name: str, rng: random.Random) -> str:
+        base = re.sub(r"\b(?:const|unsigned|signed)\b|[&*]", " ", cpp_type)
+        base = re.sub(r"\s+", "", base)
+        shape = self._shape(cpp_type, name)
+
+        if "ListNode" in base or "TreeNode" in base:
+            if "vector<" in base:
+                raise ValueError(f"cannot generate {cpp_type}")
+            low, high = self._value_bounds("Node.val")
+            return "[" + ",".join(str(rng.randint(low, high)) for _ in range(shape[0])) + "]"
+
+        scalar = base.replace("vector<", "").replace(">", "")
+        if scalar == "string":
+            charset = self.constraints.charset(name)
+
+            def item(shape_rest: List[int]) -> str:
+                length = shape_rest[0] if shape_rest else 1
+                return '"' + "".join(rng.choice(charset) for _ in range(length)) + '"'
+        elif scalar == "char":
+            charset = self.constraints.charset(name)
+
+            def item(shape_rest: List[int]) -> str:
+                return '"' + rng.choice(charset) + '"'
+        elif scalar == "bool":
+            def item(shape_rest: List[int]) -> str:
+                return rng.choice(["true", "false"])
+        else:
+            key = name + "[]" * base.count("vector<")
+            if not shape:
+                # Skalare Parameter wie n oder k wachsen mit der Eingabegröße
+                size = self._size(name)
+                if size is not None:
+                    return str(size)
+            low, high = self._value_bounds(key)
+            if scalar in ("double", "float"):
+                def item(shape_rest: List[int]) -> str:
+                    return f"{rng.uniform(low, high):.5f}"
+            else:
+                def item(shape_rest: List[int]) -> str:
+                    return str(rng.randint(low, high))
+
+        def render(dims: List[int]) -> str:
+            if not dims or (scalar == "string" and len(dims) == 1):
+                return item(dims)
+            return "[" + ",".join(render(dims[1:]) for _ in range(dims[0])) + "]"
+
+        return render(shape)
+
+
+def _fit_exponent(points: List[Tuple[float, float]], noise: float) -> Optional[float]:
+    """Least-squares slope of log(value - baseline) over log(scale), ignoring differences below noise."""
+    baseline = points[0][1]
+    usable = [(math.log(scale), math.log(value - baseline)) for scale, value in points[1:]
+              if value - baseline >= noise]
+    # Die größten Eingaben bestimmen das Wachstum, bei kleinen überwiegen Start- und Einlesekosten
+    usable = usable[-3:]
+    if len(usable) < 2:
+        return None
+    mean_x = sum(x for x, _ in usable) / len(usable)
+    mean_y = sum(y for _, y in usable) / len(usable)
+    variance = sum((x - mean_x) ** 2 for x, _ in usable)
+    if variance == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in usable) / variance
+
+
+def complexity_label(exponent: float) -> str:
+    """Describe a fitted exponent as a complexity class."""
+    if exponent < 0.5:
+        return "O(log n)"
+    if exponent < 1.25:
+        return "O(n)"
+    if exponent < 1.6:
+        return "O(n log n)"
+    if exponent < 2.5:
+        return "O(n^2)"
+    if exponent < 3.5:
+        return "O(n^3)"
+    return f"O(n^{exponent:.1f})"
+
+
+def probe_complexity(run: Callable[[str], Any], params: List[Tuple[str, str]], content: str,
+                     time_limit: float, memory_limit_mb: int) -> Optional[Dict[str, Any]]:
+    """
+    Run a compiled solution on generated inputs of growing size and estimate its complexity.
+
+    Args:
+        run: Runs the solution on one input and returns a cpp_judge.RunResult
+        params: (C++ type, name) of each parameter of the solution method
+        content: The HTML description of the problem (with the constraints)
+        time_limit: Time limit in seconds that the prediction is checked against
+        memory_limit_mb: Memory limit in MiB that the prediction is checked against
+
+    Returns:
+        The estimate, or None if the generated inputs are not accepted by the solution.
+        "points" lists [scale, CPU ms, peak MiB] per run; "label" is None if the runtime
+        does not grow measurably. If an input exceeded a limit, "exceeded" holds the
+        RunResult status ("tle", "mle" or "ole") and "testcase" the (shortened) input.
+    """
+    generator = InputGenerator(params, Constraints(content))
+    points = []
+    exceeded = None
+    previous_input = None
+    for scale in PROBE_SCALES:
+        if generator.element_count(scale) > MAX_ELEMENTS:
+            break
+        try:
+            input_text = generator.generate(scale)
+        except ValueError as e:
+            logging.info(f"Complexity probe skipped: {str(e)}")
+            return None
+        if input_text == previous_input:
+            # Ohne Längenangaben in den Constraints wächst die Eingabe nicht mit
+            continue
+        previous_input = input_text
+        result = run(input_text)
+        if result.status in ("tle", "mle", "ole"):
+            exceeded = {"exceeded": result.status, "testcase": input_text[:TESTCASE_PREVIEW_CHARS]}
+            break
+        if result.status != "ok":
+            logging.info(f"Complexity probe stopped: generated input gave {result.status} at scale {scale:g}")
+            return None
+        points.append((scale, result.cpu_time, result.max_rss_kb / 1024))
+        if result.cpu_time > time_limit / 2:
+            # Größere Eingaben würden das Zeitlimit nur noch bestätigen
+            break
+
+    if exceeded is not None:
+        estimate = {"label": None, "exponent": None, "max_scale": points[-1][0] if points else None,
+                    "likely_tle": exceeded["exceeded"] == "tle", "likely_mle": exceeded["exceeded"] == "mle",
+                    "points": [[scale, round(cpu * 1000, 2), round(rss, 2)] for scale, cpu, rss in points]}
+        estimate.update(exceeded)
+        return estimate
+    if not points:
+        return None
+
+    exponent = _fit_exponent([(scale, cpu) for scale, cpu, _ in points], NOISE_SECONDS)
+    memory_exponent = _fit_exponent([(scale, rss) for scale, _, rss in points], NOISE_MB)
+    last_scale, last_cpu, last_rss = points[-1]
+    base_cpu, base_rss = points[0][1], points[0][2]
+    growth = 1 / last_scale
+    predicted_cpu = base_cpu + (last_cpu - base_cpu) * growth ** (exponent if exponent is not None else 1)
+    predicted_rss = base_rss + (last_rss - base_rss) * growth ** (memory_exponent if memory_exponent is not None
+                                                                  else 1)
+    return {
+        # Ohne messbares Wachstum bis zur maximalen Eingabegröße bleibt die Klasse offen
+        "label": complexity_label(exponent) if exponent is not None else None,
+        "exponent": round(exponent, 2) if exponent is not None else None,
+        "max_scale": last_scale,
+        "predicted_ms": round(predicted_cpu * 1000, 2),
+        "predicted_memory_mb": round(predicted_rss, 2),
+        "likely_tle": predicted_cpu > time_limit,
+        "likely_mle": predicted_rss > memory_limit_mb,
+        "points": [[scale, round(cpu * 1000, 2), round(rss, 2)] for scale, cpu, rss in points],
+    }
+
+
+def format_complexity_estimate(estimate: Dict[str, Any]) -> str:
+    """One-line summary of an estimate for the UI, e.g. "O(n^2), ~331 ms at max. input size"."""
+    if estimate.get("exceeded"):
+        limits = {"tle": "Time", "mle": "Memory", "ole": "Output"}
+        return f"{limits[estimate['exceeded']]} limit exceeded on a generated input"
+
+    parts = [estimate.get("label") or "no measurable growth",
+             f"~{estimate['predicted_ms']:.0f} ms and {estimate['predicted_memory_mb']:.0f} MB at max. input size"]
+    if estimate.get("max_scale", 1) < 1:
+        parts[1] += " (extrapolated)"
+    warnings = [name for name, flag in (("likely TLE", "likely_tle"), ("likely MLE", "likely_mle")) if estimate.get(flag)]
+    return ", ".join(parts + warnings)
+
+
+def is_limit_warning(estimate: Optional[Dict[str, Any]]) -> bool:
+    """True if an estimate exceeded a limit on a generated input or predicts a TLE/MLE (shown as a warning)."""
+    return bool(estimate) and bool(estimate.get("exceeded") or estimate.get("likely_tle") or estimate.get("likely_mle"))
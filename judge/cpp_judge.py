@@ -0,0 +1,706 @@
+"""
+Local C++ pre-judge for LeetCode solutions.
+
+Before a generated solution is sent to LeetCode, it is compiled with g++ and
+run on the problem's example test cases. A harness is generated from the C++
+signature in the problem's code snippet and its metaData: it parses one test
+case per run from stdin (one line per parameter, as in exampleTestcases),
+calls the Solution method and prints the result in LeetCode's output format.
+The output is compared with the "Output:" values of the examples in the
+problem statement.
+
+Each test runs in its own process with CPU time, address space, stack and
+output size limits and a wall clock timeout. The verdict uses LeetCode's
+status codes (10 Accepted, 11 Wrong Answer, 12 MLE, 13 OLE, 14 TLE,
+15 Runtime Error, 20 Compile Error) and is returned in the same format as
+process_submission_result, marked with "local": True.
+
+The harness sets the limits itself from its command line and re-executes
+itself, so the stack limit also applies to the main thread. The parent never
+runs code between fork and exec (no preexec_fn), which is unsafe in the
+threaded Streamlit process. The local judge needs a POSIX system; on Windows
+judge_cpp returns None.
+
+A local Wrong Answer only compares against the example output; problems with
+several valid answers make it unreliable, so it does not block the submit
+(see BLOCKING_STATUS_CODES) and is passed on as "local_verdict".
+
+Solutions that pass the examples are then run on generated inputs of growing
+size (judge/complexity.py) to estimate their complexity and flag likely time
+and memory limit verdicts before LeetCode's hidden tests show them.
+
+Problems the harness cannot drive (design problems, custom node types,
+special judges) are skipped: judge_cpp returns None and the solution is
+submitted as before.
+
+Every example run is measured (wall time, CPU time and peak RSS of the child
+process). The measurements are stored in the verdict ("local_runs" and the
+totals "local_wall_ms", "local_cpu_ms", "local_memory_mb") and are copied to
+the LeetCode result of the same code, so solutions can be ranked by runtime
+without a remote submission.
+
+Harnesses are compiled by the compile service (judge/compile_service.py),
+which precompiles the prelude and caches binaries across runs.
+
+Settings (environment variables):
+    LOCAL_JUDGE_CXX: C++ compiler (default g++)
+    LOCAL_JUDGE_TIME_LIMIT: Wall clock limit per test in seconds (default 2)
+    LOCAL_JUDGE_MEMORY_MB: Address space limit per test in MiB (default 512)
+    LOCAL_JUDGE_MEASURE_REPEATS: Runs per example test; the fastest run is reported (default 1)
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from api.leetcode import fetch_full_problem
+from api.leetcode_submit import process_submission_result
+from judge.compile_service import CXX, PRELUDE_FILENAME, get_compile_service
+from judge.complexity import PROBE_ENABLED, probe_complexity
+from judge.sql_judge import SQL_JUDGE_LANGUAGES, judge_sql
+from utils.clean import normalize_code, parse_expected_outputs, parse_testcases
+
+TIME_LIMIT = float(os.environ.get("LOCAL_JUDGE_TIME_LIMIT", 2.0))
+MEMORY_LIMIT_MB = int(os.environ.get("LOCAL_JUDGE_MEMORY_MB", 512))
+MEASURE_REPEATS = int(os.environ.get("LOCAL_JUDGE_MEASURE_REPEATS", 1))
+OUTPUT_LIMIT_BYTES = 8 * 1024 * 1024
+
+# Prozessgruppen, wait4 und setrlimit/execv im Harness gibt es nur unter POSIX (nicht unter Windows)
+LOCAL_JUDGE_SUPPORTED = hasattr(os, "wait4") and hasattr(os, "killpg")
+
+# Felder des lokalen Urteils, die in das LeetCode-Ergebnis desselben Codes übernommen werden
+LOCAL_MEASUREMENT_FIELDS = ("local_runs", "local_wall_ms", "local_cpu_ms", "local_memory_mb", "complexity_estimate")
+
+# Lokale Urteile, bei denen die Lösung nicht bei LeetCode eingereicht wird. Wrong Answer (11) blockiert nicht:
+# Der Vergleich kennt nur die Beispielausgabe, Probleme mit mehreren gültigen Antworten (oder "any order"
+# auf verschachtelten Listen) würden sonst korrekte Lösungen zurückhalten
+BLOCKING_STATUS_CODES = {12, 13, 14, 15, 20}
+
+# Exit-Codes des Harness
+EXIT_EXCEPTION = 2
+EXIT_BAD_ALLOC = 3
+EXIT_BAD_INPUT = 4
+
+# Typbestandteile, die der Harness lesen und ausgeben kann
+_SUPPORTED_TYPE_WORDS = {
+    "void", "bool", "char", "short", "int", "long", "signed", "unsigned", "float", "double",
+    "size_t", "int32_t", "int64_t", "uint32_t", "uint64_t", "string", "vector", "ListNode", "TreeNode",
+}
+
+_NODE_DEFINITIONS = {
+    "ListNode": """struct ListNode {
+    int val;
+    ListNode *next;
+    ListNode() : val(0), next(nullptr) {}
+    ListNode(int x) : val(x), next(nullptr) {}
+    ListNode(int x, ListNode *next) : val(x), next(next) {}
+};""",
+    "TreeNode": """struct TreeNode {
+    int val;
+    TreeNode *left;
+    TreeNode *right;
+    TreeNode() : val(0), left(nullptr), right(nullptr) {}
+    TreeNode(int x) : val(x), left(nullptr), right(nullptr) {}
+    TreeNode(int x, TreeNode *left, TreeNode *right) : val(x), left(left), right(right) {}
+};""",
+}
+
+_NODE_HELPERS = {
+    "ListNode": """inline void judge_read(JudgeReader& r, ListNode*& head) {
+    vector<int> values;
+    judge_read(r, values);
+    ListNode dummy;
+    ListNode* tail = &dummy;
+    for (int v : values) tail = tail->next = new ListNode(v);
+    head = dummy.next;
+}
+
+inline void judge_write(ostream& o, ListNode* head) {
+    o << '[';
+    // Begrenzung schützt vor Endlosschleifen bei zyklischen Listen
+    for (size_t k = 0; head != nullptr && k < 1000000; head = head->next, ++k) {
+        if (k) o << ',';
+        o << head->val;
+    }
+    o << ']';
+}
+""",
+    "TreeNode": """inline void judge_read(JudgeReader& r, TreeNode*& root) {
+    vector<optional<int>> values = judge_read_nullable(r);
+    root = nullptr;
+    if (values.empty() || !values[0]) return;
+    root = new TreeNode(*values[0]);
+    queue<TreeNode*> pending;
+    pending.push(root);
+    for (size_t k = 1; k < values.size() && !pending.empty();) {
+        TreeNode* node = pending.front();
+        pending.pop();
+        if (k < values.size() && values[k]) pending.push(node->left = new TreeNode(*values[k]));
+        ++k;
+        if (k < values.size() && values[k]) pending.push(node->right = new TreeNode(*values[k]));
+        ++k;
+    }
+}
+
+inline void judge_write(ostream& o, TreeNode* root) {
+    vector<string> items;
+    queue<TreeNode*> pending;
+    pending.push(root);
+    while (!pending.empty() && items.size() < 1000000) {
+        TreeNode* node = pending.front();
+        pending.pop();
+        if (node == nullptr) {
+            items.push_back("null");
+            continue;
+        }
+        items.push_back(to_string(node->val));
+        pending.push(node->left);
+        pending.push(node->right);
+    }
+    while (!items.empty() && items.back() == "null") items.pop_back();
+    o << '[';
+    for (size_t k = 0; k < items.size(); ++k) o << (k ? "," : "") << items[k];
+    o << ']';
+}
+""",
+}
+
+
+class UnsupportedProblem(Exception):
+    """Raised if the harness cannot be generated for a problem."""
+
+
+class Signature(NamedTuple):
+    """The C++ signature of the Solution method of a problem."""
+    method: str
+    return_type: str
+    # (C++-Typ ohne const und &, Parametername)
+    params: List[Tuple[str, str]]
+    # Bei void-Methoden der Index des Parameters, der das Ergebnis enthält
+    output_index: Optional[int]
+
+
+class RunResult(NamedTuple):
+    """The outcome of running the harness on one test case."""
+    status: str  # "ok", "tle", "mle", "ole", "re" oder "bad_input"
+    stdout: str
+    stderr: str
+    wall_time: float
+    cpu_time: float
+    max_rss_kb: int
+
+
+def _load_metadata(details: Dict[str, Any]) -> Dict[str, Any]:
+    meta = details.get("metaData")
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta)
+        except ValueError:
+            meta = None
+    if not meta:
+        raise UnsupportedProblem("no metaData")
+    if meta.get("systemdesign") or meta.get("classname") or meta.get("manual"):
+        raise UnsupportedProblem("design or manually judged problem")
+    return meta
+
+
+def _split_params(text: str) -> List[str]:
+    """Split a parameter list at the commas outside of template brackets."""
+    params, depth, current = [], 0, ""
+    for char in text:
+        if char == "<":
+            depth += 1
+        elif char == ">":
+            depth -= 1
+        if char == "," and depth == 0:
+            params.append(current)
+            current = ""
+        else:
+            current += char
+    if current.strip():
+        params.append(current)
+    return [param.strip() for param in params]
+
+
+def _clean_type(cpp_type: str) -> str:
+    cpp_type = re.sub(r"\bconst\b", "", cpp_type).replace("&", "")
+    cpp_type = re.sub(r"\s+", " ", cpp_type).strip()
+    return re.sub(r"\s*([<>,*])\s*", r"\1", cpp_type)
+
+
+def _check_type(cpp_type: str):
+    unknown = set(re.findall(r"[A-Za-z_]\w*", cpp_type)) - _SUPPORTED_TYPE_WORDS
+    if unknown:
+        raise UnsupportedProblem(f"unsupported type {cpp_type}")
+
+
+def parse_signature(details: Dict[str, Any]) -> Signature:
+    """
+    Read the signature of the Solution method from the C++ code snippet of a problem.
+
+    Args:
+        details: Problem details with metaData and codeSnippets
+
+    Returns:
+        The signature
+
+    Raises:
+        UnsupportedProblem: If the problem cannot be judged locally
+    """
+    meta = _load_metadata(details)
+    method = meta.get("name")
+    snippet = next((s.get("code") for s in details.get("codeSnippets") or [] if s.get("langSlug") == "cpp"), None)
+    if not method or not snippet:
+        raise UnsupportedProblem("no C++ snippet")
+
+    # Ohne Kommentare (die Snippets enthalten die auskommentierten ListNode/TreeNode-Definitionen)
+    snippet = normalize_code(snippet, "cpp")
+    match = re.search(r"([^;{}:]*?)\b" + re.escape(method) + r"\s*\(([^)]*)\)", snippet)
+    if not match:
+        raise UnsupportedProblem(f"method {method} not found in the C++ snippet")
+
+    return_type = _clean_type(match.group(1))
+    _check_type(return_type)
+
+    params = []
+    for param in _split_params(match.group(2)):
+        name_match = re.search(r"([A-Za-z_]\w*)\s*$", param)
+        if not name_match:
+            raise UnsupportedProblem(f"cannot parse parameter {param!r}")
+        cpp_type = _clean_type(param[:name_match.start()])
+        _check_type(cpp_type)
+        params.append((cpp_type, name_match.group(1)))
+
+    output_index = None
+    if return_type == "void":
+        output_index = (meta.get("output") or {}).get("paramindex", 0)
+        if not 0 <= output_index < len(params):
+            raise UnsupportedProblem("void method without output parameter")
+
+    return Signature(method, return_type, params, output_index)
+
+
+def build_harness(code: str, signature: Signature) -> str:
+    """
+    Generate the C++ source that runs a solution on one test case read from stdin.
+
+    #line directives map compiler messages to the lines of the solution
+    ("solution.cpp") and of the generated glue code ("harness.cpp").
+    """
+    used_types = " ".join([signature.return_type] + [cpp_type for cpp_type, _ in signature.params])
+    node_types = [node for node in _NODE_DEFINITIONS if re.search(rf"\b{node}\b", used_types)]
+    normalized = normalize_code(code, "cpp")
+    definitions = [_NODE_DEFINITIONS[node] for node in node_types
+                   if not re.search(rf"\b(?:struct|class)\s+{node}\s*{{", normalized)]
+
+    declarations, parsing = [], []
+    for index, (cpp_type, _) in enumerate(signature.params):
+        declarations.append(f"    {cpp_type} judge_arg{index}{{}};")
+        parsing.append(f"        judge_arg{index} = judge_parse<{cpp_type}>(lines[{index}]);")
+    args = ", ".join(f"judge_arg{index}" for index in range(len(signature.params)))
+
+    if signature.output_index is None:
+        call = f"        auto judge_result = solution->{signature.method}({args});\n" \
+               f"        cout << judge_dump(judge_result) << '\\n';"
+    else:
+        call = f"        solution->{signature.method}({args});\n" \
+               f"        cout << judge_dump(judge_arg{signature.output_index}) << '\\n';"
+
+    parts = [f'#include "{PRELUDE_FILENAME}"']
+    if definitions:
+        parts += ['#line 1 "definitions.cpp"'] + definitions
+    parts += ['#line 1 "solution.cpp"', code, '#line 1 "harness.cpp"']
+    parts += ["#include <sys/resource.h>", "#include <unistd.h>"]
+    parts += [_NODE_HELPERS[node] for node in node_types]
+    parts.append(f"""// Setzt die Limits aus der Kommandozeile (CPU-Sekunden, Adressraum, Stack und Ausgabegröße in Bytes)
+// und startet das Programm ohne Argumente neu, damit das Stacklimit auch für den Hauptthread gilt
+static void judge_apply_limits(int argc, char** argv) {{
+    if (argc != 5) return;
+    auto limit = [](int which, unsigned long long soft, unsigned long long hard) {{
+        struct rlimit value;
+        value.rlim_cur = soft;
+        value.rlim_max = hard;
+        setrlimit(which, &value);
+    }};
+    unsigned long long cpu = stoull(argv[1]), memory = stoull(argv[2]);
+    unsigned long long stack = stoull(argv[3]), output = stoull(argv[4]);
+    limit(RLIMIT_CPU, cpu, cpu + 1);
+    limit(RLIMIT_AS, memory, memory);
+    limit(RLIMIT_STACK, stack, stack);
+    limit(RLIMIT_FSIZE, output, output);
+    limit(RLIMIT_CORE, 0, 0);
+    char* self[] = {{argv[0], nullptr}};
+    execv(argv[0], self);
+}}
+
+int main(int argc, char** argv) {{
+    judge_apply_limits(argc, argv);
+    ios::sync_with_stdio(false);
+    vector<string> lines;
+    for (string line; getline(cin, line);) lines.push_back(line);
+    if (lines.size() < {len(signature.params)}) return {EXIT_BAD_INPUT};
+
+{chr(10).join(declarations)}
+    try {{
+{chr(10).join(parsing)}
+    }} catch (const exception& e) {{
+        cerr << "invalid test input: " << e.what() << '\\n';
+        return {EXIT_BAD_INPUT};
+    }}
+
+    try {{
+        Solution* solution = new Solution();
+{call}
+    }} catch (const bad_alloc&) {{
+        return {EXIT_BAD_ALLOC};
+    }} catch (const exception& e) {{
+        cerr << "terminate called after throwing an instance of 'std::exception'\\n  what():  " << e.what() << '\\n';
+        return {EXIT_EXCEPTION};
+    }}
+    return 0;
+}}
+""")
+    return "\n".join(parts)
+
+
+def _compile_error_message(output: str) -> Optional[str]:
+    """
+    Return the first error of the solution in LeetCode's format ("Line 3: Char 5: error: ...").
+
+    Returns None if the errors are only in the generated harness code, which
+    means the harness does not fit the problem (not the solution's fault).
+    """
+    errors = re.findall(r"^([\w./-]+):(\d+):(\d+): (?:fatal )?error: (.*)$", output, re.MULTILINE)
+    for filename, line, column, message in errors:
+        if os.path.basename(filename) == "solution.cpp":
+            return f"Line {line}: Char {column}: error: {message}"
+    if "solution.cpp" not in output and any(os.path.basename(e[0]) in ("harness.cpp", "definitions.cpp")
+                                            for e in errors):
+        return None
+    first_error = next((line for line in output.splitlines() if "error" in line), output.strip())
+    return first_error[:500]
+
+
+def _limit_arguments(time_limit: float, memory_limit_mb: int) -> List[str]:
+    """Command line of the harness with its resource limits (applied by judge_apply_limits)."""
+    cpu_seconds = int(math.ceil(time_limit)) + 1
+    memory_bytes = memory_limit_mb * 1024 * 1024
+    # Tiefe Rekursion soll wie bei LeetCode funktionieren, aber im Speicherlimit bleiben
+    stack_bytes = min(256 * 1024 * 1024, memory_bytes // 2)
+    return [str(cpu_seconds), str(memory_bytes), str(stack_bytes), str(OUTPUT_LIMIT_BYTES)]
+
+
+# Vom Prelude beim Beenden ausgegebener Spitzenwert des residenten Speichers
+_PEAK_RSS_PATTERN = re.compile(r"\njudge-peak-rss-kb: (\d+)\n?$")
+
+
+def run_test(binary: str, input_text: str, time_limit: float = TIME_LIMIT,
+             memory_limit_mb: int = MEMORY_LIMIT_MB) -> RunResult:
+    """
+    Run a compiled harness on one test case in a resource-limited child process.
+
+    Args:
+        binary: Path of the harness binary
+        input_text: The test input (one line per parameter)
+        time_limit: Wall clock limit in seconds
+        memory_limit_mb: Address space limit in MiB
+
+    Returns:
+        The run result with the resource usage of the child
+    """
+    # Eigenes Arbeitsverzeichnis, die Binärdatei selbst liegt im gemeinsamen Compile-Cache
+    with tempfile.TemporaryDirectory(prefix="leetcode-judge-") as workdir, \
+            tempfile.TemporaryFile(dir=workdir) as stdin, tempfile.TemporaryFile(dir=workdir) as stdout, \
+            tempfile.TemporaryFile(dir=workdir) as stderr:
+        stdin.write(input_text.encode("utf-8"))
+        stdin.seek(0)
+
+        started = time.perf_counter()
+        # Absoluter Pfad: der Harness startet sich nach dem Setzen der Limits über argv[0] neu
+        process = subprocess.Popen([os.path.abspath(binary)] + _limit_arguments(time_limit, memory_limit_mb),
+                                   stdin=stdin, stdout=stdout, stderr=stderr, cwd=workdir,
+                                   env={"PATH": "/usr/bin:/bin"}, start_new_session=True)
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        timer = threading.Timer(time_limit, kill)
+        timer.start()
+        try:
+            # wait4 liefert neben dem Status die Ressourcennutzung des Kindprozesses
+            _, wait_status, usage = os.wait4(process.pid, 0)
+        except BaseException:
+            # Abbruch von außen (z.B. Job-Timeout der Judge-Farm): den Test nicht weiterlaufen lassen
+            kill()
+            os.wait4(process.pid, 0)
+            raise
+        finally:
+            timer.cancel()
+        wall_time = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(wait_status)
+
+        stdout.seek(0)
+        stderr.seek(0)
+        output = stdout.read(OUTPUT_LIMIT_BYTES + 1)
+        errors = stderr.read(64 * 1024).decode("utf-8", errors="replace")
+
+    cpu_time = usage.ru_utime + usage.ru_stime
+    max_rss_kb = usage.ru_maxrss
+    peak_rss = _PEAK_RSS_PATTERN.search(errors)
+    if peak_rss:
+        max_rss_kb = int(peak_rss.group(1))
+        errors = errors[:peak_rss.start()]
+    returncode = process.returncode
+    if timed_out.is_set() or returncode == -signal.SIGXCPU:
+        status = "tle"
+    elif returncode == -signal.SIGXFSZ or len(output) > OUTPUT_LIMIT_BYTES:
+        status = "ole"
+    elif returncode == EXIT_BAD_ALLOC:
+        status = "mle"
+    elif returncode == EXIT_BAD_INPUT:
+        status = "bad_input"
+    elif returncode != 0:
+        status = "re"
+        if returncode < 0 and not errors.strip():
+            errors = f"Process terminated by signal {signal.Signals(-returncode).name}"
+    else:
+        status = "ok"
+    return RunResult(status, output.decode("utf-8", errors="replace"), errors, wall_time, cpu_time, max_rss_kb)
+
+
+def _values_equal(actual: Any, expected: Any) -> bool:
+    if isinstance(actual, bool) or isinstance(expected, bool):
+        return actual is expected
+    if isinstance(actual, (int, float)) and isinstance(expected, (int, float)):
+        return math.isclose(actual, expected, rel_tol=1e-5, abs_tol=1e-5)
+    if isinstance(actual, list) and isinstance(expected, list):
+        return len(actual) == len(expected) and all(_values_equal(a, e) for a, e in zip(actual, expected))
+    return actual == expected
+
+
+def compare_outputs(actual: str, expected: str, any_order: bool = False) -> Optional[bool]:
+    """
+    Compare the output of the harness with the expected output of an example.
+
+    Args:
+        actual: Output of the harness
+        expected: The "Output:" value from the problem statement
+        any_order: The answer may be returned in any order (top-level list)
+
+    Returns:
+        True/False, or None if the expected output cannot be interpreted
+        (e.g. "2, nums = [1,2,_]" for in-place problems)
+    """
+    try:
+        actual_value = json.loads(actual)
+        expected_value = json.loads(expected)
+    except ValueError:
+        return True if re.sub(r"\s+", "", actual) == re.sub(r"\s+", "", expected) else None
+
+    if any_order and isinstance(actual_value, list) and isinstance(expected_value, list):
+        sort_key = lambda value: json.dumps(value, sort_keys=True)
+        actual_value, expected_value = sorted(actual_value, key=sort_key), sorted(expected_value, key=sort_key)
+    return _values_equal(actual_value, expected_value)
+
+
+def _verdict(status_code: int, total: int, passed: int, **fields) -> Dict[str, Any]:
+    """Build a result in the format of process_submission_result from a local verdict."""
+    status_messages = {
+        10: "Accepted", 11: "Wrong Answer", 12: "Memory Limit Exceeded", 13: "Output Limit Exceeded",
+        14: "Time Limit Exceeded", 15: "Runtime Error", 20: "Compile Error",
+    }
+    response_data = {
+        "status_code": status_code,
+        "status_msg": status_messages[status_code],
+        "lang": "cpp",
+        "run_success": status_code != 20,
+        "total_correct": passed,
+        "total_testcases": total,
+        **fields,
+    }
+    result = process_submission_result(response_data)
+    result["local"] = True
+    return result
+
+
+_RUN_STATUS_CODES = {"mle": 12, "ole": 13, "tle": 14, "re": 15}
+
+
+def _measure(binary: str, input_text: str, time_limit: float, memory_limit_mb: int, repeats: int) -> RunResult:
+    """Run a test repeats times and return the fastest run (peak RSS over all runs)."""
+    best = run_test(binary, input_text, time_limit, memory_limit_mb)
+    max_rss_kb = best.max_rss_kb
+    for _ in range(repeats - 1):
+        if best.status != "ok":
+            break
+        run = run_test(binary, input_text, time_limit, memory_limit_mb)
+        max_rss_kb = max(max_rss_kb, run.max_rss_kb)
+        if run.status != "ok":
+            # Schwankende Ergebnisse (z.B. TLE nur in einem Lauf) werden nicht weggemittelt
+            best = run
+            break
+        if run.cpu_time < best.cpu_time:
+            best = run
+    return best._replace(max_rss_kb=max_rss_kb)
+
+
+def _with_measurements(result: Dict[str, Any], runs: List[RunResult]) -> Dict[str, Any]:
+    """Add the measurements of the example runs to a local verdict."""
+    result["local_runs"] = [
+        {"test": index + 1, "status": run.status, "wall_ms": round(run.wall_time * 1000, 2),
+         "cpu_ms": round(run.cpu_time * 1000, 2), "max_rss_mb": round(run.max_rss_kb / 1024, 2)}
+        for index, run in enumerate(runs)
+    ]
+    result["local_wall_ms"] = round(sum(run.wall_time for run in runs) * 1000, 2) if runs else None
+    result["local_cpu_ms"] = round(sum(run.cpu_time for run in runs) * 1000, 2) if runs else None
+    result["local_memory_mb"] = round(max(run.max_rss_kb for run in runs) / 1024, 2) if runs else None
+    return result
+
+
+def with_local_measurements(result: Dict[str, Any], local_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Add the local measurements of the pre-judge to a LeetCode result.
+
+    Args:
+        result: The LeetCode submission result
+        local_result: The local verdict of the same code (or None)
+
+    Returns:
+        A copy of result with the fields in LOCAL_MEASUREMENT_FIELDS and the local verdict as
+        "local_verdict", or result itself if there are none
+    """
+    measurements = {field: (local_result or {}).get(field) for field in LOCAL_MEASUREMENT_FIELDS}
+    measurements = {field: value for field, value in measurements.items() if value is not None}
+    if (local_result or {}).get("status_description"):
+        # Z.B. ein lokales Wrong Answer, das nur als Hinweis dient
+        measurements["local_verdict"] = local_result["status_description"]
+    if not measurements:
+        return result
+    return dict(result, **measurements)
+
+
+def judge_cpp(code: str, details: Dict[str, Any], time_limit: float = TIME_LIMIT,
+              memory_limit_mb: int = MEMORY_LIMIT_MB, probe: bool = PROBE_ENABLED,
+              repeats: int = MEASURE_REPEATS) -> Optional[Dict[str, Any]]:
+    """
+    Compile a C++ solution and run it on the example test cases of a problem.
+
+    Args:
+        code: The solution code
+        details: Problem details (content, exampleTestcases, metaData, codeSnippets)
+        time_limit: Wall clock limit per test in seconds
+        memory_limit_mb: Address space limit per test in MiB
+        probe: Estimate the complexity on generated inputs once the examples pass
+        repeats: Runs per example test; the fastest run is reported
+
+    Returns:
+        The local verdict in the format of process_submission_result, with the
+        measurements of the example runs (and "complexity_estimate" if the probe
+        ran), or None if the problem cannot be judged locally
+    """
+    if not LOCAL_JUDGE_SUPPORTED:
+        logging.warning("Local judge disabled: running test processes requires a POSIX system")
+        return None
+    if shutil.which(CXX) is None:
+        logging.warning(f"Local judge disabled: compiler {CXX} not found")
+        return None
+
+    try:
+        signature = parse_signature(details)
+    except UnsupportedProblem as e:
+        logging.info(f"Local judge skipped: {str(e)}")
+        return None
+
+    testcases = parse_testcases(details.get("exampleTestcases", ""), len(signature.params))
+    if not testcases:
+        logging.info("Local judge skipped: no example test cases")
+        return None
+    content = details.get("content") or ""
+    expected_outputs = parse_expected_outputs(content)
+    if len(expected_outputs) != len(testcases):
+        # Ohne eindeutige Zuordnung wird nur auf Compile-, Laufzeit- und Limitfehler geprüft
+        expected_outputs = [None] * len(testcases)
+    any_order = "any order" in content.lower()
+
+    total = len(testcases)
+    binary, compiler_output = get_compile_service().compile(build_harness(code, signature))
+    if binary is None:
+        message = _compile_error_message(compiler_output)
+        if message is None:
+            logging.warning(f"Local judge skipped: harness does not compile\n{compiler_output[:2000]}")
+            return None
+        return _verdict(20, total, 0, compile_error=message, full_compile_error=compiler_output[:10000])
+
+    runs: List[RunResult] = []
+    for passed, (inputs, expected) in enumerate(zip(testcases, expected_outputs)):
+        last_testcase = "\n".join(inputs)
+        run = _measure(binary, last_testcase + "\n", time_limit, memory_limit_mb, repeats)
+        if run.status == "bad_input":
+            logging.warning(f"Local judge skipped: harness cannot read the test input\n{run.stderr}")
+            return None
+        runs.append(run)
+        if run.status != "ok":
+            return _with_measurements(
+                _verdict(_RUN_STATUS_CODES[run.status], total, passed, last_testcase=last_testcase,
+                         runtime_error=run.stderr.strip()[:2000], full_runtime_error=run.stderr[:10000]), runs)
+
+        code_output = run.stdout.strip()
+        if expected is not None and compare_outputs(code_output, expected, any_order) is False:
+            return _with_measurements(
+                _verdict(11, total, passed, last_testcase=last_testcase, expected_output=expected,
+                         code_output=code_output), runs)
+
+    if not probe:
+        return _with_measurements(_verdict(10, total, total), runs)
+
+    estimate = probe_complexity(lambda input_text: run_test(binary, input_text, time_limit, memory_limit_mb),
+                                signature.params, content, time_limit, memory_limit_mb)
+    # Ein überschrittenes Limit auf erzeugten Eingaben ist nur eine Warnung (siehe judge/complexity.py)
+    result = _verdict(10, total, total)
+    result["complexity_estimate"] = estimate
+    return _with_measurements(result, runs)
+
+
+def prejudge(problem_slug: str, code: str, language: str = "cpp") -> Optional[Dict[str, Any]]:
+    """
+    Judge a solution locally before it is submitted.
+
+    Args:
+        problem_slug: The LeetCode problem slug
+        code: The solution code
+        language: The programming language ("cpp" and "mysql" are judged locally)
+
+    Returns:
+        The local verdict, or None if the solution cannot be judged locally
+    """
+    if language != "cpp" and language not in SQL_JUDGE_LANGUAGES:
+        return None
+    details = fetch_full_problem(problem_slug)
+    if not details or not details.get("content"):
+        return None
+    if language in SQL_JUDGE_LANGUAGES:
+        return judge_sql(code, details)
+    try:
+        return judge_cpp(code, details)
+    except OSError as e:
+        logging.error(f"Local judge failed: {str(e)}")
+        return None
+
+
+def blocks_submission(result: Optional[Dict[str, Any]]) -> bool:
+    """True if a local verdict means the solution should not be submitted to LeetCode."""
+    return result is not None and result.get("status_code") in BLOCKING_STATUS_CODES
@@ -0,0 +1,217 @@
+"""
+Parallel local judging of many C++ solutions.
+
+For best-of-N and multi-model runs, hundreds of generated solutions have to be
+checked locally before any of them is submitted. The JudgeFarm spreads these
+jobs over a process pool with one worker per core. Each job compiles the
+solution (through the shared compile cache, see judge/compile_service.py) and
+runs the example tests, with the per-test time and memory limits of judge_cpp
+and an overall timeout per job. The workers are started with the "spawn"
+method: forking the threaded Streamlit process could copy locks held by other
+threads into the children. Identical solutions of the same problem
+(up to comments and whitespace) are judged once. SQL solutions of database
+problems take milliseconds in SQLite (see judge/sql_judge.py) and are judged
+directly in the calling process.
+
+Example:
+    for verdict in judge_batch([("two-sum", code_a), ("two-sum", code_b)]):
+        print(verdict.slug, verdict.result and verdict.result["status_description"])
+
+Settings (environment variables):
+    LOCAL_JUDGE_WORKERS: Number of worker processes (default: number of CPU cores)
+    LOCAL_JUDGE_JOB_TIMEOUT: Maximum time for compiling and testing one solution in seconds (default 120)
+"""
+
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from api.leetcode import fetch_full_problems
+from api.verdict_cache import code_hash
+from judge.compile_service import CXX, get_compile_service
+from judge.cpp_judge import LOCAL_JUDGE_SUPPORTED, MEMORY_LIMIT_MB, TIME_LIMIT, judge_cpp
+from judge.sql_judge import SQL_JUDGE_LANGUAGES, judge_sql
+
+WORKERS = int(os.environ.get("LOCAL_JUDGE_WORKERS", os.cpu_count() or 1))
+JOB_TIMEOUT = float(os.environ.get("LOCAL_JUDGE_JOB_TIMEOUT", 120))
+
+
+class JudgeTimeout(Exception):
+    """Raised in a worker when a job exceeds its overall timeout."""
+
+
+class FarmVerdict(NamedTuple):
+    """The local verdict of one job of a batch."""
+    index: int
+    slug: str
+    code: str
+    result: Optional[Dict[str, Any]]
+
+
+def _raise_timeout(signum, frame):
+    raise JudgeTimeout()
+
+
+def _judge_job(code: str, details: Dict[str, Any], time_limit: float, memory_limit_mb: int,
+               job_timeout: float) -> Optional[Dict[str, Any]]:
+    """Run judge_cpp in a worker process, aborting it after job_timeout seconds."""
+    # Ohne SIGALRM (Windows) begrenzen nur die Limits pro Test die Laufzeit
+    alarm = hasattr(signal, "SIGALRM")
+    if alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, job_timeout)
+    try:
+        return judge_cpp(code, details, time_limit, memory_limit_mb)
+    except JudgeTimeout:
+        return {"success": False, "local": True, "error": f"Local judge timed out after {job_timeout} seconds"}
+    except OSError as e:
+        logging.error(f"Local judge failed: {str(e)}")
+        return None
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+class JudgeFarm:
+    """
+    Judges C++ and SQL solutions locally in a pool of worker processes.
+
+    Args:
+        max_workers: Number of worker processes
+        time_limit: Wall clock limit per test in seconds
+        memory_limit_mb: Address space limit per test in MiB
+        job_timeout: Maximum time for compiling and testing one solution in seconds
+    """
+
+    def __init__(self, max_workers: int = WORKERS, time_limit: float = TIME_LIMIT,
+                 memory_limit_mb: int = MEMORY_LIMIT_MB, job_timeout: float = JOB_TIMEOUT):
+        self.max_workers = max(1, max_workers)
+        self.time_limit = time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.job_timeout = job_timeout
+        self._lock = threading.Lock()
+        # Laufende und fertige Jobs nach (Slug, Hash des normalisierten Codes)
+        self._jobs: Dict[Tuple[str, str], Future] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Den vorkompilierten Header einmal hier bauen statt gleichzeitig in jedem Worker
+                get_compile_service().precompiled_header_dir()
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def submit(self, problem_slug: str, code: str, details: Optional[Dict[str, Any]] = None,
+               language: str = "cpp") -> Future:
+        """
+        Queue a solution for local judging.
+
+        Args:
+            problem_slug: The LeetCode problem slug
+            code: The solution code
+            details: Problem details (fetched if not given)
+            language: The programming language ("cpp" and "mysql" are judged locally)
+
+        Returns:
+            A Future whose result is the local verdict, or None if the solution cannot be judged locally
+        """
+        sql = language in SQL_JUDGE_LANGUAGES
+        if not sql and (language != "cpp" or not LOCAL_JUDGE_SUPPORTED or shutil.which(CXX) is None):
+            future: Future = Future()
+            future.set_result(None)
+            return future
+
+        key = (problem_slug, code_hash(code, language))
+        with self._lock:
+            if key in self._jobs:
+                return self._jobs[key]
+
+        if details is None:
+            details = fetch_full_problems([problem_slug]).get(problem_slug)
+        if not details or not details.get("content"):
+            future = Future()
+            future.set_result(None)
+        elif sql:
+            # Ohne Compiler und Prozessgrenze: SQLite braucht nur Millisekunden pro Beispiel
+            future = Future()
+            try:
+                future.set_result(judge_sql(code, details))
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = self._get_pool().submit(_judge_job, code, details, self.time_limit, self.memory_limit_mb,
+                                             self.job_timeout)
+        with self._lock:
+            return self._jobs.setdefault(key, future)
+
+    def as_completed(self, futures: Iterable[Future], timeout: Optional[float] = None) -> Iterator[Future]:
+        """Yield the futures as their jobs finish (see concurrent.futures.as_completed)."""
+        return as_completed(futures, timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop the worker processes.
+
+        Args:
+            wait: Block until all queued jobs are finished
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+    def __enter__(self) -> "JudgeFarm":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown(wait=True)
+
+
+def judge_batch(jobs: Iterable[Tuple[str, str]], details: Optional[Dict[str, Dict[str, Any]]] = None,
+                max_workers: int = WORKERS, time_limit: float = TIME_LIMIT,
+                memory_limit_mb: int = MEMORY_LIMIT_MB, job_timeout: float = JOB_TIMEOUT) -> Iterator[FarmVerdict]:
+    """
+    Judge many C++ solutions locally and yield the verdicts as they are ready.
+
+    Args:
+        jobs: (problem slug, code) pairs; a slug may appear several times
+        details: Problem details by slug (missing ones are fetched in one batch)
+        max_workers: Number of worker processes
+        time_limit: Wall clock limit per test in seconds
+        memory_limit_mb: Address space limit per test in MiB
+        job_timeout: Maximum time for compiling and testing one solution in seconds
+
+    Yields:
+        One FarmVerdict per job, in completion order; index is the position of the job in jobs
+    """
+    jobs = list(jobs)
+    details = dict(details or {})
+    missing = [slug for slug, _ in jobs if slug not in details]
+    if missing:
+        details.update(fetch_full_problems(missing))
+
+    with JudgeFarm(max_workers, time_limit, memory_limit_mb, job_timeout) as farm:
+        # Gleiche Lösungen teilen sich einen Future, daher mehrere Jobs pro Future
+        waiting: Dict[Future, List[int]] = {}
+        for index, (slug, code) in enumerate(jobs):
+            future = farm.submit(slug, code, details.get(slug) or {})
+            waiting.setdefault(future, []).append(index)
+
+        for future in as_completed(waiting):
+            try:
+                result = future.result()
+            except Exception as e:
+                # z.B. ein abgestürzter Worker-Prozess
+                logging.error(f"Local judge failed: {str(e)}")
+                result = None
+            for index in waiting[future]:
+                slug, code = jobs[index]
+                yield FarmVerdict(index, slug, code, result)
@@ -0,0 +1,200 @@
+// Prelude of the harness generated by judge/cpp_judge.py.
+//
+// Included before the solution, like LeetCode's own judge: all standard headers,
+// "using namespace std" and readers/writers for the LeetCode value format
+// ([1,2,3], "abc", true, 2.50000, ...). Readers and writers for ListNode and
+// TreeNode are generated after the solution, because the solution may define
+// these structs itself.
+
+#include <bits/stdc++.h>
+using namespace std;
+
+// Meldet beim Beenden den Spitzenwert des residenten Speichers (VmHWM) auf stderr. ru_maxrss des
+// Kindprozesses enthielte auch den Speicher des Python-Prozesses, aus dem er vor exec geforkt wurde.
+struct JudgePeakRssReporter {
+    ~JudgePeakRssReporter() {
+        FILE* status = fopen("/proc/self/status", "r");
+        if (status == nullptr) return;
+        char line[256];
+        long kb;
+        while (fgets(line, sizeof line, status) != nullptr) {
+            if (sscanf(line, "VmHWM: %ld kB", &kb) == 1) {
+                fprintf(stderr, "\njudge-peak-rss-kb: %ld\n", kb);
+                break;
+            }
+        }
+        fclose(status);
+    }
+};
+static JudgePeakRssReporter judge_peak_rss_reporter;
+
+struct JudgeReader {
+    const string& s;
+    size_t i = 0;
+
+    explicit JudgeReader(const string& text) : s(text) {}
+
+    void skip_ws() {
+        while (i < s.size() && isspace(static_cast<unsigned char>(s[i]))) ++i;
+    }
+
+    bool consume(char c) {
+        skip_ws();
+        if (i < s.size() && s[i] == c) {
+            ++i;
+            return true;
+        }
+        return false;
+    }
+
+    void expect(char c) {
+        if (!consume(c)) throw invalid_argument(string("judge input: expected '") + c + "' at offset " + to_string(i));
+    }
+
+    bool null() {
+        skip_ws();
+        if (s.compare(i, 4, "null") == 0) {
+            i += 4;
+            return true;
+        }
+        return false;
+    }
+
+    string token() {
+        skip_ws();
+        size_t start = i;
+        while (i < s.size() && !isspace(static_cast<unsigned char>(s[i])) && s[i] != ',' && s[i] != ']') ++i;
+        if (start == i) throw invalid_argument("judge input: empty value at offset " + to_string(i));
+        return s.substr(start, i - start);
+    }
+};
+
+template <class T>
+typename enable_if<is_integral<T>::value && !is_same<T, bool>::value && !is_same<T, char>::value>::type
+judge_read(JudgeReader& r, T& v) {
+    string t = r.token();
+    if (is_signed<T>::value) v = static_cast<T>(stoll(t));
+    else v = static_cast<T>(stoull(t));
+}
+
+template <class T>
+typename enable_if<is_floating_point<T>::value>::type judge_read(JudgeReader& r, T& v) {
+    v = static_cast<T>(stod(r.token()));
+}
+
+inline void judge_read(JudgeReader& r, bool& v) {
+    v = r.token() == "true";
+}
+
+inline void judge_read(JudgeReader& r, string& v) {
+    r.expect('"');
+    v.clear();
+    while (r.i < r.s.size() && r.s[r.i] != '"') {
+        char c = r.s[r.i++];
+        if (c == '\\' && r.i < r.s.size()) {
+            char e = r.s[r.i++];
+            switch (e) {
+                case 'n': v += '\n'; break;
+                case 't': v += '\t'; break;
+                case 'r': v += '\r'; break;
+                case 'u': v += static_cast<char>(stoi(r.s.substr(r.i, 4), nullptr, 16)); r.i += 4; break;
+                default: v += e;
+            }
+        } else {
+            v += c;
+        }
+    }
+    r.expect('"');
+}
+
+inline void judge_read(JudgeReader& r, char& v) {
+    string t;
+    judge_read(r, t);
+    v = t.empty() ? '\0' : t[0];
+}
+
+template <class T>
+void judge_read(JudgeReader& r, vector<T>& v) {
+    v.clear();
+    r.expect('[');
+    if (r.consume(']')) return;
+    do {
+        T x{};
+        judge_read(r, x);
+        v.push_back(std::move(x));
+    } while (r.consume(','));
+    r.expect(']');
+}
+
+// Werteliste mit null-Einträgen (Level-Order-Darstellung von Bäumen)
+inline vector<optional<int>> judge_read_nullable(JudgeReader& r) {
+    vector<optional<int>> values;
+    r.expect('[');
+    if (r.consume(']')) return values;
+    do {
+        if (r.null()) {
+            values.push_back(nullopt);
+        } else {
+            int x;
+            judge_read(r, x);
+            values.push_back(x);
+        }
+    } while (r.consume(','));
+    r.expect(']');
+    return values;
+}
+
+template <class T>
+typename enable_if<is_integral<T>::value && !is_same<T, bool>::value && !is_same<T, char>::value>::type
+judge_write(ostream& o, T v) {
+    o << v;
+}
+
+template <class T>
+typename enable_if<is_floating_point<T>::value>::type judge_write(ostream& o, T v) {
+    o << fixed << setprecision(5) << v;
+}
+
+inline void judge_write(ostream& o, bool v) {
+    o << (v ? "true" : "false");
+}
+
+inline void judge_write(ostream& o, const string& v) {
+    o << '"';
+    for (char c : v) {
+        if (c == '"' || c == '\\') o << '\\' << c;
+        else if (c == '\n') o << "\\n";
+        else o << c;
+    }
+    o << '"';
+}
+
+inline void judge_write(ostream& o, char v) {
+    judge_write(o, string(1, v));
+}
+
+// Auch für vector<bool>: dessen const_reference ist bool
+template <class T>
+void judge_write(ostream& o, const vector<T>& v) {
+    o << '[';
+    for (size_t k = 0; k < v.size(); ++k) {
+        if (k) o << ',';
+        judge_write(o, static_cast<const T&>(v[k]));
+    }
+    o << ']';
+}
+
+template <class T>
+T judge_parse(const string& line) {
+    JudgeReader r(line);
+    T v{};
+    judge_read(r, v);
+    return v;
+}
+
+template <class T>
+string judge_dump(const T& v) {
+    ostringstream o;
+    judge_write(o, v);
+    return o.str();
+}
@@ -0,0 +1,397 @@
+"""
+Local SQL judge for LeetCode database problems.
+
+Database problems cannot be judged by the C++ harness, and submitting a
+generated query costs a rate-limited submit like any other solution. The SQL
+judge runs the query locally instead: for every example it creates the
+problem's tables in an in-memory SQLite database (CREATE statements from the
+"mysql" entry of the problem's metaData, column types inferred from the data
+if they are missing), inserts the example rows from exampleTestcases, runs
+the query and compares the result with the "Output:" table of the example in
+the problem statement. The result is compared as a multiset of rows unless
+the statement asks for a specific order.
+
+SQLite is not MySQL. Common MySQL functions (IF, CONCAT, DATEDIFF, YEAR,
+DATE_FORMAT, LEAST, ...) are registered as SQLite functions, "/" is rewritten
+to real division (SQLite divides integers as integers) and text columns
+compare case-insensitively like MySQL's default collation. Queries that use
+other MySQL-only syntax fail with an SQLite syntax error; such failures are
+not the solution's fault, so judge_sql returns None and the query is
+submitted as before. Unknown tables or columns are reported as a Runtime
+Error, like LeetCode does. Other dialect differences remain (e.g. the number
+of decimals of an unrounded division), so a local Wrong Answer is only
+advisory and does not block the submit (see judge.cpp_judge.BLOCKING_STATUS_CODES).
+
+Settings (environment variables):
+    LOCAL_JUDGE_SQL_TIME_LIMIT: Time limit per example in seconds (default 2)
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from api.leetcode_submit import process_submission_result
+from utils.clean import parse_expected_tables
+
+SQL_TIME_LIMIT = float(os.environ.get("LOCAL_JUDGE_SQL_TIME_LIMIT", 2.0))
+
+# Sprachen, deren Lösungen lokal mit SQLite geprüft werden
+SQL_JUDGE_LANGUAGES = {"mysql"}
+
+# Anzahl der SQLite-VM-Schritte zwischen zwei Prüfungen des Zeitlimits
+_PROGRESS_STEPS = 10000
+
+
+def is_sql_problem(details: Dict[str, Any]) -> bool:
+    """True if the problem details belong to a database problem."""
+    try:
+        meta = json.loads(details.get("metaData") or "{}")
+    except (TypeError, ValueError):
+        meta = {}
+    if isinstance(meta, dict) and meta.get("database"):
+        return True
+    languages = {snippet.get("langSlug") for snippet in details.get("codeSnippets") or []}
+    return "mysql" in languages and "cpp" not in languages
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    for pattern in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(text[:19] if " " in text else text[:10], pattern).date()
+        except ValueError:
+            continue
+    return None
+
+
+_DATE_FORMAT_CODES = {"%Y": "%Y", "%y": "%y", "%m": "%m", "%c": "%-m", "%d": "%d", "%e": "%-d", "%M": "%B",
+                      "%b": "%b", "%W": "%A", "%a": "%a", "%H": "%H", "%i": "%M", "%s": "%S", "%%": "%%"}
+
+
+def _date_format(value: Any, mysql_format: Any) -> Optional[str]:
+    day = _parse_date(value)
+    if day is None or mysql_format is None:
+        return None
+    python_format = re.sub(r"%.", lambda m: _DATE_FORMAT_CODES.get(m.group(0), m.group(0)), str(mysql_format))
+    return day.strftime(python_format)
+
+
+def _date_part(part: str):
+    def extract(value: Any) -> Optional[int]:
+        day = _parse_date(value)
+        return getattr(day, part) if day is not None else None
+    return extract
+
+
+def _datediff(first: Any, second: Any) -> Optional[int]:
+    first, second = _parse_date(first), _parse_date(second)
+    if first is None or second is None:
+        return None
+    return (first - second).days
+
+
+def _concat(*values: Any) -> Optional[str]:
+    # MySQL: CONCAT mit einem NULL-Argument ergibt NULL
+    if any(value is None for value in values):
+        return None
+    return "".join(str(value) for value in values)
+
+
+def _concat_ws(separator: Any, *values: Any) -> Optional[str]:
+    if separator is None:
+        return None
+    return str(separator).join(str(value) for value in values if value is not None)
+
+
+def _extreme(pick):
+    def compare(*values: Any) -> Any:
+        return None if any(value is None for value in values) else pick(values)
+    return compare
+
+
+def _numeric(function):
+    def apply(*values: Any) -> Any:
+        return None if any(value is None for value in values) else function(*values)
+    return apply
+
+
+# MySQL-Funktionen, die SQLite nicht (oder mit anderer Bedeutung) kennt: Name -> (Argumentanzahl, Funktion)
+_MYSQL_FUNCTIONS = {
+    "IF": (3, lambda condition, then, otherwise: then if condition else otherwise),
+    "CONCAT": (-1, _concat),
+    "CONCAT_WS": (-1, _concat_ws),
+    "DATEDIFF": (2, _datediff),
+    "YEAR": (1, _date_part("year")),
+    "MONTH": (1, _date_part("month")),
+    "DAY": (1, _date_part("day")),
+    "DAYOFMONTH": (1, _date_part("day")),
+    "DATE_FORMAT": (2, _date_format),
+    "LEAST": (-1, _extreme(min)),
+    "GREATEST": (-1, _extreme(max)),
+    "FLOOR": (1, _numeric(math.floor)),
+    "CEIL": (1, _numeric(math.ceil)),
+    "CEILING": (1, _numeric(math.ceil)),
+    "POW": (2, _numeric(math.pow)),
+    "POWER": (2, _numeric(math.pow)),
+    "SQRT": (1, _numeric(lambda x: math.sqrt(x) if x >= 0 else None)),
+    "MOD": (2, _numeric(lambda a, b: a % b if b else None)),
+    "LEFT": (2, lambda text, n: None if text is None or n is None else str(text)[:max(0, int(n))]),
+    "RIGHT": (2, lambda text, n: None if text is None or n is None else str(text)[len(str(text)) - max(0, int(n)):]),
+    "CHAR_LENGTH": (1, lambda text: None if text is None else len(str(text))),
+}
+
+
+def _sqlite_create_statement(statement: str) -> Optional[str]:
+    """Translate a MySQL CREATE TABLE statement from the metaData into SQLite (None if it is none)."""
+    if not re.match(r"\s*create\s+table", statement, re.I):
+        return None
+    # Tabellenoptionen nach der letzten Klammer (ENGINE, CHARSET, ...) kennt SQLite nicht
+    statement = statement[:statement.rfind(")") + 1]
+    statement = re.sub(r"\benum\s*\([^)]*\)", "TEXT", statement, flags=re.I)
+    statement = re.sub(r"\bauto_increment\b", "", statement, flags=re.I)
+    # MySQL vergleicht Text standardmäßig ohne Groß-/Kleinschreibung
+    statement = re.sub(r"([(,]\s*[`\"]?\w+[`\"]?\s+)((?:var)?char|text)\b(\s*\(\s*\d+\s*\))?",
+                       r"\1\2\3 COLLATE NOCASE", statement, flags=re.I)
+    return statement
+
+
+def _column_type(values: Sequence[Any]) -> str:
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+        return "INTEGER"
+    if present and all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+        return "REAL"
+    return "TEXT COLLATE NOCASE"
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _parse_examples(example_string: str) -> List[Dict[str, Any]]:
+    """Parse the exampleTestcases of a database problem (one JSON object with headers and rows per example)."""
+    examples = []
+    for line in (example_string or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            example = json.loads(line)
+        except ValueError:
+            return []
+        if not isinstance(example, dict) or "headers" not in example or "rows" not in example:
+            return []
+        examples.append(example)
+    return examples
+
+
+def _load_example(conn: sqlite3.Connection, create_statements: List[str], example: Dict[str, Any]):
+    """Create the tables of a problem and insert the rows of one example."""
+    created = set()
+    for statement in create_statements:
+        try:
+            conn.execute(statement)
+        except sqlite3.Error as e:
+            logging.info(f"SQL judge: could not translate schema statement ({str(e)}): {statement}")
+            continue
+        match = re.search(r"table\s+(?:if\s+not\s+exists\s+)?[`\"]?(\w+)", statement, re.I)
+        if match:
+            created.add(match.group(1).lower())
+
+    for table, columns in example["headers"].items():
+        rows = example["rows"].get(table, [])
+        if table.lower() not in created:
+            definitions = ", ".join(f"{_quote(column)} {_column_type([row[i] for row in rows if i < len(row)])}"
+                                    for i, column in enumerate(columns))
+            conn.execute(f"CREATE TABLE {_quote(table)} ({definitions})")
+        placeholders = ", ".join("?" for _ in columns)
+        column_list = ", ".join(_quote(column) for column in columns)
+        conn.executemany(f"INSERT INTO {_quote(table)} ({column_list}) VALUES ({placeholders})", rows)
+
+
+# Literale, Bezeichner und Kommentare, in denen "/" kein Operator ist
+_SQL_LITERAL_PATTERN = re.compile(r"'(?:''|\\.|[^'\\])*'|\"(?:\"\"|\\.|[^\"\\])*\"|`[^`]*`|/\*.*?\*/|--[^\n]*|#[^\n]*",
+                                  re.S)
+
+
+def _real_division(query: str) -> str:
+    """
+    Rewrite "/" so that SQLite divides like MySQL, which never truncates to an integer.
+
+    "*", "/" and "%" share one precedence level and associate to the left, so
+    multiplying the left operand by 1.0 right before the operator changes
+    nothing but the type of the division.
+
+    >>> _real_division("SELECT ROUND(SUM(a = b) / COUNT(*) * 100, 2) FROM t WHERE c <> '1/2'")
+    "SELECT ROUND(SUM(a = b) * 1.0 / COUNT(*) * 100, 2) FROM t WHERE c <> '1/2'"
+    """
+    parts, position = [], 0
+    for match in _SQL_LITERAL_PATTERN.finditer(query):
+        parts.append(query[position:match.start()].replace("/", "* 1.0 /"))
+        parts.append(match.group(0))
+        position = match.end()
+    parts.append(query[position:].replace("/", "* 1.0 /"))
+    return "".join(parts)
+
+
+def _split_statements(query: str) -> List[str]:
+    """Split a query into its statements (semicolons inside strings do not count)."""
+    statements, current = [], ""
+    for part in query.split(";"):
+        current += part + ";"
+        if sqlite3.complete_statement(current):
+            if current.strip(" \t\r\n;"):
+                statements.append(current.strip().rstrip(";").strip())
+            current = ""
+    if current.strip(" \t\r\n;"):
+        statements.append(current.strip().rstrip(";").strip())
+    return statements
+
+
+def _run_query(conn: sqlite3.Connection, query: str) -> Tuple[List[str], List[tuple]]:
+    """Run a query and return (column names, rows) of its result or of the table it modified."""
+    statements = _split_statements(_real_division(query))
+    if not statements:
+        raise sqlite3.OperationalError("empty query")
+
+    cursor = None
+    for statement in statements:
+        cursor = conn.execute(statement)
+    if cursor.description is not None:
+        return [column[0] for column in cursor.description], cursor.fetchall()
+
+    # DELETE/UPDATE-Aufgaben: verglichen wird der Inhalt der geänderten Tabelle
+    match = re.search(r"^\s*(?:delete\s+from|update)\s+[`\"]?(\w+)", statements[-1], re.I)
+    if not match:
+        raise sqlite3.OperationalError("query returns no result")
+    cursor = conn.execute(f"SELECT * FROM {_quote(match.group(1))}")
+    return [column[0] for column in cursor.description], cursor.fetchall()
+
+
+def _cell_key(value: Any) -> str:
+    """Canonical form of a cell for comparing actual and expected values."""
+    if value is None:
+        return "null"
+    text = str(value).strip()
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    if math.isfinite(number):
+        # Zahlen unabhängig von ihrer Darstellung vergleichen ("2.50" und 2.5, "3" und 3.0)
+        return repr(round(number, 5) + 0.0)
+    return text
+
+
+def _typed(value: Optional[str]) -> Any:
+    """Turn a cell of an expected output table back into a number where it is one."""
+    if value is None:
+        return None
+    for convert in (int, float):
+        try:
+            return convert(value)
+        except ValueError:
+            continue
+    return value
+
+
+def _table_json(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> str:
+    """Format a result table like LeetCode does in its Wrong Answer details."""
+    return json.dumps({"headers": list(columns), "values": [list(row) for row in rows]}, default=str)
+
+
+def _verdict(status_code: int, total: int, passed: int, **fields) -> Dict[str, Any]:
+    """Build a result in the format of process_submission_result from a local SQL verdict."""
+    status_messages = {10: "Accepted", 11: "Wrong Answer", 14: "Time Limit Exceeded", 15: "Runtime Error"}
+    result = process_submission_result({
+        "status_code": status_code,
+        "status_msg": status_messages[status_code],
+        "lang": "mysql",
+        "run_success": True,
+        "total_correct": passed,
+        "total_testcases": total,
+        **fields,
+    })
+    result["local"] = True
+    return result
+
+
+def judge_sql(query: str, details: Dict[str, Any], time_limit: float = SQL_TIME_LIMIT) -> Optional[Dict[str, Any]]:
+    """
+    Run a SQL solution on the examples of a database problem in SQLite.
+
+    Args:
+        query: The generated MySQL query
+        details: Problem details (content, exampleTestcases, metaData)
+        time_limit: Time limit per example in seconds
+
+    Returns:
+        The local verdict in the format of process_submission_result, or None
+        if the problem or the query cannot be judged with SQLite
+    """
+    examples = _parse_examples(details.get("exampleTestcases", ""))
+    content = details.get("content") or ""
+    expected_tables = parse_expected_tables(content)
+    if not examples or len(examples) != len(expected_tables):
+        logging.info("SQL judge skipped: examples and expected tables do not match")
+        return None
+
+    try:
+        meta = json.loads(details.get("metaData") or "{}")
+    except (TypeError, ValueError):
+        meta = {}
+    create_statements = [statement for statement in map(_sqlite_create_statement, meta.get("mysql") or [])
+                         if statement]
+    lowered = content.lower()
+    ordered = bool(re.search(r"\b(?:order(?:ed)? by|sorted by)\b", lowered)) and "in any order" not in lowered
+
+    total = len(examples)
+    for passed, (example, (expected_columns, expected_rows)) in enumerate(zip(examples, expected_tables)):
+        last_testcase = json.dumps(example, separators=(",", ":"))
+        conn = sqlite3.connect(":memory:")
+        try:
+            for name, (arg_count, function) in _MYSQL_FUNCTIONS.items():
+                conn.create_function(name, arg_count, function, deterministic=True)
+            try:
+                _load_example(conn, create_statements, example)
+            except sqlite3.Error as e:
+                logging.info(f"SQL judge skipped: could not load the example tables ({str(e)})")
+                return None
+
+            deadline = time.monotonic() + time_limit
+            conn.set_progress_handler(lambda: time.monotonic() > deadline, _PROGRESS_STEPS)
+            try:
+                columns, rows = _run_query(conn, query)
+            except sqlite3.Error as e:
+                message = str(e)
+                if message == "interrupted":
+                    return _verdict(14, total, passed, last_testcase=last_testcase)
+                if message.startswith(("no such table", "no such column")):
+                    return _verdict(15, total, passed, last_testcase=last_testcase, runtime_error=message,
+                                    full_runtime_error=message)
+                # Syntax oder Funktionen, die SQLite anders als MySQL kennt: lokal nicht entscheidbar
+                logging.info(f"SQL judge skipped: SQLite cannot run the query ({message})")
+                return None
+        finally:
+            conn.close()
+
+        actual = [tuple(_cell_key(value) for value in row) for row in rows]
+        expected = [tuple(_cell_key(value) for value in row) for row in expected_rows]
+        same_columns = [column.lower() for column in columns] == [column.lower() for column in expected_columns]
+        same_rows = actual == expected if ordered else Counter(actual) == Counter(expected)
+        if not (same_columns and same_rows):
+            return _verdict(11, total, passed, last_testcase=last_testcase,
+                            expected_output=_table_json(expected_columns,
+                                                        [[_typed(value) for value in row] for row in expected_rows]),
+                            code_output=_table_json(columns, rows))
+
+    return _verdict(10, total, total)
@@ -5,6 +5,8 @@ Hauptskript für die LeetCode-Problemverarbeitung.
 import argparse
 from src.problem_processor import process_difficulty
 from src.stats_manager import save_results
+from api.leetcode import sync_catalog, warm_problem_cache
+from api.submission_executor import resume_submissions
 
 def main():
     parser = argparse.ArgumentParser(description='LeetCode Problem Solver')
@@ -18,23 +20,63 @@ def main():
     parser.add_argument('--temperature', type=float, default=0.7, help='Temperatur für das Language Model')
     parser.add_argument('--model', type=str, default='codellama', help='Zu verwendendes Language Model')
     parser.add_argument('--show-full-prompt', action='store_true', help='Zeigt den vollständigen Prompt an')
+    parser.add_argument('--no-llm-cache', action='store_true',
+                        help='Fragt das Language Model auch bei Temperatur 0 neu an, statt gespeicherte Antworten zu verwenden')
+    parser.add_argument('--llm-cache', action='store_true',
+                        help='Verwendet gespeicherte Antworten auch bei Temperatur > 0 (z.B. für A/B-Tests von Prompts)')
     
     # Export-Konfiguration
     parser.add_argument('--output', type=str, help='Dateiname für die Ergebnisse (ohne Erweiterung)')
     
+    # Lokaler Problemkatalog
+    parser.add_argument('--sync-catalog', action='store_true', help='Synchronisiert den lokalen Problemkatalog mit LeetCode')
+    parser.add_argument('--full-sync', action='store_true', help='Lädt beim Synchronisieren alle Seiten der Problemliste neu')
+    parser.add_argument('--warm-cache', nargs='?', const='all', choices=['all', 'easy', 'medium', 'hard'],
+                        help='Lädt die Details aller Probleme (optional nur eines Schwierigkeitsgrads) in den Problem-Cache')
+    
+    # Submission-Journal
+    parser.add_argument('--resume-submissions', action='store_true',
+                        help='Holt die Urteile unterbrochener LeetCode-Submissions ab, ohne erneut einzureichen')
+    
     args = parser.parse_args()
     
+    if args.sync_catalog or args.full_sync:
+        sync_catalog(force=True, full=args.full_sync)
+    
+    if args.warm_cache:
+        loaded = warm_problem_cache(None if args.warm_cache == 'all' else args.warm_cache)
+        print(f"Problem-Cache: {loaded} Probleme neu geladen")
+    
+    if args.resume_submissions:
+        resumed = resume_submissions()
+        print(f"Submission-Journal: {len(resumed)} offene Submissions fortgesetzt")
+        for entry in resumed:
+            submission, result = entry["submission"], entry["result"]
+            if result.get("pending"):
+                status = "noch in Bewertung"
+            elif result.get("success"):
+                status = result.get("status_description", "Unbekannt")
+            else:
+                status = f"Fehler: {result.get('error', 'Unbekannter Fehler')}"
+            print(f"  {submission['slug']} (ID {submission['submission_id']}): {status}")
+    
+    # Gespeicherte LLM-Antworten: standardmäßig nur bei Temperatur 0 (siehe gpt/response_cache.py)
+    use_llm_cache = False if args.no_llm_cache else (True if args.llm_cache else None)
+    
     # Verarbeite alle Schwierigkeitsgrade
     all_stats = {}
     
     if args.easy > 0:
-        all_stats['easy'] = process_difficulty('easy', args.easy, args.temperature, args.model, args.show_full_prompt)
+        all_stats['easy'] = process_difficulty('easy', args.easy, args.temperature, args.model, args.show_full_prompt,
+                                                 use_llm_cache)
     
     if args.medium > 0:
-        all_stats['medium'] = process_difficulty('medium', args.medium, args.temperature, args.model, args.show_full_prompt)
+        all_stats['medium'] = process_difficulty('medium', args.medium, args.temperature, args.model, args.show_full_prompt,
+                                                 use_llm_cache)
     
     if args.hard > 0:
-        all_stats['hard'] = process_difficulty('hard', args.hard, args.temperature, args.model, args.show_full_prompt)
+        all_stats['hard'] = process_difficulty('hard', args.hard, args.temperature, args.model, args.show_full_prompt,
+                                                 use_llm_cache)
     
     # Speichere Ergebnisse
     if all_stats:
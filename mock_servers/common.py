@@ -0,0 +1,180 @@
+"""
+Shared building blocks for the local mock servers.
+
+Contains the latency distributions, the fault injection (429s and server
+errors) and a small JSON request handler on top of http.server, so that the
+mock servers need nothing beyond the standard library.
+"""
+
+import json
+import logging
+import math
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+
+class Distribution:
+    """
+    A latency distribution in seconds, parsed from a spec string.
+
+    Supported specs:
+        fixed:S             always S seconds (a plain number is accepted as well)
+        uniform:A,B         uniformly between A and B
+        exp:MEAN            exponential with the given mean
+        normal:MEAN,SD      normal, clamped at 0
+        lognormal:MEDIAN,SIGMA  log-normal with the given median (heavy tail)
+    """
+
+    def __init__(self, spec: str = "fixed:0"):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        if not params:
+            kind, params = "fixed", kind
+        self.kind = kind.strip().lower()
+        try:
+            self.params = [float(p) for p in params.split(",")]
+        except ValueError:
+            raise ValueError(f"Invalid distribution spec: {spec!r}")
+
+        expected = {"fixed": 1, "uniform": 2, "exp": 1, "normal": 2, "lognormal": 2}
+        if self.kind not in expected or len(self.params) != expected[self.kind]:
+            raise ValueError(f"Invalid distribution spec: {spec!r}")
+
+    def sample(self, rng: random.Random) -> float:
+        p = self.params
+        if self.kind == "fixed":
+            value = p[0]
+        elif self.kind == "uniform":
+            value = rng.uniform(p[0], p[1])
+        elif self.kind == "exp":
+            value = rng.expovariate(1.0 / p[0]) if p[0] > 0 else 0.0
+        elif self.kind == "normal":
+            value = rng.gauss(p[0], p[1])
+        else:
+            value = rng.lognormvariate(math.log(p[0]), p[1]) if p[0] > 0 else 0.0
+        return max(0.0, value)
+
+    def __repr__(self):
+        return f"Distribution({self.spec!r})"
+
+
+class FaultInjector:
+    """
+    Decides whether a request fails with a 429 or a server error.
+
+    Args:
+        error_rate: Probability of a 500/502/503 response
+        rate_limit_rate: Probability of a 429 response
+        retry_after: Value of the Retry-After header sent with 429s (None to omit it)
+    """
+
+    def __init__(self, error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: Optional[float] = 1.0):
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+
+    def pick(self, rng: random.Random) -> Optional[Tuple[int, Dict[str, str]]]:
+        """Return (status, headers) for an injected failure, or None."""
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            headers = {"Retry-After": f"{self.retry_after:g}"} if self.retry_after is not None else {}
+            return 429, headers
+        if roll < self.rate_limit_rate + self.error_rate:
+            return rng.choice((500, 502, 503)), {}
+        return None
+
+
+class MockServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer with a shared, lock-protected RNG and request counters."""
+
+    daemon_threads = True
+
+    def __init__(self, address, handler_class, seed: Optional[int] = None, verbose: bool = False):
+        super().__init__(address, handler_class)
+        self.rng = random.Random(seed)
+        self.rng_lock = threading.Lock()
+        self.stats = Counter()
+        self.verbose = verbose
+
+    def sample(self, distribution: Distribution) -> float:
+        with self.rng_lock:
+            return distribution.sample(self.rng)
+
+    def random(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+    def pick_fault(self, faults: FaultInjector):
+        with self.rng_lock:
+            return faults.pick(self.rng)
+
+    def count(self, key: str, amount: int = 1):
+        with self.rng_lock:
+            self.stats[key] += amount
+
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class JSONRequestHandler(BaseHTTPRequestHandler):
+    """Request handler with JSON helpers; keeps connections alive like the real APIs."""
+
+    protocol_version = "HTTP/1.1"
+    server: MockServer
+
+    def read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if not body:
+            return {}
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError:
+            return None
+
+    def send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_fault(self, fault: Tuple[int, Dict[str, str]]):
+        status, headers = fault
+        self.server.count(f"injected_{status}")
+        message = "Too Many Requests" if status == 429 else "Injected server error"
+        self.send_json(status, {"error": message}, headers)
+
+    def send_stats(self):
+        with self.server.rng_lock:
+            stats = dict(self.server.stats)
+        self.send_json(200, stats)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            logging.info("%s - %s", self.address_string(), format % args)
+
+
+def serve(server: MockServer, name: str):
+    """Run a mock server in the foreground until Ctrl+C."""
+    print(f"{name} läuft auf {server.base_url()} (Strg+C zum Beenden)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def start_in_thread(server: MockServer) -> threading.Thread:
+    """Run a mock server in a background thread (e.g. inside a benchmark script)."""
+    thread = threading.Thread(target=server.serve_forever, name=f"mock-{server.server_address[1]}", daemon=True)
+    thread.start()
+    return thread
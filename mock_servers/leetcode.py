@@ -0,0 +1,338 @@
+"""
+Local stand-in for the LeetCode API, for load and throughput tests without network access.
+
+Implements the endpoints used by api/leetcode.py and api/leetcode_submit.py:
+    POST /graphql
+        problemsetQuestionListV2 (skip/limit, difficulty and topic filters, searchKeyword)
+        question(titleSlug: ...) including aliased batch queries (q0: question(...), ...)
+    POST /problems/<slug>/submit/
+        Returns a submission_id
+    GET  /submissions/detail/<id>/check/
+        PENDING, then STARTED while the simulated judge runs, then the final verdict
+    GET  /_stats
+        Request and fault counters of the running server
+
+The problem set is generated deterministically from the seed. Latencies are
+drawn from configurable distributions (see mock_servers/common.py), and a
+fraction of all requests can be answered with 429 (with Retry-After) or 5xx.
+
+Usage:
+    python -m mock_servers.leetcode --port 3000 --judge-time lognormal:1.5,0.4 --rate-limit-rate 0.05
+    LEETCODE_BASE_URL=http://localhost:3000 LEETCODE_SESSION=x LEETCODE_CSRF=x python main.py --easy 20
+"""
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from mock_servers.common import Distribution, FaultInjector, JSONRequestHandler, MockServer, serve
+
+TOPIC_TAGS = [
+    ("Array", "array"), ("String", "string"), ("Hash Table", "hash-table"), ("Math", "math"),
+    ("Dynamic Programming", "dynamic-programming"), ("Sorting", "sorting"), ("Greedy", "greedy"),
+    ("Two Pointers", "two-pointers"), ("Tree", "tree"), ("Graph", "graph"),
+]
+
+# Verteilung der Urteile für nicht akzeptierte Submissions (LeetCode-Statuscodes)
+REJECT_VERDICTS = [(11, 0.55), (14, 0.15), (15, 0.15), (20, 0.15)]
+STATUS_MESSAGES = {10: "Accepted", 11: "Wrong Answer", 14: "Time Limit Exceeded", 15: "Runtime Error",
+                   20: "Compile Error"}
+
+_SUBMIT_PATH = re.compile(r"^/problems/([^/]+)/submit/?$")
+_CHECK_PATH = re.compile(r"^/submissions/detail/(\d+)/check/?$")
+_ALIASED_QUESTION = re.compile(r"(\w+)\s*:\s*question\s*\(\s*titleSlug\s*:\s*\$(\w+)\s*\)")
+
+
+def build_problem_set(count: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Generate a deterministic problem list in the problemsetQuestionListV2 format.
+
+    Args:
+        count: Number of problems
+        seed: Seed for difficulties, tags and paid-only flags
+
+    Returns:
+        List of question dicts ordered by frontend ID
+    """
+    rng = random.Random(seed)
+    problems = []
+    for number in range(1, count + 1):
+        difficulty = rng.choices(["EASY", "MEDIUM", "HARD"], weights=[25, 52, 23])[0]
+        tags = rng.sample(TOPIC_TAGS, rng.randint(1, 3))
+        problems.append({
+            "id": str(number),
+            "questionFrontendId": str(number),
+            "title": f"Mock Problem {number}",
+            "titleSlug": f"mock-problem-{number}",
+            "difficulty": difficulty,
+            "paidOnly": rng.random() < 0.1,
+            "topicTags": [{"name": name, "slug": slug} for name, slug in tags],
+        })
+    return problems
+
+
+def problem_details(problem: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the question(titleSlug) fields of a generated problem (an array-sum task)."""
+    examples = [[1, 2, 3], [4, -1]]
+    example_html = "".join(
+        f"<p><strong class=\"example\">Example {i}:</strong></p>\n<pre>\n<strong>Input:</strong> nums = {json.dumps(nums, separators=(',', ':'))}\n"
+        f"<strong>Output:</strong> {sum(nums)}\n</pre>\n"
+        for i, nums in enumerate(examples, start=1)
+    )
+    content = (
+        f"<p>Given an integer array <code>nums</code>, return <em>the sum of its elements</em>.</p>\n\n{example_html}"
+        "<p><strong>Constraints:</strong></p>\n<ul>\n\t<li><code>1 &lt;= nums.length &lt;= 10<sup>4</sup></code></li>\n</ul>\n"
+    )
+    meta_data = {"name": "arraySum", "params": [{"name": "nums", "type": "integer[]"}], "return": {"type": "integer"}}
+    return {
+        "questionId": problem["id"],
+        "title": problem["title"],
+        "difficulty": problem["difficulty"].capitalize(),
+        "content": content,
+        "exampleTestcases": "\n".join(json.dumps(nums, separators=(",", ":")) for nums in examples),
+        "metaData": json.dumps(meta_data),
+        "codeSnippets": [
+            {"lang": "C++", "langSlug": "cpp",
+             "code": "class Solution {\npublic:\n    int arraySum(vector<int>& nums) {\n        \n    }\n};"},
+            {"lang": "Python3", "langSlug": "python3",
+             "code": "class Solution:\n    def arraySum(self, nums: List[int]) -> int:\n        "},
+        ],
+        "topicTags": problem["topicTags"],
+    }
+
+
+class MockLeetCodeConfig:
+    """Settings of the mock LeetCode server (see the command line options)."""
+
+    def __init__(self, problems: int = 3000, graphql_latency: str = "fixed:0.05", submit_latency: str = "fixed:0.1",
+                 check_latency: str = "fixed:0.02", judge_time: str = "lognormal:1.5,0.4", accept_rate: float = 0.6,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: Optional[float] = 1.0):
+        self.problems = problems
+        self.graphql_latency = Distribution(graphql_latency)
+        self.submit_latency = Distribution(submit_latency)
+        self.check_latency = Distribution(check_latency)
+        self.judge_time = Distribution(judge_time)
+        self.accept_rate = accept_rate
+        self.faults = FaultInjector(error_rate, rate_limit_rate, retry_after)
+
+
+class MockLeetCodeServer(MockServer):
+    """Mock server holding the generated problem set and the simulated submissions."""
+
+    def __init__(self, address, config: MockLeetCodeConfig, seed: Optional[int] = None, verbose: bool = False):
+        super().__init__(address, MockLeetCodeHandler, seed=seed, verbose=verbose)
+        self.config = config
+        self.problems = build_problem_set(config.problems, seed)
+        self.by_slug = {p["titleSlug"]: p for p in self.problems}
+        self.submissions: Dict[int, Dict[str, Any]] = {}
+        self.submissions_lock = threading.Lock()
+        self._submission_ids = itertools.count(1000001)
+
+    def problemset(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        filters = variables.get("filters") or {}
+        difficulties = set((filters.get("difficultyFilter") or {}).get("difficulties") or [])
+        topics = set((filters.get("topicFilter") or {}).get("topicSlugs") or [])
+        keyword = (variables.get("searchKeyword") or "").strip().lower()
+
+        matches = [
+            p for p in self.problems
+            if (not difficulties or p["difficulty"] in difficulties)
+            and topics <= {t["slug"] for t in p["topicTags"]}
+            and (not keyword or keyword in p["title"].lower() or keyword in p["titleSlug"])
+        ]
+        skip = int(variables.get("skip") or 0)
+        limit = int(variables.get("limit") or 50)
+        return {
+            "questions": matches[skip:skip + limit],
+            "totalLength": len(matches),
+            "hasMore": skip + limit < len(matches),
+        }
+
+    def question(self, slug: Optional[str]) -> Optional[Dict[str, Any]]:
+        problem = self.by_slug.get(slug or "")
+        return problem_details(problem) if problem else None
+
+    def create_submission(self, slug: str, body: Dict[str, Any]) -> int:
+        submission_id = next(self._submission_ids)
+        judge_time = self.sample(self.config.judge_time)
+        if self.random() < self.config.accept_rate:
+            status_code = 10
+        else:
+            with self.rng_lock:
+                status_code = self.rng.choices([v for v, _ in REJECT_VERDICTS], weights=[w for _, w in REJECT_VERDICTS])[0]
+
+        now = time.time()
+        with self.submissions_lock:
+            self.submissions[submission_id] = {
+                "slug": slug,
+                "lang": body.get("lang", "cpp"),
+                "question_id": str(body.get("question_id", "")),
+                "started_at": now + judge_time * 0.3,
+                "finished_at": now + judge_time,
+                "status_code": status_code,
+            }
+        return submission_id
+
+    def check_submission(self, submission_id: int) -> Optional[Dict[str, Any]]:
+        with self.submissions_lock:
+            submission = self.submissions.get(submission_id)
+        if submission is None:
+            return None
+
+        now = time.time()
+        if now < submission["started_at"]:
+            return {"state": "PENDING"}
+        if now < submission["finished_at"]:
+            return {"state": "STARTED"}
+
+        status_code = submission["status_code"]
+        total = 50
+        passed = total if status_code == 10 else 17
+        result = {
+            "state": "SUCCESS",
+            "status_code": status_code,
+            "status_msg": STATUS_MESSAGES[status_code],
+            "lang": submission["lang"],
+            "question_id": submission["question_id"],
+            "submission_id": str(submission_id),
+            "run_success": status_code != 20,
+            "total_correct": passed if status_code != 20 else None,
+            "total_testcases": total if status_code != 20 else None,
+            "task_finish_time": int(submission["finished_at"] * 1000),
+        }
+        if status_code == 10:
+            result.update({"status_runtime": "3 ms", "memory": 12_800_000, "runtime_percentile": 87.5,
+                           "memory_percentile": 64.2})
+        elif status_code == 11:
+            result.update({"last_testcase": "[4,-1]", "expected_output": "3", "code_output": "5",
+                           "compare_result": "1" * passed + "0" * (total - passed)})
+        elif status_code == 15:
+            result.update({"runtime_error": "Line 4: index out of range", "full_runtime_error": "Line 4: index out of range",
+                           "last_testcase": "[1,2,3]"})
+        elif status_code == 20:
+            result.update({"compile_error": "Line 3: expected ';'", "full_compile_error": "Line 3: expected ';'"})
+        return result
+
+
+class MockLeetCodeHandler(JSONRequestHandler):
+    server: MockLeetCodeServer
+
+    def _delay_and_fault(self, latency: Distribution) -> bool:
+        """Simulate latency and injected failures; returns True if a failure was sent."""
+        time.sleep(self.server.sample(latency))
+        fault = self.server.pick_fault(self.server.config.faults)
+        if fault:
+            self.send_fault(fault)
+            return True
+        return False
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        body = self.read_json()
+        if body is None:
+            self.send_json(400, {"error": "Invalid JSON"})
+            return
+
+        if path.rstrip("/") == "/graphql":
+            self.server.count("graphql")
+            if not self._delay_and_fault(self.server.config.graphql_latency):
+                self.send_json(200, self._graphql(body))
+            return
+
+        match = _SUBMIT_PATH.match(path)
+        if match:
+            self.server.count("submit")
+            if self._delay_and_fault(self.server.config.submit_latency):
+                return
+            slug = match.group(1)
+            if slug not in self.server.by_slug:
+                self.send_json(404, {"error": f"Unknown problem {slug}"})
+                return
+            self.send_json(200, {"submission_id": self.server.create_submission(slug, body)})
+            return
+
+        self.send_json(404, {"error": "Not found"})
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/_stats":
+            self.send_stats()
+            return
+
+        match = _CHECK_PATH.match(path)
+        if match:
+            self.server.count("check")
+            if self._delay_and_fault(self.server.config.check_latency):
+                return
+            result = self.server.check_submission(int(match.group(1)))
+            if result is None:
+                self.send_json(404, {"error": "Unknown submission"})
+            else:
+                self.send_json(200, result)
+            return
+
+        self.send_json(404, {"error": "Not found"})
+
+    def _graphql(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        query = body.get("query") or ""
+        variables = body.get("variables") or {}
+
+        if "problemsetQuestionListV2" in query:
+            return {"data": {"problemsetQuestionListV2": self.server.problemset(variables)}}
+
+        aliases = _ALIASED_QUESTION.findall(query)
+        if aliases:
+            return {"data": {alias: self.server.question(variables.get(name)) for alias, name in aliases}}
+
+        if re.search(r"\bquestion\s*\(", query):
+            return {"data": {"question": self.server.question(variables.get("titleSlug"))}}
+
+        return {"errors": [{"message": "Query not supported by the mock server"}]}
+
+
+def create_server(host: str = "127.0.0.1", port: int = 3000, config: Optional[MockLeetCodeConfig] = None,
+                  seed: Optional[int] = None, verbose: bool = False) -> MockLeetCodeServer:
+    """Create (but do not start) a mock LeetCode server; port 0 picks a free port."""
+    return MockLeetCodeServer((host, port), config or MockLeetCodeConfig(), seed=seed, verbose=verbose)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lokaler LeetCode-Mock-Server für Lasttests')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Adresse, auf der der Server lauscht')
+    parser.add_argument('--port', type=int, default=3000, help='Port des Servers')
+    parser.add_argument('--problems', type=int, default=3000, help='Anzahl der generierten Probleme')
+    parser.add_argument('--seed', type=int, default=None, help='Seed für Problemliste, Latenzen und Fehler')
+    parser.add_argument('--graphql-latency', type=str, default='fixed:0.05', help='Latenzverteilung der GraphQL-Anfragen')
+    parser.add_argument('--submit-latency', type=str, default='fixed:0.1', help='Latenzverteilung der Submissions')
+    parser.add_argument('--check-latency', type=str, default='fixed:0.02', help='Latenzverteilung der Statusabfragen')
+    parser.add_argument('--judge-time', type=str, default='lognormal:1.5,0.4',
+                        help='Dauer bis zum Urteil (PENDING -> STARTED -> SUCCESS)')
+    parser.add_argument('--accept-rate', type=float, default=0.6, help='Anteil der akzeptierten Submissions')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Anteil der Anfragen mit 5xx-Antwort')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Anteil der Anfragen mit 429-Antwort')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After-Wert (Sekunden) bei 429-Antworten')
+    parser.add_argument('--verbose', action='store_true', help='Jede Anfrage protokollieren')
+    args = parser.parse_args()
+
+    config = MockLeetCodeConfig(
+        problems=args.problems,
+        graphql_latency=args.graphql_latency,
+        submit_latency=args.submit_latency,
+        check_latency=args.check_latency,
+        judge_time=args.judge_time,
+        accept_rate=args.accept_rate,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    serve(create_server(args.host, args.port, config, seed=args.seed, verbose=args.verbose), "LeetCode-Mock-Server")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+"""
+Local stand-in for the LLM backends used by gpt/gpt.py, for deterministic offline benchmarks.
+
+Implements:
+    POST /api/generate          Ollama (stream true: NDJSON chunks, stream false: one JSON object)
+    POST /v1/chat/completions   OpenAI-style chat completions as used by DeepSeek (optionally SSE-streamed)
+    POST /v1/messages           Anthropic messages API (optionally SSE-streamed)
+    GET  /_stats                Request and fault counters of the running server
+
+Responses are either the built-in canned C++ solution or come from a script
+file (JSON list or JSON lines). Each script entry has a "response" text and an
+optional "match" regex applied to the prompt; the first matching entry wins,
+entries without "match" are served in turn. Generation speed is simulated with
+a time-to-first-token distribution and a tokens-per-second rate.
+
+Usage:
+    python -m mock_servers.llm --port 11435 --ttft lognormal:0.4,0.3 --tokens-per-second 60
+    OLLAMA_BASE_URL=http://localhost:11435 python main.py --easy 10 --model codellama
+    CLAUDE_BASE_URL=http://localhost:11435 CLAUDE_API_KEY=x python main.py --easy 10 --model claude
+"""
+
+import argparse
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import urlsplit
+
+from mock_servers.common import Distribution, FaultInjector, JSONRequestHandler, MockServer, serve
+
+CANNED_RESPONSE = """Here is a solution:
+
+```cpp
+#include <vector>
+using namespace std;
+
+class Solution {
+public:
+    int arraySum(vector<int>& nums) {
+        int total = 0;
+        for (int x : nums) {
+            total += x;
+        }
+        return total;
+    }
+};
+```
+"""
+
+# Grobe Tokenisierung: ein Token pro Wort inklusive folgender Leerzeichen
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into pseudo tokens whose concatenation is the original text."""
+    return _TOKEN_PATTERN.findall(text)
+
+
+def load_script(path: str) -> List[Dict[str, Any]]:
+    """
+    Load scripted responses from a JSON list or a JSON lines file.
+
+    Args:
+        path: Path to the script file
+
+    Returns:
+        List of entries with "response" and an optional compiled "match" pattern
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read().strip()
+    entries = json.loads(raw) if raw.startswith("[") else [json.loads(line) for line in raw.splitlines() if line.strip()]
+
+    script = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"response": entry}
+        if "response" not in entry:
+            raise ValueError(f"Script entry without 'response': {entry}")
+        script.append({
+            "response": entry["response"],
+            "match": re.compile(entry["match"], re.DOTALL) if entry.get("match") else None,
+        })
+    return script
+
+
+class MockLLMConfig:
+    """Settings of the mock LLM server (see the command line options)."""
+
+    def __init__(self, ttft: str = "fixed:0.2", tokens_per_second: float = 50.0,
+                 script: Optional[List[Dict[str, Any]]] = None, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, retry_after: Optional[float] = 1.0):
+        self.ttft = Distribution(ttft)
+        self.tokens_per_second = tokens_per_second
+        self.script = script or []
+        self.faults = FaultInjector(error_rate, rate_limit_rate, retry_after)
+
+
+class MockLLMServer(MockServer):
+    """Mock server that picks responses and simulates the generation speed."""
+
+    def __init__(self, address, config: MockLLMConfig, seed: Optional[int] = None, verbose: bool = False):
+        super().__init__(address, MockLLMHandler, seed=seed, verbose=verbose)
+        self.config = config
+        self._unmatched = [entry for entry in config.script if entry["match"] is None]
+        self._turns = itertools.count()
+        self._turns_lock = threading.Lock()
+
+    def pick_response(self, prompt: str) -> str:
+        for entry in self.config.script:
+            if entry["match"] is not None and entry["match"].search(prompt):
+                return entry["response"]
+        if self._unmatched:
+            with self._turns_lock:
+                turn = next(self._turns)
+            return self._unmatched[turn % len(self._unmatched)]["response"]
+        return CANNED_RESPONSE
+
+    def token_interval(self) -> float:
+        rate = self.config.tokens_per_second
+        return 1.0 / rate if rate > 0 else 0.0
+
+
+class MockLLMHandler(JSONRequestHandler):
+    server: MockLLMServer
+
+    def do_GET(self):
+        if urlsplit(self.path).path == "/_stats":
+            self.send_stats()
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        body = self.read_json()
+        if body is None:
+            self.send_json(400, {"error": "Invalid JSON"})
+            return
+
+        routes = {
+            "/api/generate": self._ollama,
+            "/v1/chat/completions": self._chat_completions,
+            "/chat/completions": self._chat_completions,
+            "/v1/messages": self._messages,
+        }
+        route = routes.get(path)
+        if route is None:
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        self.server.count(path.rsplit("/", 1)[-1])
+        fault = self.server.pick_fault(self.server.config.faults)
+        if fault:
+            self.send_fault(fault)
+            return
+        route(body)
+
+    # -- Generierung -----------------------------------------------------------------
+
+    def _generate(self, prompt: str) -> Iterator[str]:
+        """Yield the tokens of the response with the configured timing."""
+        text = self.server.pick_response(prompt)
+        time.sleep(self.server.sample(self.server.config.ttft))
+        interval = self.server.token_interval()
+        tokens = tokenize(text)
+        self.server.count("tokens", len(tokens))
+        for i, token in enumerate(tokens):
+            if i and interval:
+                time.sleep(interval)
+            yield token
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: str):
+        payload = data.encode("utf-8")
+        self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _write_sse(self, data: Any, event: Optional[str] = None):
+        prefix = f"event: {event}\n" if event else ""
+        payload = data if isinstance(data, str) else json.dumps(data)
+        self._write_chunk(f"{prefix}data: {payload}\n\n")
+
+    # -- Ollama ----------------------------------------------------------------------
+
+    def _ollama(self, body: Dict[str, Any]):
+        model = body.get("model", "mock")
+        prompt = body.get("prompt", "")
+        started = time.time()
+        prompt_tokens = len(tokenize(prompt))
+
+        def chunk(response: str, done: bool, eval_count: int = 0) -> Dict[str, Any]:
+            data = {"model": model, "created_at": datetime.now(timezone.utc).isoformat(), "response": response,
+                    "done": done}
+            if done:
+                data.update({"done_reason": "stop", "total_duration": int((time.time() - started) * 1e9),
+                             "prompt_eval_count": prompt_tokens, "eval_count": eval_count})
+            return data
+
+        if body.get("stream", True):
+            self._start_stream("application/x-ndjson")
+            count = 0
+            for token in self._generate(prompt):
+                count += 1
+                self._write_chunk(json.dumps(chunk(token, False)) + "\n")
+            self._write_chunk(json.dumps(chunk("", True, count)) + "\n")
+            self._end_stream()
+            return
+
+        tokens = list(self._generate(prompt))
+        self.send_json(200, chunk("".join(tokens), True, len(tokens)))
+
+    # -- OpenAI / DeepSeek -------------------------------------------------------------
+
+    def _chat_completions(self, body: Dict[str, Any]):
+        model = body.get("model", "mock")
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages") or [])
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            self._start_stream("text/event-stream")
+            for token in self._generate(prompt):
+                self._write_sse({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                                 "model": model, "choices": [{"index": 0, "delta": {"content": token},
+                                                              "finish_reason": None}]})
+            self._write_sse({"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                             "model": model, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            self._write_sse("[DONE]")
+            self._end_stream()
+            return
+
+        tokens = list(self._generate(prompt))
+        prompt_tokens = len(tokenize(prompt))
+        self.send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                         "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+                      "total_tokens": prompt_tokens + len(tokens)},
+        })
+
+    # -- Anthropic -------------------------------------------------------------------
+
+    def _messages(self, body: Dict[str, Any]):
+        model = body.get("model", "mock")
+        parts = []
+        for message in body.get("messages") or []:
+            content = message.get("content", "")
+            if isinstance(content, list):
+                content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+            parts.append(str(content))
+        prompt = "\n".join(parts)
+        message_id = f"msg_{uuid.uuid4().hex[:24]}"
+        input_tokens = len(tokenize(prompt))
+
+        if body.get("stream"):
+            self._start_stream("text/event-stream")
+            self._write_sse({"type": "message_start", "message": {
+                "id": message_id, "type": "message", "role": "assistant", "model": model, "content": [],
+                "stop_reason": None, "usage": {"input_tokens": input_tokens, "output_tokens": 0}}}, "message_start")
+            self._write_sse({"type": "content_block_start", "index": 0,
+                             "content_block": {"type": "text", "text": ""}}, "content_block_start")
+            count = 0
+            for token in self._generate(prompt):
+                count += 1
+                self._write_sse({"type": "content_block_delta", "index": 0,
+                                 "delta": {"type": "text_delta", "text": token}}, "content_block_delta")
+            self._write_sse({"type": "content_block_stop", "index": 0}, "content_block_stop")
+            self._write_sse({"type": "message_delta", "delta": {"stop_reason": "end_turn"},
+                             "usage": {"output_tokens": count}}, "message_delta")
+            self._write_sse({"type": "message_stop"}, "message_stop")
+            self._end_stream()
+            return
+
+        tokens = list(self._generate(prompt))
+        self.send_json(200, {
+            "id": message_id,
+            "type": "message",
+            "role": "assistant",
+            "model": model,
+            "content": [{"type": "text", "text": "".join(tokens)}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": input_tokens, "output_tokens": len(tokens)},
+        })
+
+
+def create_server(host: str = "127.0.0.1", port: int = 11435, config: Optional[MockLLMConfig] = None,
+                  seed: Optional[int] = None, verbose: bool = False) -> MockLLMServer:
+    """Create (but do not start) a mock LLM server; port 0 picks a free port."""
+    return MockLLMServer((host, port), config or MockLLMConfig(), seed=seed, verbose=verbose)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lokaler Mock-Server für Ollama, DeepSeek und Claude')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Adresse, auf der der Server lauscht')
+    parser.add_argument('--port', type=int, default=11435, help='Port des Servers')
+    parser.add_argument('--seed', type=int, default=None, help='Seed für Latenzen und Fehler')
+    parser.add_argument('--script', type=str, help='JSON- oder JSONL-Datei mit vorgegebenen Antworten')
+    parser.add_argument('--ttft', type=str, default='fixed:0.2', help='Verteilung der Zeit bis zum ersten Token')
+    parser.add_argument('--tokens-per-second', type=float, default=50.0, help='Generierte Tokens pro Sekunde (0 = sofort)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Anteil der Anfragen mit 5xx-Antwort')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Anteil der Anfragen mit 429-Antwort')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After-Wert (Sekunden) bei 429-Antworten')
+    parser.add_argument('--verbose', action='store_true', help='Jede Anfrage protokollieren')
+    args = parser.parse_args()
+
+    config = MockLLMConfig(
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        script=load_script(args.script) if args.script else None,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+    )
+    serve(create_server(args.host, args.port, config, seed=args.seed, verbose=args.verbose), "LLM-Mock-Server")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,8 @@ Hauptmodul für die Verarbeitung von LeetCode-Problemen.
 
 import time
 import random
-from typing import Dict, List, Any
-from api.leetcode import fetch_problems, fetch_full_problem
+from typing import Dict, List, Any, Optional
+from api.leetcode import fetch_problems, fetch_full_problem, fetch_full_problems
 from gpt.gpt import get_solution
 from utils.clean import extract_code_block
 from .config import DEFAULT_MODEL, DEFAULT_TEMPERATURE, DEFAULT_PROBLEM_LIMIT, API_RETRY_DELAY
@@ -20,7 +20,8 @@ def process_difficulty(
     num_problems: int = 5,
     temperature: float = DEFAULT_TEMPERATURE,
     model: str = DEFAULT_MODEL,
-    show_full_prompt: bool = False
+    show_full_prompt: bool = False,
+    use_llm_cache: Optional[bool] = None
 ) -> Dict[str, Any]:
     """
     Verarbeitet Probleme einer bestimmten Schwierigkeitsstufe.
@@ -31,6 +32,8 @@ def process_difficulty(
         temperature: Temperatur für das Language Model
         model: Zu verwendendes Language Model
         show_full_prompt: Ob der vollständige Prompt angezeigt werden soll
+        use_llm_cache: Ob gespeicherte LLM-Antworten für unveränderte Prompts verwendet werden
+            (None: nur bei Temperatur 0, siehe get_solution)
     
     Returns:
         Dict mit den Statistiken
@@ -53,6 +56,13 @@ def process_difficulty(
     # Zufällige Probleme auswählen
     selected_problems = random.sample(available_problems, min(num_problems, len(available_problems)))
     
+    # Problem-Details gebündelt abrufen (eine Anfrage pro DETAIL_BATCH_SIZE Probleme)
+    try:
+        batch_details = fetch_full_problems([p['titleSlug'] for p in selected_problems])
+    except Exception as e:
+        print(f"Error fetching problem details in batch: {e}")
+        batch_details = {}
+    
     for problem in selected_problems:
         try:
             title = problem['title']
@@ -64,7 +74,7 @@ def process_difficulty(
             
             # Problem-Details abrufen
             try:
-                details = fetch_full_problem(slug)
+                details = batch_details.get(slug) or fetch_full_problem(slug)
             except Exception as e:
                 print(f"Error fetching problem details: {e}")
                 test_results = {'success': False, 'error_type': 'api_error', 'error_message': str(e)}
@@ -74,7 +84,7 @@ def process_difficulty(
             # Prompt generieren und Lösung erhalten
             try:
                 prompt = generate_problem_prompt(details, show_full_prompt)
-                llm_response = get_solution(prompt, temperature=temperature, model=model)
+                llm_response = get_solution(prompt, temperature=temperature, model=model, use_cache=use_llm_cache)
                 code = extract_code_block(llm_response)
                 
                 print(f"\n💬 {model.upper()}-Code:")
@@ -0,0 +1,107 @@
+"""Tests for the constraint parser and the input generator of the complexity probe."""
+
+from judge.complexity import Constraints, InputGenerator, _number
+
+
+def _constraints(*lines: str) -> Constraints:
+    return Constraints("<ul>" + "".join(f"<li><code>{line}</code></li>" for line in lines) + "</ul>")
+
+
+def test_number_evaluates_bounds():
+    assert _number("10^4") == 10000
+    assert _number("5 * 10^4") == 50000
+    assert _number("2^31 - 1") == 2147483647
+    assert _number("10 × 10^3") == 10000
+
+
+def test_number_rejects_names_and_expressions():
+    assert _number("n") is None
+    assert _number("") is None
+    assert _number("__import__('os')") is None
+    # Verkettete Potenzen würden die Auswertung blockieren
+    assert _number("9^9^9") is None
+
+
+def test_length_and_value_bounds():
+    constraints = _constraints("2 &lt;= nums.length &lt;= 10<sup>4</sup>",
+                               "-10<sup>9</sup> &lt;= nums[i] &lt;= 10<sup>9</sup>")
+    assert constraints.lookup("nums.length") == (2, 10000)
+    assert constraints.lookup("nums[]") == (-10 ** 9, 10 ** 9)
+
+
+def test_strict_and_symbolic_upper_bounds():
+    constraints = _constraints("0 &lt;= x &lt; 10<sup>5</sup>", "0 &lt;= k &lt; nums.length",
+                               "1 &lt;= t &lt;= n")
+    assert constraints.lookup("x") == (0, 99999)
+    assert constraints.lookup("k") == (0, ("nums.length", -1))
+    assert constraints.lookup("t") == (1, "n")
+
+
+def test_several_names_in_one_line():
+    constraints = _constraints("0 &lt;= a<sub>i</sub>, b<sub>i</sub> &lt; n", "1 &lt;= m, n &lt;= 200")
+    assert constraints.lookup("ai") == (0, ("n", -1))
+    assert constraints.lookup("bi") == (0, ("n", -1))
+    assert constraints.lookup("m") == (1, 200)
+    assert constraints.lookup("n") == (1, 200)
+
+
+def test_equalities_define_aliases():
+    constraints = _constraints("m == grid.length", "n == grid[i].length", "1 &lt;= m, n &lt;= 200",
+                               "k == 3")
+    assert constraints.lookup("grid.length") == (1, 200)
+    assert constraints.lookup("grid[].length") == (1, 200)
+    assert constraints.lookup("k") == (3, 3)
+
+
+def test_node_count_and_charset():
+    constraints = Constraints("<ul><li>The number of nodes in the tree is in the range "
+                              "<code>[0, 10<sup>4</sup>]</code>.</li>"
+                              "<li><code>s</code> consists of only lowercase English letters.</li>"
+                              "<li><code>t[i]</code> is either <code>'0'</code> or <code>'1'</code>.</li></ul>")
+    assert constraints.node_count == (0, 10000)
+    assert constraints.charset("s") == "abcdefghijklmnopqrstuvwxyz"
+    assert constraints.charset("t") == "01"
+
+
+def test_unparsable_lines_are_ignored():
+    constraints = _constraints("nums is sorted in ascending order.", "All the values are unique.")
+    assert constraints.bounds == {}
+
+
+def test_generator_scales_with_the_constraints():
+    constraints = _constraints("2 &lt;= nums.length &lt;= 10<sup>4</sup>",
+                               "-10<sup>9</sup> &lt;= nums[i] &lt;= 10<sup>9</sup>",
+                               "0 &lt;= k &lt; nums.length")
+    generator = InputGenerator([("vector<int>", "nums"), ("int", "k")], constraints)
+    assert generator.element_count(1.0) == 10001
+    assert generator.element_count(1 / 1024) == 11
+
+    nums, k, rest = generator.generate(1 / 1024).split("\n")
+    values = [int(value) for value in nums.strip("[]").split(",")]
+    assert len(values) == 10
+    assert all(-10 ** 9 <= value <= 10 ** 9 for value in values)
+    # Obergrenze durch eine andere Größe: mittlerer Wert zwischen 0 und nums.length - 1
+    assert k == "4"
+    assert rest == ""
+
+
+def test_generator_is_reproducible():
+    constraints = _constraints("1 &lt;= nums.length &lt;= 1000")
+    generator = InputGenerator([("vector<int>", "nums")], constraints, seed=7)
+    assert generator.generate(0.5) == generator.generate(0.5)
+
+
+def test_generator_keeps_the_lower_bound():
+    constraints = _constraints("2 &lt;= nums.length &lt;= 10<sup>4</sup>")
+    generator = InputGenerator([("vector<int>", "nums")], constraints)
+    assert generator.generate(1e-9).count(",") == 1
+
+
+def test_generator_matrix_and_strings():
+    constraints = _constraints("m == grid.length", "n == grid[i].length", "1 &lt;= m, n &lt;= 200",
+                               "1 &lt;= s.length &lt;= 100")
+    grid = InputGenerator([("vector<vector<int>>", "grid")], constraints)
+    assert grid.element_count(1.0) == 200 * 200
+    strings = InputGenerator([("string", "s")], constraints)
+    line = strings.generate(0.1).strip()
+    assert line.startswith('"') and line.endswith('"') and len(line) == 12
@@ -0,0 +1,63 @@
+"""Tests for the query rewriting and result comparison of the local SQL judge."""
+
+import sqlite3
+
+from judge.sql_judge import _cell_key, _real_division, _run_query, _split_statements
+
+
+def test_real_division_rewrites_operator():
+    assert _real_division("SELECT a / b FROM t") == "SELECT a * 1.0 / b FROM t"
+
+
+def test_real_division_keeps_literals_and_comments():
+    query = "SELECT '1/2', \"x/y\", `a/b` -- per 1/2\nFROM t /* a/b */ # c/d"
+    assert _real_division(query) == query
+
+
+def test_real_division_keeps_escaped_quotes_in_strings():
+    query = "SELECT 'it''s 1/2' AS s, a / b FROM t"
+    assert _real_division(query) == "SELECT 'it''s 1/2' AS s, a * 1.0 / b FROM t"
+
+
+def test_real_division_matches_mysql_percentage():
+    # Immediate Food Delivery: SQLite teilt ganze Zahlen sonst ganzzahlig (0 statt 33.33)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE Delivery (order_date TEXT, pref_date TEXT)")
+    conn.executemany("INSERT INTO Delivery VALUES (?, ?)",
+                     [("2019-08-01", "2019-08-02"), ("2019-08-02", "2019-08-02"), ("2019-08-11", "2019-08-13")])
+    columns, rows = _run_query(conn, "SELECT ROUND(SUM(order_date = pref_date) / COUNT(*) * 100, 2) "
+                                     "AS immediate_percentage FROM Delivery;")
+    assert columns == ["immediate_percentage"]
+    assert rows == [(33.33,)]
+
+
+def test_split_statements():
+    assert _split_statements("SELECT 1; SELECT 2;") == ["SELECT 1", "SELECT 2"]
+
+
+def test_split_statements_without_trailing_semicolon():
+    assert _split_statements("DELETE FROM t WHERE id = 1; SELECT * FROM t") == [
+        "DELETE FROM t WHERE id = 1", "SELECT * FROM t"]
+
+
+def test_split_statements_ignores_semicolons_in_strings():
+    assert _split_statements("SELECT 'a;b' AS x;") == ["SELECT 'a;b' AS x"]
+
+
+def test_split_statements_drops_empty_statements():
+    assert _split_statements(" ;\n;SELECT 1;;") == ["SELECT 1"]
+    assert _split_statements("  ") == []
+
+
+def test_cell_key_compares_numbers_by_value():
+    assert _cell_key("2.50") == _cell_key(2.5)
+    assert _cell_key("3") == _cell_key(3.0)
+    assert _cell_key(0.333333) == _cell_key(0.33333)
+    assert _cell_key(1) != _cell_key(2)
+
+
+def test_cell_key_text_and_null():
+    assert _cell_key(" Joe ") == "Joe"
+    assert _cell_key(None) == "null"
+    assert _cell_key("null") == "null"
+    assert _cell_key("inf") == "inf"
@@ -0,0 +1,281 @@
+"""
+Record/replay ("cassette") layer for outbound HTTP traffic.
+
+In record mode every request sent through utils/http_client.py or the async
+LeetCode client is written, together with its response and latency, to a
+gzip-compressed JSON lines file. In replay mode the same requests are served
+from that file without touching the network, either with the recorded
+latencies or at full speed. This allows profiling the CPU-side pipeline on
+real data and re-running a recorded batch exactly.
+
+Requests are matched by method, URL and (canonical JSON) body. Repeated
+identical requests, such as status polls, are answered in recorded order; once
+the recorded answers are used up, the last one is repeated. Request headers
+are never written to the cassette, and of the response headers only an
+allowlist without cookies or tokens (Content-Type, Retry-After, ...), so
+cookies, rotated session tokens and API keys stay out of it.
+Streamed responses are recorded as a whole.
+
+For an exact replay, start from the same local state as the recording (e.g. an
+empty LEETCODE_CACHE_DIR), because cached catalog and problem data change which
+requests are sent.
+
+Settings (environment variables):
+    HTTP_CASSETTE_MODE: "record", "replay" or "off" (default)
+    HTTP_CASSETTE_PATH: Cassette file (default cache/cassette.jsonl.gz)
+    HTTP_CASSETTE_TIMING: "recorded" to keep the recorded latencies, "fast" (default) to replay at full speed
+"""
+
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from typing import Any, Dict, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+from utils.storage import CACHE_DIR
+
+CASSETTE_MODE = os.environ.get("HTTP_CASSETTE_MODE", "off").lower()
+CASSETTE_PATH = os.environ.get("HTTP_CASSETTE_PATH", os.path.join(CACHE_DIR, "cassette.jsonl.gz"))
+CASSETTE_TIMING = os.environ.get("HTTP_CASSETTE_TIMING", "fast").lower()
+
+# Antwort-Header, die aufgezeichnet werden; alle anderen (Set-Cookie, Authorization, ...) werden verworfen.
+# Content-Encoding fehlt absichtlich, da der Body dekomprimiert gespeichert wird
+RECORDED_RESPONSE_HEADERS = {"content-type", "retry-after", "date", "location", "x-ratelimit-limit",
+                             "x-ratelimit-remaining", "x-ratelimit-reset"}
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode for a request that is not on the cassette."""
+
+
+class CassetteResponse:
+    """A recorded response with the parts of the requests.Response interface used by the clients."""
+
+    def __init__(self, method: str, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.encoding = "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def json(self, **kwargs) -> Any:
+        return json.loads(self.content, **kwargs)
+
+    def raise_for_status(self):
+        if not self.ok:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url} (replayed)", response=self)
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        size = chunk_size or len(self.content) or 1
+        for start in range(0, len(self.content), size):
+            chunk = self.content[start:start + size]
+            yield chunk.decode(self.encoding) if decode_unicode else chunk
+
+    def iter_lines(self, chunk_size: int = 512, decode_unicode: bool = False, delimiter=None):
+        for line in self.content.splitlines():
+            yield line.decode(self.encoding) if decode_unicode else line
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _request_key(method: str, url: str, json_body: Any = None, data: Any = None, params: Any = None) -> str:
+    if json_body is not None:
+        body = json.dumps(json_body, sort_keys=True, separators=(",", ":"))
+    elif isinstance(data, bytes):
+        body = data.decode("utf-8", errors="replace")
+    elif data is not None:
+        body = data if isinstance(data, str) else json.dumps(data, sort_keys=True)
+    else:
+        body = ""
+    if params:
+        url = f"{url}?{json.dumps(params, sort_keys=True)}"
+    return f"{method.upper()} {url}\n{body}"
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    try:
+        return {"body": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(entry: Dict[str, Any]) -> bytes:
+    if "body_b64" in entry:
+        return base64.b64decode(entry["body_b64"])
+    return entry.get("body", "").encode("utf-8")
+
+
+class Cassette:
+    """
+    A cassette file in record or replay mode.
+
+    Args:
+        path: Path of the gzip-compressed JSON lines file
+        mode: "record" or "replay"
+        timing: "recorded" or "fast" (only used for replay)
+    """
+
+    def __init__(self, path: str, mode: str, timing: str = "fast"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Invalid cassette mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.preserve_timing = timing == "recorded"
+        self._lock = threading.Lock()
+        self._file = None
+        self._started = time.monotonic()
+        self._entries: Dict[str, deque] = defaultdict(deque)
+        self._last: Dict[str, Dict[str, Any]] = {}
+
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries[entry["key"]].append(entry)
+
+    def _open_for_recording(self):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = gzip.open(self.path, "wb")
+            atexit.register(self.close)
+        return self._file
+
+    def record(self, method: str, url: str, request_kwargs: Dict[str, Any], status_code: int,
+               headers: Dict[str, str], content: bytes, elapsed: float):
+        """
+        Append an interaction to the cassette.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            request_kwargs: The keyword arguments of the request (json, data, params; headers are ignored)
+            status_code: Response status
+            headers: Response headers (only RECORDED_RESPONSE_HEADERS are stored)
+            content: Raw response body
+            elapsed: Latency of the request in seconds
+        """
+        entry = {
+            "key": _request_key(method, url, request_kwargs.get("json"), request_kwargs.get("data"),
+                                request_kwargs.get("params")),
+            "method": method.upper(),
+            "url": url,
+            "offset": round(time.monotonic() - self._started, 6),
+            "elapsed": round(elapsed, 6),
+            "status": status_code,
+            "headers": {name: value for name, value in dict(headers).items()
+                        if name.lower() in RECORDED_RESPONSE_HEADERS},
+        }
+        entry.update(_encode_body(content))
+
+        with self._lock:
+            f = self._open_for_recording()
+            f.write((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8"))
+            # Sync-Flush, damit die Kassette auch bei einem Abbruch lesbar bleibt
+            f.flush(zlib.Z_SYNC_FLUSH)
+
+    def record_response(self, method: str, url: str, request_kwargs: Dict[str, Any], response, elapsed: float):
+        """Record a requests/httpx response (its body is read completely)."""
+        # httpx gibt den Body eines gestreamten Response erst nach read() frei (sonst ResponseNotRead);
+        # requests.Response liest ihn beim Zugriff auf content selbst
+        content = response.read() if hasattr(response, "read") else response.content
+        self.record(method, url, request_kwargs, response.status_code, response.headers, content, elapsed)
+
+    def next_entry(self, method: str, url: str, request_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Return the next recorded interaction for a request.
+
+        Raises:
+            CassetteMissError: If the request was never recorded
+        """
+        key = _request_key(method, url, request_kwargs.get("json"), request_kwargs.get("data"),
+                           request_kwargs.get("params"))
+        with self._lock:
+            queue = self._entries.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+                return entry
+            if key in self._last:
+                return self._last[key]
+        raise CassetteMissError(f"Request not on cassette {self.path}: {method.upper()} {url}")
+
+    def replay_delay(self, entry: Dict[str, Any]) -> float:
+        """Seconds to wait before answering with the entry."""
+        return entry["elapsed"] if self.preserve_timing else 0.0
+
+    def to_response(self, entry: Dict[str, Any]) -> CassetteResponse:
+        return CassetteResponse(entry["method"], entry["url"], entry["status"], entry["headers"], _decode_body(entry))
+
+    def replay(self, method: str, url: str, request_kwargs: Dict[str, Any]) -> CassetteResponse:
+        """Answer a request from the cassette (blocking for the recorded latency if enabled)."""
+        entry = self.next_entry(method, url, request_kwargs)
+        delay = self.replay_delay(entry)
+        if delay > 0:
+            time.sleep(delay)
+        return self.to_response(entry)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_cassette: Optional[Cassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_cassette() -> Optional[Cassette]:
+    """Return the process-wide cassette, or None if recording and replay are off."""
+    global _cassette
+    if CASSETTE_MODE not in ("record", "replay"):
+        return None
+    with _cassette_lock:
+        if _cassette is None:
+            _cassette = Cassette(CASSETTE_PATH, CASSETTE_MODE, CASSETTE_TIMING)
+        return _cassette
+
+
+def replaying_at_full_speed() -> bool:
+    """True if requests are replayed without their recorded latencies (rate limits are pointless then)."""
+    return CASSETTE_MODE == "replay" and CASSETTE_TIMING != "recorded"
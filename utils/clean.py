@@ -19,6 +19,61 @@ def extract_code_block(text: str) -> str:
     
     return code
 
+class IncrementalCodeExtractor:
+    """
+    Erkennt in einer gestreamten LLM-Antwort, sobald der erste Code-Block vollständig ist.
+
+    Die Antwort wird stückweise mit feed() übergeben. Sobald der erste Block (```...```) geschlossen
+    ist, liefert feed() True; der Rest der Antwort ändert das Ergebnis von extract_code_block nicht
+    mehr, die Generierung kann also abgebrochen werden. Jedes Zeichen wird dabei nur einmal durchsucht.
+    """
+
+    FENCE = "```"
+
+    def __init__(self):
+        self.text = ""
+        self.complete = False
+        # Position des öffnenden Zauns und ab wo weitergesucht wird
+        self._open = None
+        self._scan = 0
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Hängt ein Stück der Antwort an.
+
+        Args:
+            chunk: Der nächste Teil der Antwort
+
+        Returns:
+            True, sobald der erste Code-Block vollständig empfangen wurde
+        """
+        if self.complete:
+            return True
+        self.text += chunk
+
+        if self._open is None:
+            position = self.text.find(self.FENCE, self._scan)
+            if position < 0:
+                # Ein Zaun kann über zwei Stücke verteilt ankommen
+                self._scan = max(0, len(self.text) - len(self.FENCE) + 1)
+                return False
+            self._open = position
+            self._scan = position + len(self.FENCE)
+
+        # Wie in extract_code_block endet der Block am nächsten Zaun nach dem öffnenden
+        position = self.text.find(self.FENCE, self._scan)
+        if position < 0:
+            self._scan = max(self._open + len(self.FENCE), len(self.text) - len(self.FENCE) + 1)
+            return False
+        self.text = self.text[:position + len(self.FENCE)]
+        self.complete = True
+        return True
+
+    @property
+    def code(self) -> str:
+        """Der Code des ersten Blocks (bzw. der bisherige Text, wie bei extract_code_block)."""
+        return extract_code_block(self.text)
+
 # Die folgenden Funktionen sind für die manuelle Korrektur verfügbar,
 # werden aber nicht automatisch in extract_code_block aufgerufen,
 # um eine faire Evaluation der Sprachmodelle zu gewährleisten.
@@ -101,18 +156,154 @@ def fix_cpp_issues(code: str) -> str:
     
     return code
 
-def parse_testcases(example_string: str, problem_slug=None):
+def parse_testcases(example_string: str, param_count: int = 1) -> list:
+    """
+    Zerlegt die exampleTestcases eines Problems in einzelne Testfälle.
+    
+    LeetCode liefert die Beispieleingaben als eine Zeile pro Parameter,
+    die Testfälle folgen direkt aufeinander.
+    
+    Args:
+        example_string: Der exampleTestcases-String des Problems
+        param_count: Anzahl der Parameter der Lösungsmethode
+    
+    Returns:
+        Liste von Testfällen, jeder als Liste der Eingabezeilen (eine pro Parameter);
+        leer, wenn die Zeilen nicht aufgehen
+    """
+    if not example_string or param_count < 1:
+        return []
+    
+    lines = [line.strip() for line in example_string.strip().splitlines() if line.strip()]
+    if len(lines) % param_count != 0:
+        return []
+    
+    return [lines[i:i + param_count] for i in range(0, len(lines), param_count)]
+
+def parse_expected_outputs(content: str) -> list:
+    """
+    Liest die erwarteten Ausgaben ("Output: ...") der Beispiele aus der Problembeschreibung.
+    
+    Args:
+        content: Die HTML-Beschreibung des Problems
+    
+    Returns:
+        Liste der erwarteten Ausgaben in der Reihenfolge der Beispiele
+    """
+    if not content:
+        return []
+    # Zeilenumbruch zwischen den Elementen, damit Beschriftung und Wert sauber getrennt sind
+    text = BeautifulSoup(content, "html.parser").get_text("\n").replace("\xa0", " ")
+    return [match.strip() for match in re.findall(r"Output:\s*(.+)", text)]
+
+def parse_expected_tables(content: str) -> list:
     """
-    Diese Funktion ist nicht mehr aktiv, da lokale Tests entfernt wurden.
-    Die Funktion bleibt als Platzhalter, gibt aber immer eine leere Liste zurück.
+    Liest die erwarteten Ergebnistabellen der Beispiele von Datenbankproblemen aus der Problembeschreibung.
+    
+    Die Tabellen stehen als ASCII-Tabellen nach "Output:":
+    
+        +----+-------+
+        | id | name  |
+        +----+-------+
+        | 1  | Joe   |
+        +----+-------+
+    
+    Args:
+        content: Die HTML-Beschreibung des Problems
     
-    Verwende stattdessen die LeetCode-Submission für Tests.
+    Returns:
+        Liste von (Spaltennamen, Zeilen) in der Reihenfolge der Beispiele; Zellen sind Strings,
+        "null" wird zu None
+    """
+    if not content:
+        return []
+    text = BeautifulSoup(content, "html.parser").get_text("\n").replace("\xa0", " ")
+    
+    tables = []
+    for part in re.split(r"Output:", text)[1:]:
+        rows = []
+        for line in part.strip().splitlines():
+            line = line.strip()
+            if line.startswith("+"):
+                continue
+            if not line.startswith("|"):
+                break
+            cells = [cell.strip() for cell in line.strip("|").split("|")]
+            rows.append([None if cell == "null" else cell for cell in cells])
+        if rows:
+            tables.append((rows[0], rows[1:]))
+    return tables
+
+# Sprachen mit "#"-Kommentaren und signifikanter Einrückung bzw. mit SQL-Kommentaren;
+# alle anderen LeetCode-Sprachen verwenden C-artige Kommentare
+_HASH_COMMENT_LANGUAGES = {"python", "python3", "ruby", "elixir", "pythondata"}
+_SQL_LANGUAGES = {"mysql", "mssql", "mssqlserver", "oraclesql", "postgresql"}
+
+_STRING_PATTERN = r'"""(?:\\.|[^\\])*?"""|\'\'\'(?:\\.|[^\\])*?\'\'\'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+# Zeichen, neben denen Leerraum nie zur Trennung von Tokens nötig ist
+_SEPARATORS = set("(){}[];,")
+
+
+def normalize_code(code: str, language: str = "cpp") -> str:
+    """
+    Normalisiert Code für Duplikatvergleiche: Kommentare werden entfernt und
+    Leerraum vereinheitlicht, String-Literale bleiben unverändert.
+
+    Bei Python (und anderen Sprachen mit "#"-Kommentaren) bleibt die Einrückung
+    erhalten, dort werden nur Leerzeilen und Leerzeichen am Zeilenende entfernt.
+
+    Args:
+        code: Der Quellcode
+        language: Die LeetCode-Sprache (z.B. "cpp", "python3", "mysql")
+
+    Returns:
+        Der normalisierte Code
     """
-    # Warnung im Terminal ausgeben (sofern verfügbar)
-    try:
-        from app import log_to_terminal
-        log_to_terminal("Warnung: parse_testcases() wurde aufgerufen, obwohl lokale Tests deaktiviert sind.", "warning")
-    except:
-        pass
-    
-    return []
+    if not code:
+        return ""
+
+    language = language.lower()
+    if language in _HASH_COMMENT_LANGUAGES:
+        comment_pattern = r"#[^\n]*"
+    elif language in _SQL_LANGUAGES:
+        comment_pattern = r"--[^\n]*|/\*.*?\*/" + (r"|#[^\n]*" if language == "mysql" else "")
+    else:
+        comment_pattern = r"//[^\n]*|/\*.*?\*/"
+
+    if language in _HASH_COMMENT_LANGUAGES:
+        pattern = re.compile(f"(?P<string>{_STRING_PATTERN})|(?P<comment>{comment_pattern})", re.DOTALL)
+        code = pattern.sub(lambda m: m.group("string") or "", code)
+        lines = (line.rstrip() for line in code.splitlines())
+        return "\n".join(line for line in lines if line)
+
+    pattern = re.compile(
+        f"(?P<string>{_STRING_PATTERN})|(?P<comment>{comment_pattern})|(?P<space>\\s+)|(?P<text>[^\\s\"'/#-]+|.)",
+        re.DOTALL,
+    )
+    tokens = []
+    pending_space = False
+    at_line_start = True
+    in_directive = False
+    for match in pattern.finditer(code):
+        token = match.group(0)
+        if match.lastgroup in ("comment", "space"):
+            if "\n" in token:
+                at_line_start = True
+                if in_directive:
+                    # Präprozessor-Direktiven enden am Zeilenende
+                    tokens.append("\n")
+                    in_directive = pending_space = False
+                    continue
+            pending_space = True
+            continue
+
+        if pending_space and tokens and tokens[-1] != "\n" \
+                and tokens[-1][-1] not in _SEPARATORS and token[0] not in _SEPARATORS:
+            tokens.append(" ")
+        pending_space = False
+        if token == "#" and at_line_start and language not in _SQL_LANGUAGES:
+            in_directive = True
+        at_line_start = False
+        tokens.append(token)
+
+    return "".join(tokens).strip()
@@ -0,0 +1,139 @@
+"""
+Shared HTTP client layer with pooled keep-alive sessions.
+
+All outbound clients (LeetCode GraphQL, submissions, LLM backends) send their
+requests through this module. It keeps one session per host so that TCP and
+TLS connections are reused between requests instead of being re-established
+for every GraphQL query, submit, poll or LLM call.
+
+Settings (environment variables):
+    HTTP_POOL_CONNECTIONS: Number of connection pools per session (default 4)
+    HTTP_POOL_MAXSIZE: Maximum number of connections kept open per host (default 16)
+    HTTP_KEEP_ALIVE: Set to "0" to close connections after every request
+    HTTP_ENABLE_HTTP2: Set to "1" to use HTTP/2 via httpx (requires "httpx[http2]")
+
+Requests can be recorded to and replayed from a cassette file (see utils/cassette.py).
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.cassette import get_cassette
+
+POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", 4))
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 16))
+KEEP_ALIVE = os.environ.get("HTTP_KEEP_ALIVE", "1") != "0"
+ENABLE_HTTP2 = os.environ.get("HTTP_ENABLE_HTTP2", "0") == "1"
+
+_sessions: Dict[str, Any] = {}
+_sessions_lock = threading.Lock()
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _create_http2_client():
+    """Create an httpx client with HTTP/2, or None if httpx/h2 are not installed."""
+    try:
+        import httpx
+        import h2  # noqa: F401  (httpx needs h2 for HTTP/2)
+    except ImportError:
+        logging.warning("HTTP/2 requested but httpx[http2] is not installed, falling back to HTTP/1.1")
+        return None
+
+    limits = httpx.Limits(
+        max_connections=POOL_MAXSIZE,
+        max_keepalive_connections=POOL_MAXSIZE if KEEP_ALIVE else 0,
+    )
+    return httpx.Client(http2=True, limits=limits, timeout=None)
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not KEEP_ALIVE:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_session(url: str):
+    """
+    Return the pooled session for the host of the given URL.
+
+    Args:
+        url: Any URL on the target host
+
+    Returns:
+        A requests.Session (or an httpx.Client if HTTP/2 is enabled)
+    """
+    key = _host_key(url)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = (_create_http2_client() if ENABLE_HTTP2 else None) or _create_session()
+            _sessions[key] = session
+        return session
+
+
+def request(method: str, url: str, stream: bool = False, **kwargs):
+    """
+    Send a request over the pooled session for the URL's host.
+
+    Args:
+        method: HTTP method ("GET", "POST", ...)
+        url: The request URL
+        stream: Do not read the response body immediately
+        **kwargs: Passed on to the session (json, headers, timeout, ...)
+
+    Returns:
+        The response object
+    """
+    cassette = get_cassette()
+    if cassette is not None and cassette.replaying:
+        return cassette.replay(method, url, kwargs)
+
+    started = time.monotonic()
+    response = _send(method, url, stream, dict(kwargs))
+    if cassette is not None and cassette.recording:
+        cassette.record_response(method, url, kwargs, response, time.monotonic() - started)
+    return response
+
+
+def _send(method: str, url: str, stream: bool, kwargs: Dict[str, Any]):
+    session = get_session(url)
+    if isinstance(session, requests.Session):
+        return session.request(method, url, stream=stream, **kwargs)
+
+    # httpx: Streaming wird über send(..., stream=True) gesteuert
+    timeout = kwargs.pop("timeout", None)
+    http_request = session.build_request(method, url, timeout=timeout, **kwargs)
+    return session.send(http_request, stream=stream)
+
+
+def post(url: str, **kwargs):
+    """Send a POST request over the pooled session (see request)."""
+    return request("POST", url, **kwargs)
+
+
+def get(url: str, **kwargs):
+    """Send a GET request over the pooled session (see request)."""
+    return request("GET", url, **kwargs)
+
+
+def close_sessions():
+    """Close all pooled sessions (e.g. at the end of a CLI run)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,198 @@
+"""
+Retry policy with exponential backoff, full jitter and Retry-After support.
+
+Shared by the LeetCode clients (GraphQL, submit, check) and the LLM clients.
+Full jitter spreads the retries of parallel callers over the whole backoff
+window, so that after a burst of 429s they do not all come back at once.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import time
+from typing import Callable, Iterable, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Either a number of seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    Describes how often and how long to retry a request.
+
+    Args:
+        max_attempts: Total number of attempts, including the first one
+        base_delay: Backoff window of the first retry in seconds
+        max_delay: Upper bound for a single backoff window
+        deadline: Maximum total time per call in seconds (None for no limit)
+        retry_statuses: HTTP status codes that are worth retrying
+        retry_exceptions: Retry when an attempt raises (timeouts, connection resets). Must be off for
+            requests that are not idempotent: the server may have processed the request before the
+            connection broke.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 deadline: Optional[float] = None,
+                 retry_statuses: Iterable[int] = (429, 500, 502, 503, 504), retry_exceptions: bool = True):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+
+    def should_retry(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first failure)
+            retry_after: Server-provided minimum delay in seconds
+
+        Returns:
+            Seconds to wait
+        """
+        window = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(0, window)
+        if retry_after is not None:
+            # Retry-After ist eine Untergrenze; der Jitter verhindert, dass alle gleichzeitig zurückkommen
+            delay = retry_after + random.uniform(0, self.base_delay)
+        return delay
+
+    def start(self) -> "RetryState":
+        """Begin a new call governed by this policy."""
+        return RetryState(self)
+
+
+class RetryState:
+    """Tracks attempts and the deadline of a single call."""
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+        self.attempts = 0
+        self.started = time.monotonic()
+
+    def next_delay(self, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Register a failed attempt and return how long to wait before the next one.
+
+        Returns:
+            Seconds to wait, or None if no attempts or time are left
+        """
+        self.attempts += 1
+        if self.attempts >= self.policy.max_attempts:
+            return None
+
+        delay = self.policy.backoff(self.attempts, retry_after)
+        if self.policy.deadline is not None:
+            remaining = self.policy.deadline - (time.monotonic() - self.started)
+            if delay >= remaining:
+                return None
+        return delay
+
+
+def send_with_retry(send: Callable[[], object], policy: RetryPolicy, description: str = "request"):
+    """
+    Call send() until it returns a response that is not retryable.
+
+    send must return an object with status_code and headers (e.g. a requests
+    response). Exceptions raised by send are retried as well, unless the policy
+    has retry_exceptions switched off. Discarded responses are closed, so that a
+    streamed response (stream=True) returns its connection to the pool.
+
+    Args:
+        send: Function that performs one attempt
+        policy: The retry policy
+        description: Name of the request for log messages
+
+    Returns:
+        The last response (which may still have an error status)
+
+    Raises:
+        The last exception if every attempt raised
+    """
+    state = policy.start()
+    while True:
+        try:
+            response = send()
+        except Exception as e:
+            delay = state.next_delay() if policy.retry_exceptions else None
+            if delay is None:
+                raise
+            logging.warning(f"{description} failed ({e}), attempt {state.attempts}/{policy.max_attempts}, "
+                            f"retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        if not policy.should_retry(response.status_code):
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        delay = state.next_delay(retry_after)
+        if delay is None:
+            return response
+        logging.warning(f"{description} returned status {response.status_code}, attempt "
+                        f"{state.attempts}/{policy.max_attempts}, retrying in {delay:.1f}s")
+        # Ein ungelesener gestreamter Body hielte sonst die Verbindung aus dem Pool fest
+        close = getattr(response, "close", None)
+        if close is not None:
+            close()
+        time.sleep(delay)
+
+
+async def send_with_retry_async(send, policy: RetryPolicy, description: str = "request"):
+    """
+    Async variant of send_with_retry; send is a coroutine function.
+
+    The returned object must have status_code and headers, like in send_with_retry.
+    """
+    state = policy.start()
+    while True:
+        try:
+            response = await send()
+        except Exception as e:
+            delay = state.next_delay() if policy.retry_exceptions else None
+            if delay is None:
+                raise
+            logging.warning(f"{description} failed ({e}), attempt {state.attempts}/{policy.max_attempts}, "
+                            f"retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+
+        if not policy.should_retry(response.status_code):
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        delay = state.next_delay(retry_after)
+        if delay is None:
+            return response
+        logging.warning(f"{description} returned status {response.status_code}, attempt "
+                        f"{state.attempts}/{policy.max_attempts}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
@@ -0,0 +1,92 @@
+"""
+Shared helpers for the local SQLite stores (problem catalog, caches).
+"""
+
+import os
+import re
+import sqlite3
+from urllib.parse import urlsplit
+
+# Verzeichnis für alle lokalen Datenbanken, analog zum "logs"-Verzeichnis
+CACHE_DIR = os.environ.get("LEETCODE_CACHE_DIR", "cache")
+
+# Basis-URL der LeetCode API; für Lasttests ohne Netzwerk auf den lokalen Mock-Server umstellen
+# (z.B. LEETCODE_BASE_URL=http://localhost:3000, siehe mock_servers/leetcode.py)
+DEFAULT_LEETCODE_BASE_URL = "https://leetcode.com"
+LEETCODE_BASE_URL = os.environ.get("LEETCODE_BASE_URL", DEFAULT_LEETCODE_BASE_URL).rstrip("/")
+
+
+def database_path(filename: str) -> str:
+    """
+    Return the path of a database file inside the cache directory.
+
+    Args:
+        filename: Name of the database file (e.g. "catalog.sqlite3")
+
+    Returns:
+        The full path; the cache directory is created if necessary
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
+
+
+def site_cache_dir(base_url: str = LEETCODE_BASE_URL) -> str:
+    """
+    Return the directory for data that belongs to one LeetCode server.
+
+    Catalog, problem details, verdicts, the submission journal and the rate
+    limit state of real LeetCode live directly in the cache directory. Any
+    other server (e.g. the mock server) gets its own subdirectory named after
+    its host and port, so a mock run never mixes its problems or submission
+    IDs into the real data.
+
+    Args:
+        base_url: The LeetCode base URL
+
+    Returns:
+        The directory path (not created)
+    """
+    if base_url.rstrip("/") == DEFAULT_LEETCODE_BASE_URL:
+        return CACHE_DIR
+    parts = urlsplit(base_url)
+    name = re.sub(r"[^A-Za-z0-9.-]+", "-", parts.netloc + parts.path).strip("-")
+    return os.path.join(CACHE_DIR, name or "site")
+
+
+def site_database_path(filename: str) -> str:
+    """
+    Return the path of a database file for the current LeetCode server (see site_cache_dir).
+
+    Args:
+        filename: Name of the database file (e.g. "catalog.sqlite3")
+
+    Returns:
+        The full path; the directory is created if necessary
+    """
+    directory = site_cache_dir()
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+
+def open_database(path: str) -> sqlite3.Connection:
+    """
+    Open a SQLite database that can be shared between Streamlit threads.
+
+    The connection uses WAL mode so that readers never block on a running
+    sync, and returns rows as sqlite3.Row objects.
+
+    Args:
+        path: Path to the database file
+
+    Returns:
+        An open sqlite3 connection
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
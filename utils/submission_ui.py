@@ -3,6 +3,8 @@ import time
 from typing import Dict, Any, Optional
 import pandas as pd
 from api.leetcode_submit import submit_and_wait_for_result
+from judge.complexity import format_complexity_estimate, is_limit_warning
+from judge.cpp_judge import blocks_submission, prejudge, with_local_measurements
 
 
 def show_submission_section(problem_slug: str, code: str, language: str = "cpp"):
@@ -72,8 +74,20 @@ def show_submission_section(problem_slug: str, code: str, language: str = "cpp")
                 # Use selected language instead of default
                 active_language = st.session_state.submission_language
                 
+                # Judge locally first; solutions that fail there are not submitted
+                result = None
+                local_result = None
+                if st.session_state.get("local_prejudge", True):
+                    local_result = prejudge(problem_slug, code, active_language)
+                    if blocks_submission(local_result):
+                        result = local_result
+                
                 # Submit the solution and wait for result
-                result = submit_and_wait_for_result(problem_slug, code, active_language)
+                if result is None:
+                    result = with_local_measurements(
+                        submit_and_wait_for_result(problem_slug, code, active_language,
+                                                   force_resubmit=st.session_state.get("force_resubmit", False)),
+                        local_result)
                 
                 if result["success"] and "status_code" in result:
                     # Save previous result for comparison if we have a current result
@@ -276,8 +290,14 @@ def save_leetcode_result_to_stats(result, problem_slug, success=None):
         "is_sql_problem": is_sql_problem,  # Neu: ist es ein SQL-Problem?
         "solution": code,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "submission_type": "leetcode_api",  # Mark as LeetCode submission
+        "submission_type": "local_judge" if result.get("local") else "leetcode_api",  # Mark as LeetCode submission
         "runtime_ms": result.get("runtime_ms"),
+        "complexity_estimate": result.get("complexity_estimate"),
+        "local_wall_ms": result.get("local_wall_ms"),
+        "local_cpu_ms": result.get("local_cpu_ms"),
+        "local_memory_mb": result.get("local_memory_mb"),
+        "local_runs": result.get("local_runs"),
+        "local_verdict": result.get("local_verdict"),
         "memory_mb": result.get("memory_percentile"),
         "leetcode_status": result.get("status_description", result.get("result", "Unknown")),
         "model": model,
@@ -362,6 +382,11 @@ def show_submission_result(result: Dict[str, Any], previous_results: list = None
     </div>
     """, unsafe_allow_html=True)
     
+    if result.get("local"):
+        st.caption("Verdict of the local pre-judge on the example test cases - the solution was not submitted to LeetCode.")
+    elif result.get("cached"):
+        st.caption("Verdict taken from the local cache - this code was already judged and was not submitted again.")
+    
     # Create metric cards using native Streamlit components in rows for cleaner look
     col1, col2, col3 = st.columns(3)
     
@@ -406,6 +431,16 @@ def show_submission_result(result: Dict[str, Any], previous_results: list = None
             st.markdown(f"**Language:** {result.get('language', 'cpp')}")
             st.markdown(f"**Runtime:** {runtime} ms" if runtime is not None else "**Runtime:** N/A")
             st.markdown(f"**Memory:** {memory} MB" if memory is not None else "**Memory:** N/A")
+            if result.get("local_cpu_ms") is not None:
+                st.markdown(f"**Local Measurement:** {result['local_cpu_ms']} ms CPU, "
+                            f"{result.get('local_wall_ms')} ms wall, {result.get('local_memory_mb')} MB peak RSS")
+            if result.get("local_verdict") and result["local_verdict"] != status:
+                st.warning(f"Local pre-judge: {result['local_verdict']} (advisory, submitted anyway)")
+            estimate = result.get("complexity_estimate")
+            if estimate:
+                st.markdown(f"**Local Complexity Estimate:** {format_complexity_estimate(estimate)}")
+                if is_limit_warning(estimate):
+                    st.warning("The local estimate points to a time or memory limit verdict on large inputs.")
         
         with right_col:
             st.markdown("##### Test Results")
@@ -458,7 +493,8 @@ def reset_submission_state():
         st.session_state.submission_result = None
 
 
-def submit_to_leetcode(problem_slug: str, code: str, language: str = "cpp") -> Dict[str, Any]:
+def submit_to_leetcode(problem_slug: str, code: str, language: str = "cpp",
+                       force_resubmit: bool = False) -> Dict[str, Any]:
     """
     Submit solution to LeetCode and return the result.
     Also save the result to statistics.
@@ -467,13 +503,36 @@ def submit_to_leetcode(problem_slug: str, code: str, language: str = "cpp") -> D
         problem_slug: The LeetCode problem slug
         code: The solution code
         language: The programming language (default: "cpp")
+        force_resubmit: Submit even if a verdict for this code is cached
         
     Returns:
         Dictionary with submission result
     """
-    # Submit the solution and wait for result
-    result = submit_and_wait_for_result(problem_slug, code, language)
+    # Judge locally first (unless disabled in the sidebar), then submit the solution and wait for result
+    # (or take the cached verdict)
+    local_result = None
+    if st.session_state.get("local_prejudge", True):
+        local_result = prejudge(problem_slug, code, language)
+    result = local_result
+    if not blocks_submission(local_result):
+        result = with_local_measurements(
+            submit_and_wait_for_result(problem_slug, code, language, force_resubmit=force_resubmit), local_result)
+    record_submission_result(problem_slug, code, result)
+    return result
+
+
+def record_submission_result(problem_slug: str, code: str, result: Dict[str, Any]):
+    """
+    Save the result of a LeetCode submission to the statistics.
+    
+    Must be called from the Streamlit script thread, e.g. while iterating over
+    the futures of a SubmissionExecutor.
     
+    Args:
+        problem_slug: The LeetCode problem slug
+        code: The submitted solution code
+        result: The result of submit_and_wait_for_result
+    """
     # Initialize or update problem information
     if 'active_problems' in st.session_state and problem_slug in st.session_state.active_problems:
         # Use the active problem info
@@ -565,8 +624,14 @@ def submit_to_leetcode(problem_slug: str, code: str, language: str = "cpp") -> D
         "is_sql_problem": is_sql_problem,  # Neu: ist es ein SQL-Problem?
         "solution": code,
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "submission_type": "leetcode_api",  # Mark as LeetCode submission
+        "submission_type": "local_judge" if result.get("local") else "leetcode_api",  # Mark as LeetCode submission
         "runtime_ms": result.get("runtime_ms"),
+        "complexity_estimate": result.get("complexity_estimate"),
+        "local_wall_ms": result.get("local_wall_ms"),
+        "local_cpu_ms": result.get("local_cpu_ms"),
+        "local_memory_mb": result.get("local_memory_mb"),
+        "local_runs": result.get("local_runs"),
+        "local_verdict": result.get("local_verdict"),
         "memory_mb": result.get("memory_percentile"),
         "leetcode_status": result.get("status_description", result.get("result", "Unknown")),
         "model": model,
@@ -588,9 +653,7 @@ def submit_to_leetcode(problem_slug: str, code: str, language: str = "cpp") -> D
                 existing_entry.get('solution') == code):
                 # Update existing entry instead of adding a new one
                 st.session_state.results[difficulty][idx] = result_entry
-                return result
+                return
         
         # If not a duplicate, add as new entry
         st.session_state.results[difficulty].append(result_entry)
-    
-    return result 
\ No newline at end of file